@@ -1,9 +1,8 @@
 import pygame
-from queue import PriorityQueue, Queue
 import time
-import tracemalloc
 import sys
-sys.setrecursionlimit(3000)
+import silnik_siatki as silnik
+import hpa
 
 pygame.init()          
 pygame.font.init()    
@@ -19,41 +18,55 @@ POMARANCZOWY = (255, 165, 0)
 SZARY = (128, 128, 128)
 TURKUSOWY = (64, 224, 208)
 SZEROKOSC = 700
+FPS_ANIMACJI = 60            # najwyżej tyle klatek na sekundę podczas animacji algorytmu
+CZAS_ODTWARZANIA = 2.0       # czas (s) odtwarzania nagranego przebiegu w trybie odtwarzania
+SCIEZKA = 3                  # zdarzenie nagrania: pole ścieżki (obok silnik.OTWARTE / ZAMKNIETE)
 OKNO = pygame.display.set_mode((SZEROKOSC, SZEROKOSC))
 pygame.display.set_caption("Wizualizacja algorytmu wyszukiwania sciezek")
 
 
 #na statystyki
 statystyki_algorytmu = ""
+ostatni_wynik = None  # silnik.Wynik ostatniego wyszukiwania
+zmienione_pola = []   # pola, których kolor zmienił się od ostatniego rysowania
 
 def zmierz_statystyki(algorytm):
+    """
+    Opisuje przebieg algorytmu w pasku statystyk. Wszystkie liczby, także
+    czas, pochodzą z zwróconego silnik.Wynik (czas to suma etapów z
+    Wynik.czasy bez czasu obserwatora rysującego w animacji na żywo),
+    a nie z kolorów pól ani z zegara wokół całego wywołania, więc nie
+    obejmują rysowania. Pamięci nie mierzymy: tracemalloc spowalniałby sam
+    pomiar czasu. Opakowanie zwraca, czy ścieżkę znaleziono.
+    """
     def opakowanie(rysuj, siatka, start, koniec, *args):
-        global statystyki_algorytmu
-        tracemalloc.start()
-        start_czas = time.time()
+        global statystyki_algorytmu, ostatni_wynik
         wynik = algorytm(rysuj, siatka, start, koniec, *args) if args else algorytm(rysuj, siatka, start, koniec)
-        koniec_czas = time.time()
-        pamiec, _ = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-
-        odwiedzone = len([s for rzad in siatka for s in rzad if s.czy_otwarty() or s.czy_zamkniety() or s.kolor == FIOLETOWY])
-        dlugosc_sciezki = len([s for rzad in siatka for s in rzad if s.kolor == FIOLETOWY])
+        czas = sum(wynik.czasy.values())
+        if isinstance(rysuj, Harmonogram):
+            czas -= rysuj.czas_obserwatora
+            rysuj.zakoncz()
+        ostatni_wynik = wynik
 
         nazwa_alg = {
             'dijkstra': 'Dijkstra',
             'astar': 'A* (Manhattan)',
             'astar_euklides': 'A* (Euklides)',
             'bfs': 'BFS',
-            'dfs': 'DFS'
+            'dfs': 'DFS',
+            'jps': 'JPS',
+            'jps_plus': 'JPS+',
+            'dstar_lite': 'D* Lite',
+            'hpa_gwiazdka': 'HPA*'
         }.get(algorytm.__name__, algorytm.__name__)
 
         statystyki_algorytmu = (
-            f"{nazwa_alg} | Czas: {koniec_czas - start_czas:.2f}s  "
-            f"Pamiec: {pamiec / 1024:.1f}KB  "
-            f"Wierzcholki: {odwiedzone}  "
-            f"Dlugosc sciezki: {dlugosc_sciezki}"
+            f"{nazwa_alg} | Czas: {czas:.4f}s  "
+            f"Wierzcholki: {wynik.odwiedzone}  "
+            f"Front: {wynik.szczyt_frontu}  "
+            f"Dlugosc sciezki: {wynik.koszt if wynik.znaleziono else '-'}"
         )
-        return wynik
+        return wynik.znaleziono
     return opakowanie
 
 
@@ -63,11 +76,20 @@ class Pole:
         self.kolumna = kolumna
         self.x = wiersz * rozmiar
         self.y = kolumna * rozmiar
-        self.kolor = BIALY
-        self.sasiedzi = []
+        self._kolor = BIALY
         self.rozmiar = rozmiar
         self.ilosc_wierszy = ilosc_wierszy
 
+    @property
+    def kolor(self):
+        return self._kolor
+
+    @kolor.setter
+    def kolor(self, kolor):
+        if kolor != self._kolor:
+            self._kolor = kolor
+            zmienione_pola.append(self)
+
     def pozycja(self):
         return self.wiersz, self.kolumna
 
@@ -88,207 +110,195 @@ class Pole:
     def rysuj(self, okno):
         pygame.draw.rect(okno, self.kolor, (self.x, self.y, self.rozmiar, self.rozmiar))
 
-    def aktualizuj_sasiadow(self, siatka):
-        self.sasiedzi = []
-        if self.wiersz < self.ilosc_wierszy - 1 and not siatka[self.wiersz + 1][self.kolumna].czy_bariera():
-            self.sasiedzi.append(siatka[self.wiersz + 1][self.kolumna])
-        if self.wiersz > 0 and not siatka[self.wiersz - 1][self.kolumna].czy_bariera():
-            self.sasiedzi.append(siatka[self.wiersz - 1][self.kolumna])
-        if self.kolumna < self.ilosc_wierszy - 1 and not siatka[self.wiersz][self.kolumna + 1].czy_bariera():
-            self.sasiedzi.append(siatka[self.wiersz][self.kolumna + 1])
-        if self.kolumna > 0 and not siatka[self.wiersz][self.kolumna - 1].czy_bariera():
-            self.sasiedzi.append(siatka[self.wiersz][self.kolumna - 1])
-
     def __lt__(self, inny):
         return False
 
 
-def heurystyka(p1, p2):
-    x1, y1 = p1
-    x2, y2 = p2
-    return abs(x1 - x2) + abs(y1 - y2)
-
-def heurystyka_euklidesowa(p1, p2):
-    x1, y1 = p1
-    x2, y2 = p2
-    return ((x1 - x2)**2 + (y1 - y2)**2) ** 0.5
-
 def odtworz_sciezke(skamd, obecny, rysuj):
+    # zdarzenia okna obsługuje harmonogram raz na klatkę, nie przy każdym polu
     while obecny in skamd:
-        for zdarzenie in pygame.event.get():
-            if zdarzenie.type == pygame.QUIT:
-                pygame.quit()
         obecny = skamd[obecny]
         if not obecny.czy_start() and not obecny.czy_cel():
             obecny.ustaw_sciezka()
         rysuj()
 
 
-def astar(rysuj, siatka, start, koniec):
-    licznik = 0
-    otwarte = PriorityQueue()
-    otwarte.put((0, licznik, start))
-    skad = {}
-    koszt_g = {pole: float("inf") for rzad in siatka for pole in rzad}
-    koszt_g[start] = 0
-    koszt_f = {pole: float("inf") for rzad in siatka for pole in rzad}
-    koszt_f[start] = heurystyka(start.pozycja(), koniec.pozycja())
-    zamkniete = {start}
-
-    while not otwarte.empty():
-        for zdarzenie in pygame.event.get():
-            if zdarzenie.type == pygame.QUIT:
-                pygame.quit()
-
-        obecny = otwarte.get()[2]
-        if obecny == koniec:
-            odtworz_sciezke(skad, koniec, rysuj)
-            koniec.ustaw_cel()
-            return True
-        for sasiad in obecny.sasiedzi:
-            tymczasowy_g = koszt_g[obecny] + 1
-
-            if tymczasowy_g < koszt_g[sasiad]:
-                skad[sasiad] = obecny
-                koszt_g[sasiad] = tymczasowy_g
-                koszt_f[sasiad] = tymczasowy_g + heurystyka(sasiad.pozycja(), koniec.pozycja())
-                if sasiad not in zamkniete:
-                    licznik += 1
-                    otwarte.put((koszt_f[sasiad], licznik, sasiad))
-                    zamkniete.add(sasiad)
-                    sasiad.ustaw_otwarty()
-
-        rysuj()
-        if obecny != start:
-            obecny.ustaw_zamkniety()
-    return False
-
-def astar_euklides(rysuj, siatka, start, koniec):
-    licznik = 0
-    otwarte = PriorityQueue()
-    otwarte.put((0, licznik, start))
-    skad = {}
-    koszt_g = {pole: float("inf") for rzad in siatka for pole in rzad}
-    koszt_g[start] = 0
-    koszt_f = {pole: float("inf") for rzad in siatka for pole in rzad}
-    koszt_f[start] = heurystyka_euklidesowa(start.pozycja(), koniec.pozycja())
-    zamkniete = {start}
-
-    while not otwarte.empty():
-        for zdarzenie in pygame.event.get():
-            if zdarzenie.type == pygame.QUIT:
-                pygame.quit()
-        obecny = otwarte.get()[2]
-        if obecny == koniec:
-            odtworz_sciezke(skad, koniec, rysuj)
-            koniec.ustaw_cel()
-            return True
-        for sasiad in obecny.sasiedzi:
-            tymczasowy_g = koszt_g[obecny] + 1
-            if tymczasowy_g < koszt_g[sasiad]:
-                skad[sasiad] = obecny
-                koszt_g[sasiad] = tymczasowy_g
-                koszt_f[sasiad] = tymczasowy_g + heurystyka_euklidesowa(sasiad.pozycja(), koniec.pozycja())
-                if sasiad not in zamkniete:
-                    licznik += 1
-                    otwarte.put((koszt_f[sasiad], licznik, sasiad))
-                    zamkniete.add(sasiad)
-                    sasiad.ustaw_otwarty()
-        rysuj()
-        if obecny != start:
-            obecny.ustaw_zamkniety()
-    return False
-
-def bfs(rysuj, siatka, start, koniec):
-    kolejka = Queue()
-    kolejka.put(start)
-    odwiedzone = {start}
-    skad = {}
-    while not kolejka.empty():
-        for zdarzenie in pygame.event.get():
-            if zdarzenie.type == pygame.QUIT:
-                pygame.quit()
-        obecny = kolejka.get()
-        if obecny == koniec:
-            odtworz_sciezke(skad, koniec, rysuj)
-            koniec.ustaw_cel()
-            return True
-        for sasiad in obecny.sasiedzi:
-            if sasiad not in odwiedzone:
-                kolejka.put(sasiad)
-                odwiedzone.add(sasiad)
-                skad[sasiad] = obecny
-                sasiad.ustaw_otwarty()
-        rysuj()
-        if obecny != start:
-            obecny.ustaw_zamkniety()
-    return False
-
-
-def dijkstra(rysuj, siatka, start, koniec):
-    licznik = 0
-    otwarte = PriorityQueue()
-    otwarte.put((licznik, start))
-    skad = {}
-    koszt_g = {pole: float("inf") for rzad in siatka for pole in rzad}
-    koszt_g[start] = 0
-    odwiedzone = {start}
-
-    while not otwarte.empty():
+def zastosuj_zdarzenie(siatka, zdarzenie, pozycja):
+    pole = siatka[pozycja[0]][pozycja[1]]
+    if pole.czy_start() or pole.czy_cel():
+        return
+    if zdarzenie == silnik.OTWARTE:
+        pole.ustaw_otwarty()
+    elif zdarzenie == silnik.ZAMKNIETE:
+        pole.ustaw_zamkniety()
+    else:
+        pole.ustaw_sciezka()
+
+
+class Harmonogram:
+    """
+    Zastępuje dawne rysuj() przekazywane algorytmom. Wywołanie harmonogramu
+    przerysowuje tylko pola zmienione od ostatniej klatki (dirty rects),
+    nie częściej niż `fps` razy na sekundę albo co `co_ile` wywołań.
+    W trybie odtwarzania algorytm jedynie nagrywa zdarzenia, a animacja
+    odtwarzana jest dopiero po pomiarze czasu (zakoncz()). W animacji na
+    żywo obserwator_rysujacy sumuje w `czas_obserwatora` czas kolorowania
+    pól i klatek rysowanych w trakcie wyszukiwania, żeby odjąć go od czasu
+    algorytmu.
+    """
+
+    def __init__(self, okno, siatka, fps=FPS_ANIMACJI, co_ile=None, odtwarzanie=False):
+        self.okno = okno
+        self.siatka = siatka
+        self.fps = fps
+        self.co_ile = co_ile
+        self.odtwarzanie = odtwarzanie
+        self.nagranie = []
+        self.wywolania = 0
+        self.ostatnia_klatka = 0.0
+        self.czas_obserwatora = 0.0
+
+    def __call__(self):
+        if self.odtwarzanie:
+            return
+        self.wywolania += 1
+        if self.co_ile:
+            if self.wywolania % self.co_ile:
+                return
+        elif time.perf_counter() - self.ostatnia_klatka < 1 / self.fps:
+            return
+        self.klatka()
+
+    def nagraj(self, zdarzenie, pozycja):
+        self.nagranie.append((zdarzenie, pozycja))
+
+    def klatka(self):
         for zdarzenie in pygame.event.get():
             if zdarzenie.type == pygame.QUIT:
                 pygame.quit()
-        obecny = otwarte.get()[1]
-        if obecny == koniec:
-            odtworz_sciezke(skad, koniec, rysuj)
-            koniec.ustaw_cel()
-            return True
-        for sasiad in obecny.sasiedzi:
-            tymczasowy_g = koszt_g[obecny] + 1
-            if tymczasowy_g < koszt_g[sasiad]:
-                skad[sasiad] = obecny
-                koszt_g[sasiad] = tymczasowy_g
-                if sasiad not in odwiedzone:
-                    licznik += 1
-                    otwarte.put((licznik, sasiad))
-                    odwiedzone.add(sasiad)
-                    sasiad.ustaw_otwarty()
+                sys.exit()
+        prostokaty = [self.rysuj_pole(pole) for pole in set(zmienione_pola)]
+        zmienione_pola.clear()
+        if prostokaty:
+            pygame.display.update(prostokaty)
+        self.ostatnia_klatka = time.perf_counter()
+
+    def rysuj_pole(self, pole):
+        pole.rysuj(self.okno)
+        # linie siatki na górnej i lewej krawędzi pola; prawą i dolną rysują sąsiedzi
+        pygame.draw.line(self.okno, SZARY, (pole.x, pole.y), (pole.x + pole.rozmiar - 1, pole.y))
+        pygame.draw.line(self.okno, SZARY, (pole.x, pole.y), (pole.x, pole.y + pole.rozmiar - 1))
+        return pygame.Rect(pole.x, pole.y, pole.rozmiar, pole.rozmiar)
+
+    def odtworz(self):
+        """
+        Odtwarza nagrane zdarzenia w ciągu około CZAS_ODTWARZANIA sekund.
+        """
+        zegar = pygame.time.Clock()
+        na_klatke = max(1, -(-len(self.nagranie) // int(CZAS_ODTWARZANIA * self.fps)))
+        for i in range(0, len(self.nagranie), na_klatke):
+            for zdarzenie, pozycja in self.nagranie[i:i + na_klatke]:
+                zastosuj_zdarzenie(self.siatka, zdarzenie, pozycja)
+            self.klatka()
+            zegar.tick(self.fps)
+        self.nagranie = []
+
+    def zakoncz(self):
+        if self.odtwarzanie:
+            self.odtworz()
+        self.klatka()
+
+
+def obserwator_rysujacy(siatka, rysuj):
+    """
+    Obserwator wyszukiwania w silniku: koloruje pola otwarte i zamknięte
+    i zgłasza harmonogramowi każde zdarzenie (klatkę rysuje on najwyżej
+    FPS_ANIMACJI razy na sekundę). W trybie odtwarzania tylko nagrywa zdarzenia.
+    """
+    if getattr(rysuj, "odtwarzanie", False):
+        return rysuj.nagraj
+
+    def obserwator(zdarzenie, pozycja):
+        od = time.perf_counter()
+        zastosuj_zdarzenie(siatka, zdarzenie, pozycja)
         rysuj()
-        if obecny != start:
-            obecny.ustaw_zamkniety()
-    return False
-
-
-def dfs(rysuj, siatka, start, koniec):
-    odwiedzone = {start}
-    sciezka = [start]
-    def rekurencja(obecny):
-        for zdarzenie in pygame.event.get():
-            if zdarzenie.type == pygame.QUIT:
-                pygame.quit()
-        if not obecny.czy_start() and not obecny.czy_cel():
-            obecny.ustaw_otwarty()
-        if obecny == koniec:
-            sciezka_map = {sciezka[i]: sciezka[i - 1] for i in range(1, len(sciezka))}
-            odtworz_sciezke(sciezka_map, obecny, rysuj)
-            koniec.ustaw_cel()
-            return True
-        for sasiad in obecny.sasiedzi:
-            if sasiad not in odwiedzone:
-                odwiedzone.add(sasiad)
-                sciezka.append(sasiad)
-                if rekurencja(sasiad):
-                    return True
-                sciezka.pop()
-        return False
-
-    return rekurencja(start)
+        rysuj.czas_obserwatora += time.perf_counter() - od
+    return obserwator
+
+def pokaz_sciezke(wynik, siatka, rysuj):
+    if wynik.znaleziono and getattr(rysuj, "odtwarzanie", False):
+        for pozycja in reversed(wynik.sciezka[1:-1]):
+            rysuj.nagraj(SCIEZKA, pozycja)
+    elif wynik.znaleziono:
+        skad = {siatka[w][k]: siatka[wp][kp] for (wp, kp), (w, k) in zip(wynik.sciezka, wynik.sciezka[1:])}
+        koniec = siatka[wynik.sciezka[-1][0]][wynik.sciezka[-1][1]]
+        odtworz_sciezke(skad, koniec, rysuj)
+    return wynik
+
+def astar(rysuj, siatka, start, koniec, rdzen):
+    wynik = silnik.astar(rdzen, start.pozycja(), koniec.pozycja(), "manhattan", obserwator_rysujacy(siatka, rysuj))
+    return pokaz_sciezke(wynik, siatka, rysuj)
+
+def astar_euklides(rysuj, siatka, start, koniec, rdzen):
+    wynik = silnik.astar(rdzen, start.pozycja(), koniec.pozycja(), "euklidesowa", obserwator_rysujacy(siatka, rysuj))
+    return pokaz_sciezke(wynik, siatka, rysuj)
+
+def bfs(rysuj, siatka, start, koniec, rdzen):
+    wynik = silnik.bfs(rdzen, start.pozycja(), koniec.pozycja(), obserwator_rysujacy(siatka, rysuj))
+    return pokaz_sciezke(wynik, siatka, rysuj)
+
+def dijkstra(rysuj, siatka, start, koniec, rdzen):
+    wynik = silnik.dijkstra(rdzen, start.pozycja(), koniec.pozycja(), obserwator_rysujacy(siatka, rysuj))
+    return pokaz_sciezke(wynik, siatka, rysuj)
+
+def jps(rysuj, siatka, start, koniec, rdzen):
+    wynik = silnik.jps(rdzen, start.pozycja(), koniec.pozycja(), obserwator_rysujacy(siatka, rysuj))
+    return pokaz_sciezke(wynik, siatka, rysuj)
+
+def jps_plus(rysuj, siatka, start, koniec, rdzen):
+    wynik = silnik.jps_plus(rdzen, start.pozycja(), koniec.pozycja(), obserwator_rysujacy(siatka, rysuj))
+    return pokaz_sciezke(wynik, siatka, rysuj)
+
+@zmierz_statystyki
+def dstar_lite(rysuj, siatka, start, koniec, planer):
+    """
+    Planowanie planerem D* Lite zachowującym stan między wywołaniami; po zmianie
+    barier kolorowane są tylko pola, których dotknęło przeplanowanie.
+    """
+    wynik = planer.planuj(obserwator_rysujacy(siatka, rysuj))
+    return pokaz_sciezke(wynik, siatka, rysuj)
+
+@zmierz_statystyki
+def hpa_gwiazdka(rysuj, siatka, start, koniec, rdzen):
+    """
+    HPA*: na zielono i czerwono zaznaczane są tylko węzły grafu abstrakcyjnego.
+    """
+    wynik = hpa.hpa(rdzen, start.pozycja(), koniec.pozycja(), obserwator_rysujacy(siatka, rysuj))
+    return pokaz_sciezke(wynik, siatka, rysuj)
+
+def porownanie_z_astar(rdzen, start, koniec):
+    """
+    Liczba pól rozwiniętych przez ostatnie wyszukiwanie i przez A* (Manhattan)
+    na tej samej siatce; A* uruchamiany jest bez rysowania, poza pomiarem czasu.
+    """
+    wzorzec = silnik.astar(rdzen, start.pozycja(), koniec.pozycja())
+    if ostatni_wynik.koszt != wzorzec.koszt:
+        # HPA* nie gwarantuje najkrótszej ścieżki
+        return f"  Rozwiniete: {ostatni_wynik.rozwiniete} (A*: {wzorzec.rozwiniete}, dlugosc {wzorzec.koszt})"
+    return f"  Rozwiniete: {ostatni_wynik.rozwiniete} (A*: {wzorzec.rozwiniete})"
+
+
+def dfs(rysuj, siatka, start, koniec, rdzen):
+    wynik = silnik.dfs(rdzen, start.pozycja(), koniec.pozycja(), obserwator_rysujacy(siatka, rysuj))
+    return pokaz_sciezke(wynik, siatka, rysuj)
 
 astar = zmierz_statystyki(astar)
 astar_euklides = zmierz_statystyki(astar_euklides)
 bfs = zmierz_statystyki(bfs)
 dijkstra = zmierz_statystyki(dijkstra)
 dfs = zmierz_statystyki(dfs)
+jps = zmierz_statystyki(jps)
+jps_plus = zmierz_statystyki(jps_plus)
 
 def wyczysc_tymczasowe_pola(siatka):
     for rzad in siatka:
@@ -308,8 +318,7 @@ def rysuj_siatke(okno, wiersze, szerokosc):
     rozmiar = szerokosc // wiersze
     for i in range(wiersze):
         pygame.draw.line(okno, SZARY, (0, i * rozmiar), (szerokosc, i * rozmiar))
-        for j in range(wiersze):
-            pygame.draw.line(okno, SZARY, (j * rozmiar, 0), (j * rozmiar, szerokosc))
+        pygame.draw.line(okno, SZARY, (i * rozmiar, 0), (i * rozmiar, szerokosc))
 
 
 def rysuj(okno, siatka, wiersze, szerokosc):
@@ -324,6 +333,7 @@ def rysuj(okno, siatka, wiersze, szerokosc):
         tekst = czcionka.render(statystyki_algorytmu, True, (0, 0, 0))
         okno.blit(tekst, (10, szerokosc + 10))  
     pygame.display.update()
+    zmienione_pola.clear()
 
 def kliknieta_pozycja(poz, wiersze, szerokosc):
     rozmiar = szerokosc // wiersze
@@ -332,12 +342,17 @@ def kliknieta_pozycja(poz, wiersze, szerokosc):
 
 
 def start_program(okno, szerokosc):
+    global statystyki_algorytmu
     WIERSZE = 50
     WYSOKOSC_SIATKI = szerokosc
     WYSOKOSC_OKNA = szerokosc + 40  # dodatkowy pasek na statystyki
     OKNO = pygame.display.set_mode((szerokosc, WYSOKOSC_OKNA))
     siatka = utworz_siatke(WIERSZE, szerokosc)
+    rdzen = silnik.Siatka(WIERSZE)  # stan barier dla algorytmów; siatka Pole służy do rysowania
     poczatek = koniec = None
+    odtwarzanie = False  # klawisz R: najpierw obliczenia, potem odtworzenie animacji
+    planer = None        # silnik.DStarLite dla klawisza 8, zachowywany między przeplanowaniami
+    zmiany = []          # pola, których bariera zmieniła się od ostatniego planowania D* Lite
     dziala = True
 
     while dziala:
@@ -359,58 +374,83 @@ def start_program(okno, szerokosc):
                     koniec.ustaw_cel()
                 elif pole != koniec and pole != poczatek:
                     pole.ustaw_bariera()
+                    if not rdzen.czy_bariera(w, k):
+                        rdzen.ustaw_bariere(w, k)
+                        zmiany.append((w, k))
+                if pole in (poczatek, koniec) and rdzen.czy_bariera(w, k):
+                    # start i cel postawione na dawnej barierze zwalniają pole w silniku
+                    rdzen.ustaw_bariere(w, k, False)
+                    zmiany.append((w, k))
 
             elif pygame.mouse.get_pressed()[2]:
                 poz = pygame.mouse.get_pos()
                 w, k = kliknieta_pozycja(poz, WIERSZE, szerokosc)
                 pole = siatka[w][k]
                 pole.zresetuj()
+                if rdzen.czy_bariera(w, k):
+                    rdzen.ustaw_bariere(w, k, False)
+                    zmiany.append((w, k))
                 if pole == poczatek:
                     poczatek = None
                 elif pole == koniec:
                     koniec = None
 
             if zdarzenie.type == pygame.KEYDOWN:
+                if zdarzenie.key == pygame.K_r:
+                    odtwarzanie = not odtwarzanie
+                    statystyki_algorytmu = "Tryb: " + ("obliczenia, potem odtworzenie" if odtwarzanie else "animacja na żywo")
+
                 if zdarzenie.key == pygame.K_c:
                     poczatek = koniec = None
                     siatka = utworz_siatke(WIERSZE, szerokosc)
+                    rdzen = silnik.Siatka(WIERSZE)
+                    planer = None
 
                 if zdarzenie.key == pygame.K_1 and poczatek and koniec:
                     wyczysc_tymczasowe_pola(siatka)
-                    for rzad in siatka:
-                        for pole in rzad:
-                            pole.aktualizuj_sasiadow(siatka)
-                    dijkstra(lambda: rysuj(okno, siatka, WIERSZE, szerokosc), siatka, poczatek, koniec)
+                    dijkstra(Harmonogram(okno, siatka, odtwarzanie=odtwarzanie), siatka, poczatek, koniec, rdzen)
 
                 if zdarzenie.key == pygame.K_2 and poczatek and koniec:
                     wyczysc_tymczasowe_pola(siatka)
-                    for rzad in siatka:
-                        for pole in rzad:
-                            pole.aktualizuj_sasiadow(siatka)
-                    astar(lambda: rysuj(okno, siatka, WIERSZE, szerokosc), siatka, poczatek, koniec)
+                    astar(Harmonogram(okno, siatka, odtwarzanie=odtwarzanie), siatka, poczatek, koniec, rdzen)
 
                 if zdarzenie.key == pygame.K_3 and poczatek and koniec:
                     wyczysc_tymczasowe_pola(siatka)
-                    for rzad in siatka:
-                        for pole in rzad:
-                            pole.aktualizuj_sasiadow(siatka)
-                    bfs(lambda: rysuj(okno, siatka, WIERSZE, szerokosc), siatka, poczatek, koniec)
+                    bfs(Harmonogram(okno, siatka, odtwarzanie=odtwarzanie), siatka, poczatek, koniec, rdzen)
 
                 if zdarzenie.key == pygame.K_4 and poczatek and koniec:
                     wyczysc_tymczasowe_pola(siatka)
-                    for rzad in siatka:
-                        for pole in rzad:
-                            pole.aktualizuj_sasiadow(siatka)
-                    odwiedzone = {poczatek}
-                    sciezka = [poczatek]
-                    dfs(lambda: rysuj(okno, siatka, WIERSZE, szerokosc), siatka, poczatek, koniec)
+                    dfs(Harmonogram(okno, siatka, odtwarzanie=odtwarzanie), siatka, poczatek, koniec, rdzen)
 
                 if zdarzenie.key == pygame.K_5 and poczatek and koniec:
                     wyczysc_tymczasowe_pola(siatka)
-                    for rzad in siatka:
-                        for pole in rzad:
-                            pole.aktualizuj_sasiadow(siatka)
-                    astar_euklides(lambda: rysuj(okno, siatka, WIERSZE, szerokosc), siatka, poczatek, koniec)
+                    astar_euklides(Harmonogram(okno, siatka, odtwarzanie=odtwarzanie), siatka, poczatek, koniec, rdzen)
+
+                if zdarzenie.key == pygame.K_6 and poczatek and koniec:
+                    wyczysc_tymczasowe_pola(siatka)
+                    jps(Harmonogram(okno, siatka, odtwarzanie=odtwarzanie), siatka, poczatek, koniec, rdzen)
+                    statystyki_algorytmu += porownanie_z_astar(rdzen, poczatek, koniec)
+
+                if zdarzenie.key == pygame.K_7 and poczatek and koniec:
+                    wyczysc_tymczasowe_pola(siatka)
+                    jps_plus(Harmonogram(okno, siatka, odtwarzanie=odtwarzanie), siatka, poczatek, koniec, rdzen)
+                    statystyki_algorytmu += porownanie_z_astar(rdzen, poczatek, koniec)
+
+                if zdarzenie.key == pygame.K_8 and poczatek and koniec:
+                    wyczysc_tymczasowe_pola(siatka)
+                    if planer is None or planer.t != rdzen.indeks(*koniec.pozycja()):
+                        planer = silnik.DStarLite(rdzen, poczatek.pozycja(), koniec.pozycja())
+                    else:
+                        planer.przesun_start(poczatek.pozycja())
+                        planer.zmien_pola(zmiany)
+                    zmiany.clear()
+                    dstar_lite(Harmonogram(okno, siatka, odtwarzanie=odtwarzanie), siatka, poczatek, koniec, planer)
+                    statystyki_algorytmu += porownanie_z_astar(rdzen, poczatek, koniec)
+
+                if zdarzenie.key == pygame.K_9 and poczatek and koniec:
+                    wyczysc_tymczasowe_pola(siatka)
+                    hpa_gwiazdka(Harmonogram(okno, siatka, odtwarzanie=odtwarzanie), siatka, poczatek, koniec, rdzen)
+                    statystyki_algorytmu += porownanie_z_astar(rdzen, poczatek, koniec)
     pygame.quit()
 
 
@@ -0,0 +1,330 @@
+"""
+HPA* (Hierarchical Path-Finding A*, Botea i in.) nad silnikiem siatki.
+
+Siatka dzielona jest na kwadratowe klastry. Na każdej granicy sąsiednich
+klastrów wolne odcinki dostają przejścia (pary pól po obu stronach granicy),
+a wewnątrz klastra wyznaczane są odległości między jego polami przejść.
+Zapytanie dołącza start i cel do grafu abstrakcyjnego, szuka w nim A*
+i dopiero potem, odcinek po odcinku, zamienia ścieżkę abstrakcyjną na pola.
+Ścieżka jest bliska optymalnej, ale nie zawsze najkrótsza.
+
+Po zmianie barier przebudowywane są tylko klastry, w których zmieniły się
+pola, oraz ich sąsiedzi (granice współdzielone z tymi klastrami).
+
+A* po grafie abstrakcyjnym pochodzi ze wspólnego rdzenia src/wyszukiwanie
+(graf abstrakcyjny jest dla niego adapterem, _AdapterAbstrakcyjny).
+BFS ograniczony do klastra (_odleglosci, _odcinek) zostaje tutaj: przy
+budowie hierarchii wywoływany jest dla każdego węzła, a przez adapter
+rdzenia (wywołanie nastepniki(u) na każde pole) budowa trwała dwa razy dłużej.
+
+Przykład:
+    python hpa.py --rozmiar 500 --klaster 16
+"""
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+
+import silnik_siatki as silnik  # dodaje też src do sys.path
+import wyszukiwanie
+from silnik_siatki import WOLNE, Wynik, odmierz
+
+ROZMIAR_KLASTRA = 10
+# wolny odcinek granicy o co najmniej tej długości dostaje dwa przejścia (na końcach), krótszy jedno
+DLUGI_ODCINEK = 6
+
+
+class _AdapterAbstrakcyjny:
+    """
+    Graf abstrakcyjny z dołączonym startem s (krawędzie ze_startu) i celem t
+    (krawędzie do_celu z węzłów jego klastra) dla A* rdzenia.
+    """
+
+    def __init__(self, hierarchia, s, ze_startu, t, do_celu):
+        self.hierarchia = hierarchia
+        self.s, self.ze_startu = s, ze_startu
+        self.t, self.do_celu = t, do_celu
+
+    def sasiedzi(self, u):
+        hierarchia = self.hierarchia
+        wewnetrzne = self.ze_startu if u == self.s else hierarchia.wewnetrzne[hierarchia.klaster[u]].get(u, {})
+        sasiedzi = list(wewnetrzne.items())
+        sasiedzi += hierarchia.zewnetrzne.get(u, {}).items()
+        if u in self.do_celu:
+            sasiedzi.append((self.t, self.do_celu[u]))
+        return sasiedzi
+
+    def waga(self, u, v):
+        return dict(self.sasiedzi(u))[v]
+
+    def maks_waga_calkowita(self):
+        return None
+
+
+class HierarchiaHPA:
+    """
+    Graf abstrakcyjny HPA* dla silnik_siatki.Siatka. Węzłami są pola przejść
+    (płaskie indeksy), krawędziami przejścia między klastrami (koszt 1)
+    i odległości wewnątrz klastrów.
+    """
+
+    def __init__(self, siatka, rozmiar_klastra=ROZMIAR_KLASTRA):
+        self.siatka = siatka
+        self.rozmiar_klastra = rozmiar_klastra
+        self.wiersze_klastrow = -(-siatka.wiersze // rozmiar_klastra)
+        self.kolumny_klastrow = -(-siatka.kolumny // rozmiar_klastra)
+        # numer klastra każdego pola; ramka ma -1, więc przeszukiwanie w klastrze jej nie opuszcza
+        klaster = np.full(len(siatka.pola), -1, dtype=np.int32)
+        w, k = np.indices((siatka.wiersze, siatka.kolumny))
+        klaster.reshape(siatka.wiersze + 2, siatka.szerokosc)[1:-1, 1:-1] = (
+            (w // rozmiar_klastra) * self.kolumny_klastrow + k // rozmiar_klastra)
+        self.klaster = memoryview(klaster)
+        self.przejscia = {}     # (klaster, sąsiedni klaster) -> pary pól (u, v) po obu stronach granicy
+        self.zewnetrzne = {}    # pole przejścia -> {pole po drugiej stronie granicy: 1}
+        self.wewnetrzne = [{} for _ in range(self.wiersze_klastrow * self.kolumny_klastrow)]
+        self.kopia = siatka.pola.copy()
+        self.wersja = siatka.wersja
+
+        for c in range(len(self.wewnetrzne)):
+            for granica in self._granice_klastra(c):
+                if granica[0] == c:
+                    self._wyznacz_przejscia(granica)
+        for c in range(len(self.wewnetrzne)):
+            self._wyznacz_odleglosci(c)
+
+    @classmethod
+    def dla(cls, siatka, rozmiar_klastra=ROZMIAR_KLASTRA):
+        """
+        Hierarchia zapamiętana w siatce (siatka.hierarchia_hpa), uaktualniona
+        lokalnie po zmianach barier; budowana od nowa tylko przy pierwszym
+        użyciu albo innym rozmiarze klastra.
+        """
+        hierarchia = siatka.hierarchia_hpa
+        if hierarchia is None or hierarchia.rozmiar_klastra != rozmiar_klastra:
+            hierarchia = siatka.hierarchia_hpa = cls(siatka, rozmiar_klastra)
+        else:
+            hierarchia.aktualizuj()
+        return hierarchia
+
+    def _granice_klastra(self, c):
+        """
+        Granice klastra z sąsiadami jako pary (mniejszy numer, większy numer).
+        """
+        kk = self.kolumny_klastrow
+        cw, ck = divmod(c, kk)
+        granice = []
+        if ck > 0:
+            granice.append((c - 1, c))
+        if ck < kk - 1:
+            granice.append((c, c + 1))
+        if cw > 0:
+            granice.append((c - kk, c))
+        if cw < self.wiersze_klastrow - 1:
+            granice.append((c, c + kk))
+        return granice
+
+    def _pary_graniczne(self, a, b):
+        """
+        Pary sąsiadujących pól (u w klastrze a, v w klastrze b) wzdłuż granicy.
+        """
+        siatka, r = self.siatka, self.rozmiar_klastra
+        cw, ck = divmod(a, self.kolumny_klastrow)
+        if b == a + 1:
+            kolumna = (ck + 1) * r
+            wiersze = range(cw * r, min((cw + 1) * r, siatka.wiersze))
+            return [(siatka.indeks(w, kolumna - 1), siatka.indeks(w, kolumna)) for w in wiersze]
+        wiersz = (cw + 1) * r
+        kolumny = range(ck * r, min((ck + 1) * r, siatka.kolumny))
+        return [(siatka.indeks(wiersz - 1, k), siatka.indeks(wiersz, k)) for k in kolumny]
+
+    def _wyznacz_przejscia(self, granica):
+        mapa, zewnetrzne = self.siatka.mapa, self.zewnetrzne
+        for u, v in self.przejscia.pop(granica, ()):
+            for x, y in ((u, v), (v, u)):
+                del zewnetrzne[x][y]
+                if not zewnetrzne[x]:
+                    del zewnetrzne[x]
+
+        pary = []
+        odcinek = []
+        for u, v in self._pary_graniczne(*granica) + [(None, None)]:
+            if u is not None and mapa[u] == WOLNE and mapa[v] == WOLNE:
+                odcinek.append((u, v))
+                continue
+            if len(odcinek) >= DLUGI_ODCINEK:
+                pary += [odcinek[0], odcinek[-1]]
+            elif odcinek:
+                pary.append(odcinek[len(odcinek) // 2])
+            odcinek = []
+        for u, v in pary:
+            zewnetrzne.setdefault(u, {})[v] = 1
+            zewnetrzne.setdefault(v, {})[u] = 1
+        self.przejscia[granica] = pary
+
+    def _wezly(self, c):
+        klaster = self.klaster
+        wezly = set()
+        for granica in self._granice_klastra(c):
+            for u, v in self.przejscia.get(granica, ()):
+                wezly.add(u if klaster[u] == c else v)
+        return wezly
+
+    def _odleglosci(self, zrodlo, c):
+        """
+        BFS z pola `zrodlo` ograniczony do klastra c: słownik pole -> odległość.
+        """
+        mapa, klaster, przesuniecia = self.siatka.mapa, self.klaster, self.siatka.przesuniecia
+        odleglosc = {zrodlo: 0}
+        kolejka = deque([zrodlo])
+        while kolejka:
+            u = kolejka.popleft()
+            d = odleglosc[u] + 1
+            for p in przesuniecia:
+                v = u + p
+                if mapa[v] == WOLNE and klaster[v] == c and v not in odleglosc:
+                    odleglosc[v] = d
+                    kolejka.append(v)
+        return odleglosc
+
+    def _wyznacz_odleglosci(self, c):
+        wezly = self._wezly(c)
+        wewnetrzne = {}
+        for u in wezly:
+            odleglosc = self._odleglosci(u, c)
+            wewnetrzne[u] = {v: odleglosc[v] for v in wezly if v != u and v in odleglosc}
+        self.wewnetrzne[c] = wewnetrzne
+
+    def aktualizuj(self):
+        """
+        Lokalna aktualizacja po zmianach barier w siatce: przejścia na
+        granicach zmienionych klastrów i odległości w nich oraz w sąsiadach.
+        Zwraca liczbę przebudowanych klastrów.
+        """
+        siatka = self.siatka
+        if siatka.wersja == self.wersja:
+            return 0
+        zmienione = np.flatnonzero(siatka.pola != self.kopia)
+        granice = {granica for c in {self.klaster[int(i)] for i in zmienione} for granica in self._granice_klastra(c)}
+        for granica in granice:
+            self._wyznacz_przejscia(granica)
+        klastry = {c for granica in granice for c in granica} | {self.klaster[int(i)] for i in zmienione}
+        for c in klastry:
+            self._wyznacz_odleglosci(c)
+        self.kopia[:] = siatka.pola
+        self.wersja = siatka.wersja
+        return len(klastry)
+
+    def _dolacz(self, pole, c):
+        """
+        Odległości od pola (start albo cel) do węzłów jego klastra.
+        """
+        odleglosc = self._odleglosci(pole, c)
+        return {v: odleglosc[v] for v in self._wezly(c) if v != pole and v in odleglosc}, odleglosc
+
+    def szukaj(self, start, cel, obserwator=None):
+        """
+        A* po grafie abstrakcyjnym i doprecyzowanie ścieżki do pól. Wynik.rozwiniete
+        i odwiedzone dotyczą węzłów grafu abstrakcyjnego.
+        """
+        czasy = {}
+        znacznik = time.perf_counter()
+        self.aktualizuj()
+        znacznik = odmierz(czasy, "aktualizacja", znacznik)
+        siatka, klaster = self.siatka, self.klaster
+        s, t = siatka.indeks(*start), siatka.indeks(*cel)
+        if siatka.mapa[s] != WOLNE or siatka.mapa[t] != WOLNE:
+            return Wynik(False, [], 0, 0, 0, 0, czasy)
+        ze_startu, odleglosc_s = self._dolacz(s, klaster[s])
+        if t in odleglosc_s:
+            ze_startu[t] = odleglosc_s[t]
+        do_celu, _ = self._dolacz(t, klaster[t])
+
+        adapter = _AdapterAbstrakcyjny(self, s, ze_startu, t, do_celu)
+        odmierz(czasy, "przygotowanie", znacznik)
+        wynik = wyszukiwanie.astar(adapter, s, t, silnik.heurystyka(siatka, t), wyszukiwanie.KopiecBinarny(),
+                                   silnik.obserwator_indeksow(siatka, obserwator))
+        for etap, sekundy in wynik.czasy.items():
+            czasy[etap] = czasy.get(etap, 0.0) + sekundy
+        wynik.czasy = czasy
+        if not wynik.znaleziono:
+            return wynik
+        znacznik = time.perf_counter()
+        wynik.sciezka = [siatka.pozycja(i) for i in self.udoskonal(wynik.sciezka)]
+        wynik.koszt = len(wynik.sciezka) - 1
+        odmierz(czasy, "sciezka", znacznik)
+        return wynik
+
+    def udoskonal(self, abstrakcyjna):
+        """
+        Generator pól ścieżki dla ścieżki abstrakcyjnej; kolejny odcinek
+        wewnątrz klastra wyznaczany jest dopiero wtedy, gdy jest potrzebny.
+        """
+        klaster = self.klaster
+        yield abstrakcyjna[0]
+        for u, v in zip(abstrakcyjna, abstrakcyjna[1:]):
+            if klaster[u] != klaster[v]:
+                yield v
+            else:
+                yield from self._odcinek(u, v, klaster[u])[1:]
+
+    def _odcinek(self, u, v, c):
+        mapa, klaster, przesuniecia = self.siatka.mapa, self.klaster, self.siatka.przesuniecia
+        skad = {u: u}
+        kolejka = deque([u])
+        while kolejka:
+            x = kolejka.popleft()
+            if x == v:
+                break
+            for p in przesuniecia:
+                y = x + p
+                if mapa[y] == WOLNE and klaster[y] == c and y not in skad:
+                    skad[y] = x
+                    kolejka.append(y)
+        odcinek = [v]
+        while odcinek[-1] != u:
+            odcinek.append(skad[odcinek[-1]])
+        odcinek.reverse()
+        return odcinek
+
+
+def hpa(siatka, start, cel, obserwator=None, rozmiar_klastra=ROZMIAR_KLASTRA):
+    return HierarchiaHPA.dla(siatka, rozmiar_klastra).szukaj(start, cel, obserwator)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rozmiar", type=int, default=500, help="liczba wierszy i kolumn")
+    parser.add_argument("--klaster", type=int, default=ROZMIAR_KLASTRA, help="bok klastra w polach")
+    parser.add_argument("--gestosc", type=float, default=0.25, help="udział barier")
+    parser.add_argument("--ziarno", type=int, default=0)
+    args = parser.parse_args()
+
+    siatka = silnik.Siatka.losowa(args.rozmiar, gestosc=args.gestosc, ziarno=args.ziarno)
+    start, cel = (0, 0), (args.rozmiar - 1, args.rozmiar - 1)
+    siatka.ustaw_bariere(*start, False)
+    siatka.ustaw_bariere(*cel, False)
+    print(f"Siatka {args.rozmiar}x{args.rozmiar} ({len(siatka)} pól), bariery: {args.gestosc:.0%}, klaster {args.klaster}")
+
+    start_czas = time.perf_counter()
+    hierarchia = HierarchiaHPA.dla(siatka, args.klaster)
+    print(f"Hierarchia: {len(hierarchia.wewnetrzne)} klastrów, {len(hierarchia.zewnetrzne)} węzłów, "
+          f"zbudowana w {time.perf_counter() - start_czas:.3f}s")
+
+    for nazwa, algorytm in [("HPA*", lambda: hierarchia.szukaj(start, cel)), ("A* (Manhattan)", lambda: silnik.astar(siatka, start, cel))]:
+        start_czas = time.perf_counter()
+        wynik = algorytm()
+        czas = time.perf_counter() - start_czas
+        etapy = "  ".join(f"{etap} {sekundy:.3f}s" for etap, sekundy in wynik.czasy.items())
+        print(f"{nazwa:<16} czas: {czas:.3f}s  rozwinięte: {wynik.rozwiniete}  szczyt frontu: {wynik.szczyt_frontu}  "
+              f"dlugosc sciezki: {wynik.koszt if wynik.znaleziono else '-'}  [{etapy}]")
+
+    zmiana = (args.rozmiar // 2, args.rozmiar // 2)
+    siatka.ustaw_bariere(*zmiana, not siatka.czy_bariera(*zmiana))
+    start_czas = time.perf_counter()
+    przebudowane = hierarchia.aktualizuj()
+    print(f"Zmiana pola {zmiana}: przebudowano {przebudowane} klastrów w {time.perf_counter() - start_czas:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
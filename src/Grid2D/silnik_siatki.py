@@ -0,0 +1,622 @@
+"""
+Bezgraficzny silnik siatki 2D dla Algorytmy_na_siatce_2D.py.
+
+Siatka przechowywana jest jako płaska tablica uint8 (WOLNE / BARIERA) z ramką
+barier o szerokości jednego pola, więc sąsiedzi pola i to zawsze i +- 1
+oraz i +- szerokosc, bez sprawdzania granic. Koszty i poprzednicy trzymane są
+w tablicach int32 (array("i")), a nie w słownikach po obiektach Pole.
+Wyszukiwania nie korzystają z pygame; wizualizacja może śledzić ich przebieg
+przez funkcję `obserwator(zdarzenie, pozycja)`.
+
+A*, Dijkstra, BFS i DFS pochodzą ze wspólnego rdzenia src/wyszukiwanie
+(AdapterSiatki, tablicowe wersje z algorytmy_siatki.py), razem z grafami
+i interactive_map; tu zostają tylko algorytmy właściwe siatce (JPS, JPS+,
+D* Lite) i zamiana pozycji na płaskie indeksy.
+
+Przykład:
+    python silnik_siatki.py --rozmiar 2000 --gestosc 0.25
+"""
+import argparse
+import heapq
+import os
+import sys
+import time
+from array import array
+from math import sqrt
+
+import numpy as np
+
+KATALOG_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if KATALOG_SRC not in sys.path:
+    sys.path.insert(0, KATALOG_SRC)
+import wyszukiwanie
+from wyszukiwanie import OTWARTE, ZAMKNIETE, Wynik, odmierz
+
+WOLNE = 0
+BARIERA = 1
+
+
+class Siatka:
+    """
+    Siatka wiersze x kolumny. Pozycje (wiersz, kolumna) odpowiadają
+    Pole.pozycja(); wewnętrznie pola adresowane są płaskim indeksem z ramką.
+    """
+
+    def __init__(self, wiersze, kolumny=None):
+        self.wiersze = wiersze
+        self.kolumny = wiersze if kolumny is None else kolumny
+        self.szerokosc = self.kolumny + 2
+        self.pola = np.full((self.wiersze + 2) * self.szerokosc, BARIERA, dtype=np.uint8)
+        self.wnetrze()[:] = WOLNE
+        # memoryview daje z Pythona szybszy dostęp do pojedynczych pól niż indeksowanie numpy
+        self.mapa = memoryview(self.pola)
+        # kolejność sąsiadów: dół, góra, prawo, lewo
+        self.przesuniecia = (self.szerokosc, -self.szerokosc, 1, -1)
+        # numer wersji barier; rośnie przy każdej zmianie, unieważniając dane pochodne (np. tablice JPS+)
+        self.wersja = 0
+        self.tablice_jps = None
+        self.hierarchia_hpa = None  # hpa.HierarchiaHPA, uaktualniana lokalnie po zmianach barier
+
+    @classmethod
+    def losowa(cls, wiersze, kolumny=None, gestosc=0.3, ziarno=None):
+        """
+        Siatka z losowymi barierami (każde pole z prawdopodobieństwem `gestosc`).
+        """
+        siatka = cls(wiersze, kolumny)
+        rng = np.random.default_rng(ziarno)
+        wnetrze = siatka.wnetrze()
+        wnetrze[:] = rng.random(wnetrze.shape) < gestosc
+        siatka.wersja += 1
+        return siatka
+
+    def wnetrze(self):
+        """
+        Widok numpy (wiersze, kolumny) na pola bez ramki.
+        """
+        return self.pola.reshape(self.wiersze + 2, self.szerokosc)[1:-1, 1:-1]
+
+    def __len__(self):
+        return self.wiersze * self.kolumny
+
+    def indeks(self, wiersz, kolumna):
+        return (wiersz + 1) * self.szerokosc + kolumna + 1
+
+    def pozycja(self, indeks):
+        wiersz, kolumna = divmod(indeks, self.szerokosc)
+        return wiersz - 1, kolumna - 1
+
+    def czy_bariera(self, wiersz, kolumna):
+        return self.mapa[self.indeks(wiersz, kolumna)] == BARIERA
+
+    def ustaw_bariere(self, wiersz, kolumna, bariera=True):
+        self.mapa[self.indeks(wiersz, kolumna)] = BARIERA if bariera else WOLNE
+        self.wersja += 1
+
+    def wyczysc(self):
+        self.wnetrze()[:] = WOLNE
+        self.wersja += 1
+
+    def sasiedzi(self, indeks):
+        """
+        Wolni sąsiedzi pola (płaskie indeksy).
+        """
+        mapa = self.mapa
+        return [indeks + d for d in self.przesuniecia if mapa[indeks + d] == WOLNE]
+
+
+def _przygotuj(siatka, start, cel):
+    s, t = siatka.indeks(*start), siatka.indeks(*cel)
+    n = len(siatka.pola)
+    koszt_g = array("i", [-1]) * n  # -1: pole jeszcze nie odwiedzone
+    skad = array("i", [-1]) * n
+    koszt_g[s] = 0
+    skad[s] = s
+    return s, t, koszt_g, skad
+
+
+def heurystyka(siatka, cel, rodzaj="manhattan"):
+    """
+    Funkcja h(indeks) szacująca odległość do pola `cel` (płaski indeks).
+    """
+    S = siatka.szerokosc
+    wc, kc = divmod(cel, S)
+    if rodzaj == "manhattan":
+        def h(i):
+            w, k = divmod(i, S)
+            return abs(w - wc) + abs(k - kc)
+    elif rodzaj == "euklidesowa":
+        def h(i):
+            w, k = divmod(i, S)
+            return sqrt((w - wc) ** 2 + (k - kc) ** 2)
+    else:
+        raise ValueError("Nieznana heurystyka: " + rodzaj)
+    return h
+
+
+def obserwator_indeksow(siatka, obserwator):
+    """
+    Obserwator rdzenia (płaskie indeksy) przekazujący pozycje do `obserwator`.
+    """
+    if obserwator is None:
+        return None
+
+    def przekaz(zdarzenie, i):
+        obserwator(zdarzenie, siatka.pozycja(i))
+    return przekaz
+
+
+def _z_rdzenia(siatka, algorytm, start, cel, obserwator, *argumenty):
+    """
+    Wywołuje algorytm rdzenia na AdapterSiatki dla pozycji (wiersz, kolumna)
+    i zamienia ścieżkę płaskich indeksów z powrotem na pozycje.
+    """
+    s, t = siatka.indeks(*start), siatka.indeks(*cel)
+    adapter = wyszukiwanie.AdapterSiatki(siatka, WOLNE)
+    wynik = algorytm(adapter, s, t, *argumenty, obserwator=obserwator_indeksow(siatka, obserwator))
+    znacznik = time.perf_counter()
+    wynik.sciezka = [siatka.pozycja(i) for i in wynik.sciezka]
+    odmierz(wynik.czasy, "sciezka", znacznik)
+    return wynik
+
+
+def astar(siatka, start, cel, rodzaj_heurystyki="manhattan", obserwator=None):
+    """
+    A* z jednostkowym kosztem ruchu. Heurystyka manhattańska daje całkowite,
+    spójne priorytety, więc frontem jest kolejka kubełkowa; przy
+    euklidesowej - kopiec binarny.
+    """
+    kolejka = wyszukiwanie.wybierz_kolejke(wyszukiwanie.AdapterSiatki(siatka, WOLNE),
+                                           calkowite_priorytety=rodzaj_heurystyki == "manhattan")
+    h = heurystyka(siatka, siatka.indeks(*cel), rodzaj_heurystyki)
+    return _z_rdzenia(siatka, wyszukiwanie.astar, start, cel, obserwator, h, kolejka)
+
+
+def dijkstra(siatka, start, cel, obserwator=None):
+    """
+    Dijkstra warstwami (kolejka kubełkowa Diala przy jednostkowym koszcie ruchu).
+    """
+    return _z_rdzenia(siatka, wyszukiwanie.dijkstra, start, cel, obserwator)
+
+
+def bfs(siatka, start, cel, obserwator=None):
+    return _z_rdzenia(siatka, wyszukiwanie.bfs, start, cel, obserwator)
+
+
+def dfs(siatka, start, cel, obserwator=None):
+    """
+    DFS z jawnym stosem, idący w głąb po jednym sąsiedzie (ścieżka zwykle
+    nie jest najkrótsza).
+    """
+    return _z_rdzenia(siatka, wyszukiwanie.dfs, start, cel, obserwator)
+
+
+def _skok_w_wierszu(mapa, S, u, d, t):
+    """
+    Skok JPS wzdłuż wiersza (d = +-1) z pola u. Zwraca pierwszy punkt skoku:
+    cel albo pole z wymuszonym sąsiadem w sąsiednim wierszu (wolnym, choć
+    przy polu poprzednim było tam zablokowane); -1, gdy skok dotarł do bariery.
+    """
+    v = u
+    while True:
+        v += d
+        if mapa[v] != WOLNE:
+            return -1
+        if v == t:
+            return v
+        if (mapa[v + S] == WOLNE and mapa[v - d + S] != WOLNE) or (mapa[v - S] == WOLNE and mapa[v - d - S] != WOLNE):
+            return v
+
+
+def _skok_miedzy_wierszami(mapa, S, u, d, t):
+    """
+    Skok JPS między wierszami (d = +-S). Ruch ten pełni rolę ruchu
+    "po przekątnej" z JPS dla 8 kierunków: na każdym polu sprawdzane są skoki
+    wzdłuż wiersza w obie strony, a pole jest punktem skoku, gdy któryś z nich
+    coś znajdzie.
+    """
+    v = u
+    while True:
+        v += d
+        if mapa[v] != WOLNE:
+            return -1
+        if v == t or _skok_w_wierszu(mapa, S, v, 1, t) != -1 or _skok_w_wierszu(mapa, S, v, -1, t) != -1:
+            return v
+
+
+def _kierunki_jps(mapa, S, u, d):
+    """
+    Kierunki dalszych skoków z pola u, do którego dotarto ruchem d (0 dla startu).
+    Po ruchu wzdłuż wiersza: dalej prosto oraz wymuszeni sąsiedzi w sąsiednich wierszach;
+    po ruchu między wierszami: dalej prosto i wzdłuż wiersza w obie strony.
+    """
+    if d == 0:
+        return (1, -1, S, -S)
+    if d == 1 or d == -1:
+        kierunki = [d]
+        for p in (S, -S):
+            if mapa[u + p] == WOLNE and mapa[u - d + p] != WOLNE:
+                kierunki.append(p)
+        return kierunki
+    return (d, 1, -1)
+
+
+def _sciezka_jps(siatka, skad, s, t, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik):
+    """
+    Wynik JPS: odcinki między punktami skoku rozwijane są do kolejnych pól.
+    """
+    znacznik = odmierz(czasy, "wyszukiwanie", znacznik)
+    if skad[t] == -1:
+        return Wynik(False, [], 0, rozwiniete, odwiedzone, szczyt_frontu, czasy)
+    punkty = [t]
+    while punkty[-1] != s:
+        punkty.append(skad[punkty[-1]])
+    punkty.reverse()
+    S = siatka.szerokosc
+    pola = [s]
+    for u, v in zip(punkty, punkty[1:]):
+        d = (1 if v > u else -1) if u // S == v // S else (S if v > u else -S)
+        pola.extend(range(u + d, v + d, d))
+    sciezka = [siatka.pozycja(i) for i in pola]
+    odmierz(czasy, "sciezka", znacznik)
+    return Wynik(True, sciezka, len(sciezka) - 1, rozwiniete, odwiedzone, szczyt_frontu, czasy)
+
+
+def _astar_po_skokach(siatka, start, cel, nastepniki, obserwator, czasy=None):
+    """
+    A* (heurystyka Manhattan) po punktach skoku; `nastepniki(u, d)` zwraca
+    pary (punkt skoku, kierunek dotarcia).
+    """
+    czasy = {} if czasy is None else czasy
+    znacznik = time.perf_counter()
+    S = siatka.szerokosc
+    s, t, koszt_g, skad = _przygotuj(siatka, start, cel)
+    h = heurystyka(siatka, t, "manhattan")
+    kierunek = array("i", [0]) * len(siatka.pola)
+    zamkniete = bytearray(len(siatka.pola))
+    hs = h(s)
+    otwarte = [(hs, hs, s)]
+    rozwiniete = 0
+    odwiedzone = 1
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while otwarte:
+        _, _, u = heapq.heappop(otwarte)
+        if zamkniete[u]:
+            continue
+        zamkniete[u] = 1
+        if u == t:
+            break
+        for v, d in nastepniki(u, kierunek[u]):
+            if zamkniete[v]:
+                continue
+            g = koszt_g[u] + (abs(v - u) if d == 1 or d == -1 else abs(v - u) // S)
+            if koszt_g[v] < 0 or g < koszt_g[v]:
+                if koszt_g[v] < 0:
+                    odwiedzone += 1
+                    if obserwator is not None:
+                        obserwator(OTWARTE, siatka.pozycja(v))
+                koszt_g[v] = g
+                skad[v] = u
+                kierunek[v] = d
+                hv = h(v)
+                heapq.heappush(otwarte, (g + hv, hv, v))
+        if len(otwarte) > szczyt_frontu:
+            szczyt_frontu = len(otwarte)
+        rozwiniete += 1
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, siatka.pozycja(u))
+
+    return _sciezka_jps(siatka, skad, s, t, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik)
+
+
+def jps(siatka, start, cel, obserwator=None):
+    """
+    Jump Point Search dla siatki 4-kierunkowej o jednostkowych kosztach.
+    Zamiast wszystkich symetrycznych sąsiadów do kolejki trafiają tylko
+    punkty skoku; długość ścieżki jest taka sama jak w astar.
+    """
+    mapa, S = siatka.mapa, siatka.szerokosc
+    t = siatka.indeks(*cel)
+
+    def nastepniki(u, d):
+        for kierunek in _kierunki_jps(mapa, S, u, d):
+            if kierunek == 1 or kierunek == -1:
+                v = _skok_w_wierszu(mapa, S, u, kierunek, t)
+            else:
+                v = _skok_miedzy_wierszami(mapa, S, u, kierunek, t)
+            if v != -1:
+                yield v, kierunek
+
+    return _astar_po_skokach(siatka, start, cel, nastepniki, obserwator)
+
+
+def tablice_skokow(siatka):
+    """
+    Tablice JPS+ dla kierunków +-1 i +-S: dla każdego wolnego pola odległość
+    do najbliższego punktu skoku (wartość dodatnia) albo, gdy go nie ma,
+    minus liczba wolnych pól do bariery. Tablice są zapamiętywane w siatce
+    i przeliczane dopiero po zmianie barier (Siatka.wersja).
+    """
+    if siatka.tablice_jps is not None and siatka.tablice_jps[0] == siatka.wersja:
+        return siatka.tablice_jps[1]
+    mapa, S = siatka.mapa, siatka.szerokosc
+    n = len(siatka.pola)
+    tablice = {d: array("i", [0]) * n for d in (1, -1, S, -S)}
+    wiersze = [(w + 1) * S for w in range(siatka.wiersze)]
+    kolumny = range(1, siatka.kolumny + 1)
+
+    for d in (1, -1):
+        tab = tablice[d]
+        for poczatek in wiersze:
+            for k in (reversed(kolumny) if d == 1 else kolumny):
+                u = poczatek + k
+                v = u + d
+                if mapa[u] != WOLNE or mapa[v] != WOLNE:
+                    continue
+                if (mapa[v + S] == WOLNE and mapa[u + S] != WOLNE) or (mapa[v - S] == WOLNE and mapa[u - S] != WOLNE):
+                    tab[u] = 1
+                else:
+                    tab[u] = tab[v] + 1 if tab[v] > 0 else tab[v] - 1
+
+    w_prawo, w_lewo = tablice[1], tablice[-1]
+    for d in (S, -S):
+        tab = tablice[d]
+        for poczatek in (reversed(wiersze) if d == S else wiersze):
+            for k in kolumny:
+                u = poczatek + k
+                v = u + d
+                if mapa[u] != WOLNE or mapa[v] != WOLNE:
+                    continue
+                if w_prawo[v] > 0 or w_lewo[v] > 0:
+                    tab[u] = 1
+                else:
+                    tab[u] = tab[v] + 1 if tab[v] > 0 else tab[v] - 1
+
+    siatka.tablice_jps = (siatka.wersja, tablice)
+    return tablice
+
+
+def jps_plus(siatka, start, cel, obserwator=None):
+    """
+    JPS+: jak jps, ale odległości skoków odczytywane są z tablic_skokow
+    zamiast skanowania siatki; cel sprawdzany jest w czasie zapytania.
+    """
+    czasy = {}
+    znacznik = time.perf_counter()
+    mapa, S = siatka.mapa, siatka.szerokosc
+    tablice = tablice_skokow(siatka)
+    odmierz(czasy, "tablice", znacznik)
+    t = siatka.indeks(*cel)
+    wt, kt = divmod(t, S)
+
+    def nastepniki(u, d):
+        wu, ku = divmod(u, S)
+        for kierunek in _kierunki_jps(mapa, S, u, d):
+            D = tablice[kierunek][u]
+            v = -1
+            if kierunek == 1 or kierunek == -1:
+                if wu == wt and 0 < (kt - ku) * kierunek <= abs(D):
+                    v = t
+            else:
+                krok = 1 if kierunek > 0 else -1
+                do_celu = (wt - wu) * krok
+                if ku == kt and 0 < do_celu <= abs(D):
+                    v = t
+                elif 0 < do_celu and (do_celu < D if D > 0 else do_celu <= -D):
+                    # cel w wierszu przed końcem skoku: punktem skoku jest pole w wierszu celu,
+                    # o ile z niego do celu prowadzi wolny odcinek wiersza
+                    c = u + do_celu * kierunek
+                    dk = kt - ku
+                    if dk != 0 and abs(dk) <= -tablice[1 if dk > 0 else -1][c]:
+                        v = c
+            if v == -1 and D > 0:
+                v = u + D * kierunek
+            if v != -1:
+                yield v, kierunek
+
+    return _astar_po_skokach(siatka, start, cel, nastepniki, obserwator, czasy)
+
+
+NIESKONCZONOSC = 1 << 30
+
+
+class DStarLite:
+    """
+    Przyrostowy planer D* Lite (Koenig, Likhachev). Przeszukuje siatkę od celu
+    do startu i zachowuje koszty g / rhs między wywołaniami planuj(), więc po
+    zmianie barier (zmien_pola) naprawiana jest tylko ta część rozwiązania,
+    na którą zmiana wpływa. Start może się przesuwać (przesun_start), cel jest stały.
+    Każdą zmianę siatki trzeba zgłosić przez zmien_pola przed planuj(); przy
+    niezgłoszonej zmianie koszty g są niespójne i planuj() zgłasza RuntimeError.
+
+    Przykład:
+        planer = DStarLite(siatka, (0, 0), (99, 99))
+        wynik = planer.planuj()
+        siatka.ustaw_bariere(5, 7)
+        planer.zmien_pola([(5, 7)])
+        wynik = planer.planuj()   # wynik.rozwiniete: tylko pola naprawione po zmianie
+    """
+
+    def __init__(self, siatka, start, cel):
+        self.siatka = siatka
+        self.s = siatka.indeks(*start)
+        self.t = siatka.indeks(*cel)
+        n = len(siatka.pola)
+        self.g = array("i", [NIESKONCZONOSC]) * n
+        self.rhs = array("i", [NIESKONCZONOSC]) * n
+        self.km = 0
+        # kopiec z leniwym usuwaniem: aktualny klucz pola trzymany jest w self.klucze
+        self.otwarte = []
+        self.klucze = {}
+        self.obserwator = None
+        self.odwiedzone = 0
+        self.rhs[self.t] = 0
+        self._aktualizuj(self.t)
+
+    def _h(self, u):
+        S = self.siatka.szerokosc
+        w, k = divmod(u, S)
+        ws, ks = divmod(self.s, S)
+        return abs(w - ws) + abs(k - ks)
+
+    def _klucz(self, u):
+        m = min(self.g[u], self.rhs[u])
+        return (m + self._h(u) + self.km, m)
+
+    def _aktualizuj(self, u):
+        mapa, g, rhs = self.siatka.mapa, self.g, self.rhs
+        if u != self.t:
+            najlepszy = NIESKONCZONOSC
+            if mapa[u] == WOLNE:
+                for d in self.siatka.przesuniecia:
+                    if mapa[u + d] == WOLNE and g[u + d] + 1 < najlepszy:
+                        najlepszy = g[u + d] + 1
+            rhs[u] = najlepszy
+        if g[u] != rhs[u]:
+            klucz = self._klucz(u)
+            self.klucze[u] = klucz
+            heapq.heappush(self.otwarte, (klucz[0], klucz[1], u))
+            self.odwiedzone += 1
+            if self.obserwator is not None:
+                self.obserwator(OTWARTE, self.siatka.pozycja(u))
+        else:
+            self.klucze.pop(u, None)
+
+    def _aktualizuj_sasiadow(self, u):
+        mapa = self.siatka.mapa
+        for d in self.siatka.przesuniecia:
+            if mapa[u + d] == WOLNE:
+                self._aktualizuj(u + d)
+
+    def zmien_pola(self, pozycje):
+        """
+        Zgłasza pola, których stan (bariera / wolne) zmienił się w siatce od
+        ostatniego planowania. Koszt jest proporcjonalny do liczby zmian;
+        właściwa naprawa odbywa się w następnym planuj().
+        """
+        for pozycja in pozycje:
+            u = self.siatka.indeks(*pozycja)
+            self._aktualizuj(u)
+            self._aktualizuj_sasiadow(u)
+
+    def przesun_start(self, start):
+        s = self.siatka.indeks(*start)
+        self.km += self._h(s)
+        self.s = s
+
+    def planuj(self, obserwator=None):
+        """
+        Naprawia koszty po zgłoszonych zmianach i zwraca Wynik; rozwiniete
+        i odwiedzone liczone są tylko dla tego przeplanowania.
+        """
+        czasy = {}
+        znacznik = time.perf_counter()
+        self.obserwator = obserwator
+        self.odwiedzone = 0
+        g, rhs, klucze, otwarte, s = self.g, self.rhs, self.klucze, self.otwarte, self.s
+        rozwiniete = 0
+        szczyt_frontu = len(klucze)
+
+        while otwarte:
+            k1, k2, u = otwarte[0]
+            if klucze.get(u) != (k1, k2):
+                heapq.heappop(otwarte)  # wpis nieaktualny
+                continue
+            if (k1, k2) >= self._klucz(s) and rhs[s] == g[s]:
+                break
+            heapq.heappop(otwarte)
+            nowy = self._klucz(u)
+            if (k1, k2) < nowy:
+                klucze[u] = nowy
+                heapq.heappush(otwarte, (nowy[0], nowy[1], u))
+                continue
+            del klucze[u]
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+            else:
+                g[u] = NIESKONCZONOSC
+                self._aktualizuj(u)
+            self._aktualizuj_sasiadow(u)
+            if len(klucze) > szczyt_frontu:
+                szczyt_frontu = len(klucze)
+            rozwiniete += 1
+            if obserwator is not None:
+                obserwator(ZAMKNIETE, self.siatka.pozycja(u))
+
+        self.obserwator = None
+        znacznik = odmierz(czasy, "wyszukiwanie", znacznik)
+        wynik = self._sciezka(rozwiniete, szczyt_frontu, czasy)
+        odmierz(czasy, "sciezka", znacznik)
+        return wynik
+
+    def _sciezka(self, rozwiniete, szczyt_frontu, czasy):
+        mapa, g = self.siatka.mapa, self.g
+        u = self.s
+        if g[u] >= NIESKONCZONOSC:
+            return Wynik(False, [], 0, rozwiniete, self.odwiedzone, szczyt_frontu, czasy)
+        sciezka = [u]
+        while u != self.t:
+            # krok do sąsiada o najmniejszym g; przy spójnych kosztach g maleje o 1,
+            # więc brak ściśle mniejszego g oznacza niezgłoszoną zmianę siatki (i pętlę)
+            v = min((u + d for d in self.siatka.przesuniecia if mapa[u + d] == WOLNE), key=g.__getitem__, default=u)
+            if g[v] >= g[u]:
+                raise RuntimeError("D* Lite: koszty niespójne z siatką; zmiany pól trzeba zgłaszać przez zmien_pola")
+            u = v
+            sciezka.append(u)
+        return Wynik(True, [self.siatka.pozycja(i) for i in sciezka],
+                     len(sciezka) - 1, rozwiniete, self.odwiedzone, szczyt_frontu, czasy)
+
+
+ALGORYTMY = {
+    "Dijkstra": dijkstra,
+    "A* (Manhattan)": lambda siatka, start, cel, obserwator=None: astar(siatka, start, cel, "manhattan", obserwator),
+    "A* (Euklides)": lambda siatka, start, cel, obserwator=None: astar(siatka, start, cel, "euklidesowa", obserwator),
+    "BFS": bfs,
+    "DFS": dfs,
+    "JPS": jps,
+    "JPS+": jps_plus,
+    "D* Lite": lambda siatka, start, cel, obserwator=None: DStarLite(siatka, start, cel).planuj(obserwator),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rozmiar", type=int, default=1000, help="liczba wierszy i kolumn")
+    parser.add_argument("--gestosc", type=float, default=0.25, help="udział barier")
+    parser.add_argument("--ziarno", type=int, default=0)
+    args = parser.parse_args()
+
+    siatka = Siatka.losowa(args.rozmiar, gestosc=args.gestosc, ziarno=args.ziarno)
+    start, cel = (0, 0), (args.rozmiar - 1, args.rozmiar - 1)
+    siatka.ustaw_bariere(*start, False)
+    siatka.ustaw_bariere(*cel, False)
+    print(f"Siatka {args.rozmiar}x{args.rozmiar} ({len(siatka)} pól), bariery: {args.gestosc:.0%}")
+    start_czas = time.perf_counter()
+    tablice_skokow(siatka)
+    print(f"Tablice JPS+ wyznaczone w {time.perf_counter() - start_czas:.3f}s")
+    for nazwa, algorytm in ALGORYTMY.items():
+        start_czas = time.perf_counter()
+        wynik = algorytm(siatka, start, cel)
+        czas = time.perf_counter() - start_czas
+        etapy = "  ".join(f"{etap} {sekundy:.3f}s" for etap, sekundy in wynik.czasy.items())
+        print(f"{nazwa:<16} czas: {czas:.3f}s  rozwinięte: {wynik.rozwiniete}  szczyt frontu: {wynik.szczyt_frontu}  "
+              f"dlugosc sciezki: {wynik.koszt if wynik.znaleziono else '-'}  [{etapy}]")
+
+    planer = DStarLite(siatka, start, cel)
+    wynik = planer.planuj()
+    if wynik.znaleziono and wynik.koszt > 1:
+        # bariera w połowie znalezionej ścieżki: przeplanowanie D* Lite kontra pełne A*
+        zmiana = wynik.sciezka[len(wynik.sciezka) // 2]
+        siatka.ustaw_bariere(*zmiana)
+        planer.zmien_pola([zmiana])
+        start_czas = time.perf_counter()
+        wynik = planer.planuj()
+        czas = time.perf_counter() - start_czas
+        pelne = astar(siatka, start, cel)
+        print(f"Przeplanowanie D* Lite po zmianie pola {zmiana}: czas: {czas:.3f}s  rozwinięte: {wynik.rozwiniete} "
+              f"(pełne A*: {pelne.rozwiniete})  dlugosc sciezki: {wynik.koszt if wynik.znaleziono else '-'}")
+
+
+if __name__ == "__main__":
+    main()
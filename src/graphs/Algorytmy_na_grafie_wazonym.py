@@ -1,78 +1,50 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+import os
+import sys
 import time
 import tracemalloc
 import random
 import math
-from queue import PriorityQueue, Queue
 
-
-def generuj_graf(n=30, gestosc=0.1):
-    G = nx.erdos_renyi_graph(n=n, p=gestosc)
-    while not nx.is_connected(G):
-        G = nx.erdos_renyi_graph(n=n, p=gestosc)
+# wspólny rdzeń wyszukiwania (src/wyszukiwanie) używany też przez Grid2D i interactive_map
+KATALOG_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if KATALOG_SRC not in sys.path:
+    sys.path.insert(0, KATALOG_SRC)
+import wyszukiwanie
+from wyszukiwanie import AdapterNetworkx
+
+
+def generuj_graf(n=30, gestosc=0.1, ziarno=None):
+    G = nx.fast_gnp_random_graph(n=n, p=gestosc, seed=ziarno)
+    # spójność: każda składowa dołączana jest jedną krawędzią do poprzedniej,
+    # zamiast losowania grafu od nowa (przy małej gęstości mogło trwać bardzo długo);
+    # duże, spójne grafy ze współrzędnymi daje generator_grafow.py
+    skladowe = [min(skladowa) for skladowa in nx.connected_components(G)]
+    G.add_edges_from(zip(skladowe, skladowe[1:]))
+    # wagi z własnego generatora, więc to samo ziarno daje ten sam graf razem z wagami
+    rng = random.Random(ziarno)
     for (u, v) in G.edges():
-        G[u][v]['weight'] = random.randint(1, 4)
+        G[u][v]['weight'] = rng.randint(1, 4)
     return G
 
+def _na_krotke(wynik):
+    """
+    (droga, odwiedzone, koszt) z wyniku rdzenia; odwiedzone to zbiór
+    wierzchołków wstawionych do frontu (klucze drzewa poprzedników).
+    """
+    return wynik.sciezka, wynik.drzewo.keys(), wynik.koszt
+
 def bfs(graf, start, cel):
-    kolejka = Queue()
-    kolejka.put(start)
-    odwiedzone = {start}
-    sciezka = {}
-
-    while not kolejka.empty():
-        obecny = kolejka.get()
-        if obecny == cel:
-            droga = odwiedzony_na_sciezke(sciezka, start, cel)
-            koszt = sum(graf[droga[i]][droga[i+1]]['weight'] for i in range(len(droga) - 1))
-            return droga, odwiedzone, koszt
-        for sasiad in graf.neighbors(obecny):
-            if sasiad not in odwiedzone:
-                odwiedzone.add(sasiad)
-                kolejka.put(sasiad)
-                sciezka[sasiad] = obecny
-    return [], odwiedzone, 0
+    return _na_krotke(wyszukiwanie.bfs(AdapterNetworkx.dla(graf), start, cel))
 
 def dfs(graf, start, cel):
-    stos = [start]
-    odwiedzone = {start}
-    sciezka = {}
-
-    while stos:
-        obecny = stos.pop()
-        if obecny == cel:
-            droga = odwiedzony_na_sciezke(sciezka, start, cel)
-            koszt = sum(graf[droga[i]][droga[i+1]]['weight'] for i in range(len(droga) - 1))
-            return droga, odwiedzone, koszt
-        for sasiad in graf.neighbors(obecny):
-            if sasiad not in odwiedzone:
-                odwiedzone.add(sasiad)
-                stos.append(sasiad)
-                sciezka[sasiad] = obecny
-    return [], odwiedzone, 0
-
-def dijkstra(graf, start, cel):
-    kolejka = PriorityQueue()
-    kolejka.put((0, start))
-    koszt = {start: 0}
-    odwiedzone = {start}
-    sciezka = {}
-
-    while not kolejka.empty():
-        dystans, obecny = kolejka.get()
-        if obecny == cel:
-            droga = odwiedzony_na_sciezke(sciezka, start, cel)
-            return droga, odwiedzone, koszt[cel]
-        for sasiad in graf.neighbors(obecny):
-            waga = graf[obecny][sasiad]['weight']
-            nowy_koszt = dystans + waga
-            if sasiad not in koszt or nowy_koszt < koszt[sasiad]:
-                koszt[sasiad] = nowy_koszt
-                kolejka.put((nowy_koszt, sasiad))
-                sciezka[sasiad] = obecny
-                odwiedzone.add(sasiad)
-    return [], odwiedzone, 0
+    return _na_krotke(wyszukiwanie.dfs(AdapterNetworkx.dla(graf), start, cel))
+
+def dijkstra(graf, start, cel, kolejka=None):
+    # bez podanej kolejki front dobierany jest do wag grafu (wybierz_kolejke); adapter
+    # z AdapterNetworkx.dla sprawdza wagi tylko przy pierwszym zapytaniu dla danego grafu
+    return _na_krotke(wyszukiwanie.dijkstra(AdapterNetworkx.dla(graf), start, cel, kolejka))
 
 def heurystyka_indeksowa(a, b):
     return abs(a - b)
@@ -91,40 +63,13 @@ def heurystyka_manhattan(pos):
         return abs(x1 - x2) + abs(y1 - y2)
     return h
 
-def astar(graf, start, cel, heurystyka):
-    kolejka = PriorityQueue()
-    kolejka.put((0, start))
-    koszt = {start: 0}
-    odwiedzone = {start}
-    sciezka = {}
-
-    while not kolejka.empty():
-        _, obecny = kolejka.get()
-        if obecny == cel:
-            droga = odwiedzony_na_sciezke(sciezka, start, cel)
-            return droga, odwiedzone, koszt[cel]
-        for sasiad in graf.neighbors(obecny):
-            waga = graf[obecny][sasiad]['weight']
-            nowy_koszt = koszt[obecny] + waga
-            if sasiad not in koszt or nowy_koszt < koszt[sasiad]:
-                koszt[sasiad] = nowy_koszt
-                priorytet = nowy_koszt + heurystyka(sasiad, cel)
-                kolejka.put((priorytet, sasiad))
-                sciezka[sasiad] = obecny
-                odwiedzone.add(sasiad)
-    return [], odwiedzone, 0
-
-def odwiedzony_na_sciezke(skamd, start, cel):
-    sciezka = []
-    obecny = cel
-    while obecny != start:
-        sciezka.append(obecny)
-        obecny = skamd.get(obecny)
-        if obecny is None:
-            return []
-    sciezka.append(start)
-    sciezka.reverse()
-    return sciezka
+def astar(graf, start, cel, heurystyka, kolejka=None):
+    # heurystyki w tym pliku nie muszą być spójne, więc priorytety nie rosną monotonicznie,
+    # domyślnym frontem rdzenia jest kopiec binarny, a zamknięte wierzchołki mogą być
+    # otwierane ponownie (jak dawniej bez zbioru zamkniętych)
+    def h(v):
+        return heurystyka(v, cel)
+    return _na_krotke(wyszukiwanie.astar(AdapterNetworkx.dla(graf), start, cel, h, kolejka, ponowne_otwieranie=True))
 
 def zmierz_i_rysuj(graf, algorytm, nazwa, pos, start, cel, subplot_index):
     tracemalloc.start()
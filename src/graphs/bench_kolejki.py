@@ -0,0 +1,68 @@
+"""
+Porównanie frontów (wyszukiwanie/kolejki.py) z queue.PriorityQueue w dijkstra i astar
+na losowym grafie z generuj_graf (wagi całkowite 1-4).
+
+Przykład:
+    python bench_kolejki.py --wezly 3000 --gestosc 0.003 --zapytania 50
+"""
+import argparse
+import random
+import time
+from queue import PriorityQueue
+
+import Algorytmy_na_grafie_wazonym as alg  # dodaje też src/ do sys.path
+from wyszukiwanie import AdapterNetworkx, KolejkaKubelkowa, KopiecBinarny, KopiecRadix, wybierz_kolejke
+
+KOLEJKI = [
+    ("PriorityQueue", PriorityQueue),
+    ("KopiecBinarny", KopiecBinarny),
+    ("KolejkaKubelkowa", KolejkaKubelkowa),
+    ("KopiecRadix", KopiecRadix),
+]
+
+
+def zmierz(wyszukiwanie, pary, fabryka):
+    """
+    Łączny czas wyszukiwań dla wszystkich par i lista kosztów tras.
+    """
+    koszty = []
+    start_czas = time.perf_counter()
+    for start, cel in pary:
+        _, _, koszt = wyszukiwanie(start, cel, fabryka())
+        koszty.append(koszt)
+    return time.perf_counter() - start_czas, koszty
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wezly", type=int, default=3000)
+    parser.add_argument("--gestosc", type=float, default=0.003)
+    parser.add_argument("--zapytania", type=int, default=50)
+    parser.add_argument("--ziarno", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.ziarno)
+    graf = alg.generuj_graf(args.wezly, args.gestosc, args.ziarno)
+    pary = [(random.randrange(args.wezly), random.randrange(args.wezly)) for _ in range(args.zapytania)]
+    print(f"Graf: {graf.number_of_nodes()} wierzchołków, {graf.number_of_edges()} krawędzi, zapytań: {len(pary)}")
+    adapter = AdapterNetworkx.dla(graf)
+    print(f"Automatyczny wybór: dijkstra -> {type(wybierz_kolejke(adapter)).__name__}, "
+          f"astar -> {type(wybierz_kolejke(adapter, monotoniczne=False)).__name__}")
+
+    wyszukiwania = [
+        ("Dijkstra", lambda s, c, k: alg.dijkstra(graf, s, c, k), KOLEJKI),
+        # kopiec radix wymaga monotonicznych kluczy, a heurystyka indeksowa nie jest spójna
+        ("A* (indeksowa)", lambda s, c, k: alg.astar(graf, s, c, alg.heurystyka_indeksowa, k), KOLEJKI[:3]),
+    ]
+    for nazwa, wyszukiwanie, kolejki in wyszukiwania:
+        print(f"\n{nazwa}")
+        czas_bazowy, koszty_bazowe = zmierz(wyszukiwanie, pary, PriorityQueue)
+        for nazwa_kolejki, fabryka in kolejki:
+            czas, koszty = zmierz(wyszukiwanie, pary, fabryka)
+            zgodne = "tak" if koszty == koszty_bazowe else "NIE"
+            print(f"  {nazwa_kolejki:<18}{czas * 1000 / len(pary):>9.3f} ms/zapytanie"
+                  f"  przyspieszenie x{czas_bazowy / czas:.2f}  koszty zgodne: {zgodne}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Krzywe skalowania algorytmów dla rosnących rozmiarów grafu albo siatki.
+
+Dla każdego rozmiaru (rzędy wielkości) i algorytmu: przebieg rozgrzewający,
+potem --powtorzenia przebiegów po tych samych losowych parach (start, cel)
+bez tracemalloc; szczytowa pamięć mierzona jest w osobnym przebiegu. Na końcu
+dopasowywana jest prosta log(czas) = a * log(n) + b (a to empiryczny wykładnik
+złożoności) oraz taka sama dla liczby odwiedzonych wierzchołków.
+
+Tryb "graf" korzysta z grafów z generator_grafow.py i funkcji
+z Algorytmy_na_grafie_wazonym.py; tryb "siatka" z silnika Grid2D
+(silnik_siatki.ALGORYTMY i HPA*), rozmiar to wtedy bok siatki.
+
+Przykład:
+    python bench_skalowania.py --tryb graf --rozmiary 1000 10000 100000 --csv graf.csv --wykres graf.png
+    python bench_skalowania.py --tryb siatka --rozmiary 100 300 1000 --csv siatka.csv
+"""
+import argparse
+import csv
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import Algorytmy_na_grafie_wazonym as alg  # dodaje też src do sys.path
+from generator_grafow import MODELE, generuj_lub_wczytaj
+from wyszukiwanie import AdapterNetworkx, wybierz_kolejke
+
+KATALOG_GRID2D = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Grid2D")
+KOLUMNY = ["tryb", "algorytm", "rozmiar", "wierzcholki_grafu", "czas_ms", "odwiedzone", "pamiec_kb"]
+
+
+def algorytmy_grafu(pos, front):
+    """
+    Pary (nazwa, funkcja(graf, start, cel)) w postaci używanej przez main()
+    w Algorytmy_na_grafie_wazonym.py. Dijkstra dostaje nowy front klasy
+    `front` (dobranej raz dla grafu), więc pomiar nie obejmuje przeglądu
+    wag krawędzi w wybierz_kolejke.
+    """
+    return [
+        ("BFS", lambda g, s, c: alg.bfs(g, s, c)),
+        ("DFS", lambda g, s, c: alg.dfs(g, s, c)),
+        ("Dijkstra", lambda g, s, c: alg.dijkstra(g, s, c, front())),
+        ("A* (indeksowa)", lambda g, s, c: alg.astar(g, s, c, alg.heurystyka_indeksowa)),
+        ("A* (euklidesowa)", lambda g, s, c: alg.astar(g, s, c, alg.heurystyka_euklidesowa(pos))),
+        ("A* (manhattan)", lambda g, s, c: alg.astar(g, s, c, alg.heurystyka_manhattan(pos))),
+    ]
+
+
+def przypadki_grafu(rozmiar, args):
+    """
+    Graf z cache generatora i lista (nazwa, zapytanie(start, cel) -> odwiedzone).
+    """
+    graf, pos = generuj_lub_wczytaj(args.model, rozmiar, args.ziarno).do_networkx()
+    rng = random.Random(args.ziarno)
+    n = graf.number_of_nodes()
+    pary = [(rng.randrange(n), rng.randrange(n)) for _ in range(args.zapytania)]
+    front = type(wybierz_kolejke(AdapterNetworkx.dla(graf)))
+    przypadki = [(nazwa, lambda s, c, f=f: len(f(graf, s, c)[1])) for nazwa, f in algorytmy_grafu(pos, front)]
+    return n, pary, przypadki
+
+
+def przypadki_siatki(rozmiar, args):
+    if KATALOG_GRID2D not in sys.path:
+        sys.path.insert(0, KATALOG_GRID2D)
+    import hpa
+    import silnik_siatki
+
+    siatka = silnik_siatki.Siatka.losowa(rozmiar, gestosc=args.gestosc, ziarno=args.ziarno)
+    rng = random.Random(args.ziarno)
+    pary = []
+    for _ in range(args.zapytania):
+        start, cel = (rng.randrange(rozmiar), rng.randrange(rozmiar)), (rng.randrange(rozmiar), rng.randrange(rozmiar))
+        siatka.ustaw_bariere(*start, False)
+        siatka.ustaw_bariere(*cel, False)
+        pary.append((start, cel))
+    algorytmy = dict(silnik_siatki.ALGORYTMY, **{"HPA*": hpa.hpa})
+    przypadki = [(nazwa, lambda s, c, f=f: f(siatka, s, c).odwiedzone) for nazwa, f in algorytmy.items()]
+    return len(siatka), pary, przypadki
+
+
+def zmierz(zapytanie, pary, powtorzenia):
+    """
+    Mediana (po powtórzeniach) średniego czasu zapytania w ms, średnia liczba
+    odwiedzonych wierzchołków i szczytowa pamięć (KB) z osobnego przebiegu:
+    największa po wszystkich parach.
+    """
+    for start, cel in pary[:1]:
+        zapytanie(start, cel)  # rozgrzewka (i np. tablice JPS+ w trybie siatki)
+    czasy = []
+    for _ in range(powtorzenia):
+        odwiedzone = 0
+        start_czas = time.perf_counter()
+        for start, cel in pary:
+            odwiedzone += zapytanie(start, cel)
+        czasy.append((time.perf_counter() - start_czas) * 1000 / len(pary))
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    szczyt = 0
+    for start, cel in pary:
+        zapytanie(start, cel)
+        szczyt = max(szczyt, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return statistics.median(czasy), odwiedzone / len(pary), szczyt / 1024
+
+
+def dopasuj_wykladnik(rozmiary, wartosci):
+    """
+    Nachylenie prostej dopasowanej do (log n, log wartość); None przy < 2 punktach.
+    """
+    punkty = [(math.log(n), math.log(w)) for n, w in zip(rozmiary, wartosci) if n > 0 and w > 0]
+    if len(punkty) < 2:
+        return None
+    x, y = zip(*punkty)
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def _wykladnik_tekst(a):
+    return "-" if a is None else f"{a:.2f}"
+
+
+def rysuj_wykres(wiersze, sciezka):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, (os_czasu, os_odwiedzonych) = plt.subplots(1, 2, figsize=(12, 5))
+    for nazwa in dict.fromkeys(w["algorytm"] for w in wiersze):
+        seria = [w for w in wiersze if w["algorytm"] == nazwa]
+        n = [w["wierzcholki_grafu"] for w in seria]
+        os_czasu.loglog(n, [w["czas_ms"] for w in seria], marker="o", label=nazwa)
+        os_odwiedzonych.loglog(n, [w["odwiedzone"] for w in seria], marker="o", label=nazwa)
+    os_czasu.set(xlabel="wierzchołki", ylabel="czas zapytania [ms]", title="Czas")
+    os_odwiedzonych.set(xlabel="wierzchołki", ylabel="odwiedzone wierzchołki", title="Odwiedzone")
+    os_czasu.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(sciezka)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tryb", choices=["graf", "siatka"], default="graf")
+    parser.add_argument("--rozmiary", type=int, nargs="+", default=None,
+                        help="liczby wierzchołków (graf) albo boki siatki (siatka)")
+    parser.add_argument("--model", choices=sorted(MODELE), default="drogowy", help="model grafu z generator_grafow.py")
+    parser.add_argument("--gestosc", type=float, default=0.25, help="udział barier w trybie siatki")
+    parser.add_argument("--zapytania", type=int, default=10)
+    parser.add_argument("--powtorzenia", type=int, default=3)
+    parser.add_argument("--ziarno", type=int, default=0)
+    parser.add_argument("--csv", help="plik CSV z wynikami")
+    parser.add_argument("--wykres", help="plik z wykresami log-log (np. .png)")
+    args = parser.parse_args()
+    if args.rozmiary is None:
+        args.rozmiary = [1000, 10000, 100000] if args.tryb == "graf" else [100, 300, 1000]
+
+    wiersze = []
+    for rozmiar in args.rozmiary:
+        przygotuj = przypadki_grafu if args.tryb == "graf" else przypadki_siatki
+        n, pary, przypadki = przygotuj(rozmiar, args)
+        print(f"\nRozmiar {rozmiar} ({n} wierzchołków), zapytań: {len(pary)}")
+        for nazwa, zapytanie in przypadki:
+            czas_ms, odwiedzone, pamiec_kb = zmierz(zapytanie, pary, args.powtorzenia)
+            wiersze.append({"tryb": args.tryb, "algorytm": nazwa, "rozmiar": rozmiar, "wierzcholki_grafu": n,
+                            "czas_ms": czas_ms, "odwiedzone": odwiedzone, "pamiec_kb": pamiec_kb})
+            print(f"  {nazwa:<18}{czas_ms:>10.3f} ms  odwiedzone: {odwiedzone:>10.0f}  pamięć: {pamiec_kb:>9.1f} KB")
+
+    print("\nWykładniki (czas ~ n^a, odwiedzone ~ n^a):")
+    for nazwa in dict.fromkeys(w["algorytm"] for w in wiersze):
+        seria = [w for w in wiersze if w["algorytm"] == nazwa]
+        n = [w["wierzcholki_grafu"] for w in seria]
+        a_czas = dopasuj_wykladnik(n, [w["czas_ms"] for w in seria])
+        a_odwiedzone = dopasuj_wykladnik(n, [w["odwiedzone"] for w in seria])
+        print(f"  {nazwa:<18} czas: {_wykladnik_tekst(a_czas):>6}  odwiedzone: {_wykladnik_tekst(a_odwiedzone):>6}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as plik:
+            zapis = csv.DictWriter(plik, fieldnames=KOLUMNY)
+            zapis.writeheader()
+            zapis.writerows(wiersze)
+    if args.wykres:
+        rysuj_wykres(wiersze, args.wykres)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Generator spójnych grafów ważonych ze współrzędnymi do badań skalowania.
+
+Zamiast losowania grafu Erdős–Rényi aż do skutku (nx.is_connected) i układu
+spring_layout (O(n^2)) spójność zapewnia drzewo rozpinające, a współrzędne
+powstają razem z grafem. Modele:
+- "drzewo": losowe drzewo rekurencyjne + losowe krawędzie dodatkowe, wagi 1-4
+  (współrzędne losowe, heurystyki geometryczne nie są dopuszczalne),
+- "geometryczny": punkty losowe w kwadracie, krawędzie do k najbliższych
+  sąsiadów, waga = zaokrąglona w górę odległość (heurystyka euklidesowa dopuszczalna),
+- "drogowy": siatka ulic z przesuniętymi skrzyżowaniami; losowe drzewo rozpinające
+  siatki plus część pozostałych odcinków, waga >= długość odcinka.
+
+Instancje zapisywane są jako .npz w katalogu cache pod nazwą zależną od
+parametrów, więc kolejne uruchomienia benchmarków wczytują je od razu.
+
+Przykład:
+    python generator_grafow.py --model geometryczny --wezly 1000000
+"""
+import argparse
+import math
+import os
+import time
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components, minimum_spanning_tree
+from scipy.spatial import cKDTree
+
+KATALOG_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+
+class InstancjaGrafu:
+    """
+    Graf nieskierowany jako tablice: wspolrzedne (n, 2), krawedzie (m, 2)
+    z u < v oraz całkowite wagi (m,).
+    """
+
+    def __init__(self, wspolrzedne, krawedzie, wagi):
+        self.wspolrzedne = wspolrzedne
+        self.krawedzie = krawedzie
+        self.wagi = wagi
+
+    def __len__(self):
+        return len(self.wspolrzedne)
+
+    def zapisz(self, sciezka):
+        np.savez_compressed(sciezka, wspolrzedne=self.wspolrzedne, krawedzie=self.krawedzie, wagi=self.wagi)
+
+    @classmethod
+    def wczytaj(cls, sciezka):
+        with np.load(sciezka) as dane:
+            return cls(dane["wspolrzedne"], dane["krawedzie"], dane["wagi"])
+
+    def do_networkx(self):
+        """
+        (graf networkx z atrybutem 'weight', słownik pos) dla funkcji
+        z Algorytmy_na_grafie_wazonym.py.
+        """
+        G = nx.Graph()
+        G.add_nodes_from(range(len(self)))
+        G.add_weighted_edges_from(zip(self.krawedzie[:, 0].tolist(), self.krawedzie[:, 1].tolist(), self.wagi.tolist()))
+        pos = dict(enumerate(map(tuple, self.wspolrzedne.tolist())))
+        return G, pos
+
+
+def _unikalne(krawedzie):
+    """
+    Krawędzie jako pary (mniejszy, większy) bez pętli i powtórzeń.
+    """
+    krawedzie = np.sort(krawedzie.astype(np.int64), axis=1)
+    krawedzie = krawedzie[krawedzie[:, 0] != krawedzie[:, 1]]
+    # np.unique na kluczach u * 2^32 + v jest dużo szybsze niż z axis=0
+    klucze = np.unique((krawedzie[:, 0] << 32) | krawedzie[:, 1])
+    return np.column_stack([klucze >> 32, klucze & 0xFFFFFFFF]).astype(np.int32)
+
+
+def _polacz_skladowe(n, krawedzie, wspolrzedne, drzewo_kd):
+    """
+    Dopóki graf nie jest spójny, łączy reprezentanta każdej składowej
+    z najbliższym punktem innej składowej (wśród 32 najbliższych); gdy
+    takiego nie ma, składowe łączone są po kolei według współrzędnej x.
+    """
+    while True:
+        macierz = coo_matrix((np.ones(len(krawedzie)), (krawedzie[:, 0], krawedzie[:, 1])), shape=(n, n))
+        liczba, etykiety = connected_components(macierz, directed=False)
+        if liczba == 1:
+            return krawedzie
+        _, reprezentanci = np.unique(etykiety, return_index=True)
+        _, sasiedzi = drzewo_kd.query(wspolrzedne[reprezentanci], k=min(32, n))
+        obce = etykiety[sasiedzi] != etykiety[reprezentanci][:, None]
+        mosty = [(r, wiersz[obcy.argmax()]) for r, wiersz, obcy in zip(reprezentanci, sasiedzi, obce) if obcy.any()]
+        if not mosty:
+            reprezentanci = reprezentanci[np.argsort(wspolrzedne[reprezentanci, 0])]
+            mosty = list(zip(reprezentanci[:-1], reprezentanci[1:]))
+        krawedzie = _unikalne(np.vstack([krawedzie, np.array(mosty)]))
+
+
+def _wagi_geometryczne(wspolrzedne, krawedzie, mnoznik=1.0):
+    dlugosci = np.linalg.norm(wspolrzedne[krawedzie[:, 0]] - wspolrzedne[krawedzie[:, 1]], axis=1)
+    return np.maximum(1, np.ceil(dlugosci * mnoznik)).astype(np.int32)
+
+
+def drzewo_z_krawedziami(n, stopien=3.0, maks_waga=4, ziarno=0):
+    """
+    Losowe drzewo rekurencyjne (wierzchołek i dołącza do losowego j < i)
+    i losowe krawędzie dodatkowe do średniego stopnia `stopien`.
+    """
+    rng = np.random.default_rng(ziarno)
+    kolejnosc = rng.permutation(n)
+    rodzice = (rng.random(n - 1) * np.arange(1, n)).astype(np.int64)
+    drzewo = np.column_stack([kolejnosc[1:], kolejnosc[rodzice]])
+    dodatkowe = rng.integers(0, n, size=(max(0, int(n * stopien / 2) - (n - 1)), 2))
+    krawedzie = _unikalne(np.vstack([drzewo, dodatkowe]))
+    wagi = rng.integers(1, maks_waga + 1, size=len(krawedzie)).astype(np.int32)
+    wspolrzedne = rng.random((n, 2)) * math.sqrt(n)
+    return InstancjaGrafu(wspolrzedne, krawedzie, wagi)
+
+
+def geometryczny(n, k=6, ziarno=0):
+    """
+    Punkty w kwadracie o boku 2 * sqrt(n) połączone z k najbliższymi sąsiadami
+    (KD-drzewo); składowe łączone są mostami.
+    """
+    rng = np.random.default_rng(ziarno)
+    wspolrzedne = rng.random((n, 2)) * 2 * math.sqrt(n)
+    if n < 2:
+        return InstancjaGrafu(wspolrzedne, np.zeros((0, 2), dtype=np.int32), np.zeros(0, dtype=np.int32))
+    drzewo_kd = cKDTree(wspolrzedne)
+    _, sasiedzi = drzewo_kd.query(wspolrzedne, k=min(k, n - 1) + 1)
+    krawedzie = np.column_stack([np.repeat(np.arange(n), sasiedzi.shape[1] - 1), sasiedzi[:, 1:].ravel()])
+    krawedzie = _polacz_skladowe(n, _unikalne(krawedzie), wspolrzedne, drzewo_kd)
+    return InstancjaGrafu(wspolrzedne, krawedzie, _wagi_geometryczne(wspolrzedne, krawedzie))
+
+
+def drogowy(n, gestosc_drog=0.7, ziarno=0):
+    """
+    Siatka ulic bok x bok (bok = ceil(sqrt(n)), więc węzłów może być nieco
+    więcej niż n) ze skrzyżowaniami przesuniętymi losowo o mniej niż pół
+    kwartału. Losowe drzewo rozpinające (MST losowych wag) gwarantuje spójność,
+    a każdy z pozostałych odcinków zostaje z prawdopodobieństwem `gestosc_drog`.
+    Wagi: długość odcinka razy losowy mnożnik "klasy drogi" z [1, 1.5).
+    """
+    rng = np.random.default_rng(ziarno)
+    bok = math.isqrt(n - 1) + 1
+    liczba = bok * bok
+    w, k = np.divmod(np.arange(liczba), bok)
+    wspolrzedne = np.column_stack([k, w]).astype(np.float64) * 3 + rng.uniform(-1.4, 1.4, size=(liczba, 2))
+    indeksy = np.arange(liczba).reshape(bok, bok)
+    odcinki = np.vstack([
+        np.column_stack([indeksy[:, :-1].ravel(), indeksy[:, 1:].ravel()]),
+        np.column_stack([indeksy[:-1, :].ravel(), indeksy[1:, :].ravel()]),
+    ])
+    losowe = coo_matrix((rng.random(len(odcinki)) + 1, (odcinki[:, 0], odcinki[:, 1])), shape=(liczba, liczba))
+    drzewo = minimum_spanning_tree(losowe).tocoo()
+    w_drzewie = np.isin((odcinki[:, 0].astype(np.int64) << 32) | odcinki[:, 1],
+                        (drzewo.row.astype(np.int64) << 32) | drzewo.col)
+    zostaje = w_drzewie | (rng.random(len(odcinki)) < gestosc_drog)
+    krawedzie = _unikalne(odcinki[zostaje])
+    mnozniki = rng.uniform(1.0, 1.5, size=len(krawedzie))
+    return InstancjaGrafu(wspolrzedne, krawedzie, _wagi_geometryczne(wspolrzedne, krawedzie, mnozniki))
+
+
+MODELE = {
+    "drzewo": drzewo_z_krawedziami,
+    "geometryczny": geometryczny,
+    "drogowy": drogowy,
+}
+
+
+def sciezka_w_cache(model, n, ziarno=0, katalog=KATALOG_CACHE, **parametry):
+    """
+    Nazwa pliku zależna od wszystkich parametrów, np. cache/geometryczny_n100000_z0_k6.npz.
+    """
+    opis = "".join(f"_{nazwa}{wartosc}" for nazwa, wartosc in sorted(parametry.items()))
+    return os.path.join(katalog, f"{model}_n{n}_z{ziarno}{opis}.npz")
+
+
+def generuj_lub_wczytaj(model, n, ziarno=0, katalog=KATALOG_CACHE, **parametry):
+    """
+    Instancja z cache albo nowo wygenerowana i zapisana do cache.
+    """
+    sciezka = sciezka_w_cache(model, n, ziarno, katalog, **parametry)
+    if os.path.exists(sciezka):
+        return InstancjaGrafu.wczytaj(sciezka)
+    instancja = MODELE[model](n, ziarno=ziarno, **parametry)
+    os.makedirs(katalog, exist_ok=True)
+    instancja.zapisz(sciezka)
+    return instancja
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", choices=sorted(MODELE), default="geometryczny")
+    parser.add_argument("--wezly", type=int, default=100000)
+    parser.add_argument("--ziarno", type=int, default=0)
+    args = parser.parse_args()
+
+    start_czas = time.perf_counter()
+    instancja = generuj_lub_wczytaj(args.model, args.wezly, args.ziarno)
+    czas = time.perf_counter() - start_czas
+    print(f"{args.model}: {len(instancja)} wierzchołków, {len(instancja.krawedzie)} krawędzi, "
+          f"wagi {instancja.wagi.min()}-{instancja.wagi.max()}, gotowe w {czas:.3f}s")
+    print(f"Plik: {sciezka_w_cache(args.model, args.wezly, args.ziarno)}")
+
+
+if __name__ == "__main__":
+    main()
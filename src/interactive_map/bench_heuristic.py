@@ -0,0 +1,69 @@
+"""
+Porównanie kosztu jednej ewaluacji heurystyki A*:
+- routing.get_heuristic_func (słownik G.nodes + haversine),
+- heuristics.make_heuristic (rzutowane współrzędne, zapamiętywanie w zapytaniu).
+
+Uruchomienie: python bench_heuristic.py [--graph data/rzeszow.graphml] [--targets 20]
+"""
+import argparse
+import random
+import time
+
+import networkx as nx
+import osmnx as ox
+
+import routing
+from csr_graph import CSRGraph
+from heuristics import make_heuristic
+
+
+def time_per_call(func, nodes):
+    t0 = time.perf_counter()
+    for v in nodes:
+        func(v)
+    return (time.perf_counter() - t0) / len(nodes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph", default="data/rzeszow.graphml")
+    parser.add_argument("--targets", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    G = nx.Graph(ox.load_graphml(args.graph))
+    C = CSRGraph.from_networkx(G)
+    xs, ys = C.projected()
+    rng = random.Random(args.seed)
+    node_ids = C.node_ids
+    indices = list(range(len(C)))
+    # kolejność relaksacji zbliżona do A*: węzły pojawiają się wielokrotnie
+    sample = indices * 2
+    rng.shuffle(sample)
+    sample_ids = [node_ids[i] for i in sample]
+
+    print(f"Graf: {len(C)} węzłów, {C.edge_count} łuków, ewaluacji na cel: {len(sample)}")
+    for heuristic in ("euklidesowa", "manhattan"):
+        old_total = new_total = 0.0
+        worst_ratio = 0.0
+        for _ in range(args.targets):
+            t = rng.randrange(len(C))
+            target_id = node_ids[t]
+            old_total += time_per_call(lambda v: routing.get_heuristic_func(v, target_id, G, heuristic), sample_ids)
+            new_total += time_per_call(make_heuristic(xs, ys, t, heuristic), sample)
+            if heuristic == "euklidesowa":
+                h = make_heuristic(xs, ys, t, heuristic)
+                for v in indices[::max(1, len(indices) // 2000)]:
+                    exact = routing.great_circle_vec(C.lats[v], C.lons[v], C.lats[t], C.lons[t])
+                    if exact > 0:
+                        worst_ratio = max(worst_ratio, h(v) / exact)
+        old_ns = old_total / args.targets * 1e9
+        new_ns = new_total / args.targets * 1e9
+        print(f"{heuristic:>12}: G.nodes + haversine {old_ns:8.1f} ns/relaksację, "
+              f"rzut + pamięć {new_ns:8.1f} ns/relaksację, przyspieszenie x{old_ns / new_ns:.1f}")
+        if heuristic == "euklidesowa":
+            print(f"{'':>12}  max h_rzut / haversine = {worst_ratio:.6f} (<= 1 -> dopuszczalna)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Powtarzalny benchmark routing.find_path na grafie GraphML (bez GUI i tracemalloc).
+
+Losuje (z ziarnem) N par start/cel, uruchamia każdą kombinację algorytmu
+i heurystyki, a następnie raportuje opóźnienia p50/p90/p99, przepustowość,
+liczbę odwiedzonych węzłów, stosunek długości trasy do Dijkstry
+i liczbę zapytań, w których algorytm nie znalazł trasy.
+
+Przykłady:
+    python benchmark.py --pairs 200 --output wyniki.json
+    python benchmark.py --pairs 200 --baseline wyniki.json --tolerance 0.15
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+import graph_store
+import routing
+from contraction import ContractionHierarchy
+from csr_graph import file_fingerprint
+from landmarks import LandmarkTable
+
+# (nazwa w raporcie, algorithm_name dla find_path, heurystyka)
+COMBINATIONS = [
+    ("Dijkstra", "Dijkstra", None),
+    ("A* (Euklidesowa)", "A*", "euklidesowa"),
+    ("A* (Manhattan)", "A*", "manhattan"),
+    ("A* (ALT)", "A*", "ALT"),
+    ("BFS", "BFS", None),
+    ("CH", "CH", None),
+    ("Bi-Dijkstra", "Bi-Dijkstra", None),
+    ("Bi-A* (Euklidesowa)", "Bi-A*", "euklidesowa"),
+    ("Bi-A* (ALT)", "Bi-A*", "ALT"),
+    ("Bi-BFS", "Bi-BFS", None),
+]
+
+
+def sample_pairs(C, count, seed):
+    rng = random.Random(seed)
+    n = len(C)
+    return [(C.node_ids[rng.randrange(n)], C.node_ids[rng.randrange(n)]) for _ in range(count)]
+
+
+def run_benchmark(C, pairs, combinations, landmarks=None, hierarchy=None):
+    """
+    Zwraca słownik: nazwa kombinacji -> statystyki (czasy w ms).
+    Pary bez połączenia (wg Dijkstry) są pomijane we wszystkich kombinacjach.
+    Zapytania, w których kombinacja nie znalazła trasy mimo połączenia,
+    liczone są w "failures" i nie wchodzą do mean_ratio/max_ratio.
+    """
+    reference = {}
+    for s, t in pairs:
+        path, _, _ = routing.find_path(C, s, t, "Dijkstra")
+        if path is not None:
+            reference[(s, t)] = C.path_length(path)
+    valid_pairs = [pair for pair in pairs if pair in reference]
+
+    results = {}
+    for name, algorithm_name, heuristic in combinations:
+        latencies, visited, ratios = [], [], []
+        failures = 0
+        counters = {key: [] for key in routing.COUNTER_KEYS}
+        for s, t in valid_pairs:
+            t0 = time.perf_counter()
+            path, visited_count, time_components = routing.find_path(C, s, t, algorithm_name, heuristic, landmarks, hierarchy)
+            latencies.append(time.perf_counter() - t0)
+            visited.append(visited_count)
+            for key, values in counters.items():
+                values.append(time_components.get(key, 0))
+            if path is None:
+                failures += 1
+                continue
+            best = reference[(s, t)]
+            ratios.append(C.path_length(path) / best if best > 0 else 1.0)
+        latencies_ms = np.asarray(latencies) * 1000
+        results[name] = {
+            "algorithm": algorithm_name,
+            "heuristic": heuristic,
+            "queries": len(valid_pairs),
+            "failures": failures,
+            "p50_ms": float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else 0.0,
+            "p90_ms": float(np.percentile(latencies_ms, 90)) if len(latencies_ms) else 0.0,
+            "p99_ms": float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else 0.0,
+            "throughput_qps": len(latencies) / sum(latencies) if sum(latencies) > 0 else 0.0,
+            "mean_visited": float(np.mean(visited)) if visited else 0.0,
+            "mean_ratio": float(np.mean(ratios)) if ratios else 1.0,
+            "max_ratio": float(np.max(ratios)) if ratios else 1.0,
+            **{"mean_" + key: float(np.mean(values)) if values else 0.0 for key, values in counters.items()},
+        }
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Lista opisów regresji: p50/p99 wolniejsze o więcej niż `tolerance`,
+    więcej odwiedzonych węzłów, więcej nieznalezionych tras albo gorsza
+    jakość trasy.
+    """
+    regressions = []
+    for name, current in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        for key in ("p50_ms", "p99_ms"):
+            if old[key] > 0 and current[key] > old[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {old[key]:.3f} -> {current[key]:.3f}")
+        if current["mean_visited"] > old["mean_visited"] * (1 + tolerance):
+            regressions.append(f"{name}: mean_visited {old['mean_visited']:.1f} -> {current['mean_visited']:.1f}")
+        if current["failures"] > old.get("failures", 0):
+            regressions.append(f"{name}: failures {old.get('failures', 0)} -> {current['failures']}")
+        if current["mean_ratio"] > old["mean_ratio"] + 1e-9:
+            regressions.append(f"{name}: mean_ratio {old['mean_ratio']:.4f} -> {current['mean_ratio']:.4f}")
+    return regressions
+
+
+def print_report(results):
+    header = f"{'Algorytm':<22}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'zapyt./s':>10}{'odw. węzły':>12}{'jakość':>9}{'błędy':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<22}{r['p50_ms']:>10.3f}{r['p90_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+              f"{r['throughput_qps']:>10.1f}{r['mean_visited']:>12.1f}{r['mean_ratio']:>9.4f}{r['failures']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph", default="data/rzeszow.graphml")
+    parser.add_argument("--pairs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algorithms", nargs="+", help="nazwy kombinacji do uruchomienia (domyślnie wszystkie)")
+    parser.add_argument("--output", help="plik JSON z wynikami")
+    parser.add_argument("--baseline", help="plik JSON z poprzednimi wynikami do porównania")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="dopuszczalne pogorszenie (ułamek)")
+    args = parser.parse_args()
+
+    combinations = [c for c in COMBINATIONS if not args.algorithms or c[0] in args.algorithms]
+    if not combinations:
+        parser.error("Brak kombinacji o podanych nazwach: " + ", ".join(args.algorithms))
+
+    t0 = time.perf_counter()
+    C = graph_store.load_graph(args.graph)
+    load_time = time.perf_counter() - t0
+    heuristics = {c[2] for c in combinations}
+    landmarks = LandmarkTable.load_or_build(C, args.graph) if "ALT" in heuristics else None
+    hierarchy = ContractionHierarchy.load_or_build(C, args.graph) if any(c[1] == "CH" for c in combinations) else None
+
+    pairs = sample_pairs(C, args.pairs, args.seed)
+    print(f"Graf: {args.graph} ({len(C)} węzłów, {C.edge_count} łuków, wczytany w {load_time:.3f} s), par: {len(pairs)}, ziarno: {args.seed}")
+    results = run_benchmark(C, pairs, combinations, landmarks, hierarchy)
+    print_report(results)
+
+    report = {
+        "graph": args.graph,
+        "fingerprint": file_fingerprint(args.graph),
+        "nodes": len(C),
+        "edges": C.edge_count,
+        "pairs": args.pairs,
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("fingerprint") != report["fingerprint"] or baseline.get("seed") != args.seed:
+            print("Uwaga: punkt odniesienia pochodzi z innego grafu lub ziarna.")
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\nREGRESJE:")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print("\nBrak regresji względem punktu odniesienia.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+import heapq
+import os
+import random
+import time
+import zipfile
+from array import array
+
+import numpy as np
+
+from csr_graph import file_fingerprint, single_source_distances
+
+# Limit ustalonych węzłów w wyszukiwaniu świadka; brak świadka w limicie
+# oznacza dodanie skrótu (zbędny skrót nie psuje poprawności zapytań).
+WITNESS_SETTLE_LIMIT = 200
+# Krótsze wyszukiwanie przy symulacji kontrakcji na potrzeby kolejności węzłów.
+ORDERING_SETTLE_LIMIT = 30
+
+
+def hierarchy_path(graph_file):
+    """
+    Ścieżka pliku hierarchii obok pliku grafu, np. data/rzeszow.ch.npz.
+    """
+    return os.path.splitext(graph_file)[0] + ".ch.npz"
+
+
+def _witness_distances(adj, source, skip, max_cost, settle_limit):
+    """
+    Ograniczona Dijkstra z `source` w grafie roboczym z pominięciem węzła `skip`.
+    """
+    dist = {source: 0.0}
+    queue = [(0.0, source)]
+    settled = 0
+    while queue and settled < settle_limit:
+        cost, u = heapq.heappop(queue)
+        if cost > dist[u]:
+            continue
+        if cost > max_cost:
+            break
+        settled += 1
+        for v, (w, _) in adj[u].items():
+            if v == skip:
+                continue
+            new_cost = cost + w
+            if new_cost < dist.get(v, float("inf")):
+                dist[v] = new_cost
+                heapq.heappush(queue, (new_cost, v))
+    return dist
+
+
+def _shortcuts_for(adj, v, settle_limit):
+    """
+    Lista skrótów (u, w, długość) potrzebnych po usunięciu węzła v.
+    """
+    neighbours = list(adj[v].items())
+    shortcuts = []
+    for i, (u, (w_uv, _)) in enumerate(neighbours):
+        rest = neighbours[i + 1:]
+        if not rest:
+            continue
+        max_cost = w_uv + max(w for _, (w, _) in rest)
+        witness = _witness_distances(adj, u, v, max_cost, settle_limit)
+        for w, (w_vw, _) in rest:
+            via = w_uv + w_vw
+            if witness.get(w, float("inf")) > via:
+                shortcuts.append((u, w, via))
+    return shortcuts
+
+
+class ContractionHierarchy:
+    """
+    Hierarchia kontrakcji (CH) dla nieskierowanego grafu CSR.
+
+    Dla każdego węzła przechowywane są krawędzie "w górę" (do węzłów o wyższej
+    randze) w formacie CSR; up_middle to węzeł pośredni skrótu albo -1
+    dla krawędzi oryginalnej.
+    """
+
+    def __init__(self, rank, up_offsets, up_targets, up_weights, up_middle, stats=None):
+        self.rank = rank
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.up_weights = up_weights
+        self.up_middle = up_middle
+        self.stats = stats or {}
+
+    @classmethod
+    def build(cls, C, calibration_queries=20, seed=0):
+        """
+        Kontrakcja węzłów w kolejności: różnica krawędzi + liczba usuniętych sąsiadów
+        (z leniwą aktualizacją priorytetów).
+        """
+        t_start = time.perf_counter()
+        n = len(C)
+        adj = [dict() for _ in range(n)]
+        for u in range(n):
+            for k in range(C.offsets[u], C.offsets[u + 1]):
+                v, w = C.targets[k], C.weights[k]
+                if v != u and (v not in adj[u] or w < adj[u][v][0]):
+                    adj[u][v] = (w, -1)
+
+        deleted = [0] * n
+
+        def priority(v):
+            added = len(_shortcuts_for(adj, v, ORDERING_SETTLE_LIMIT))
+            return added - len(adj[v]) + 2 * deleted[v]
+
+        queue = [(priority(v), v) for v in range(n)]
+        heapq.heapify(queue)
+        rank = array("i", [0]) * n
+        contracted = bytearray(n)
+        upward = [None] * n
+        shortcut_count = 0
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            if contracted[v]:
+                continue
+            current = priority(v)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v))
+                continue
+
+            upward[v] = list(adj[v].items())
+            for u, w, via in _shortcuts_for(adj, v, WITNESS_SETTLE_LIMIT):
+                existing = adj[u].get(w)
+                if existing is None or via < existing[0]:
+                    adj[u][w] = (via, v)
+                    adj[w][u] = (via, v)
+                    shortcut_count += 1
+            for u in adj[v]:
+                del adj[u][v]
+                deleted[u] += 1
+            adj[v] = {}
+            contracted[v] = 1
+            rank[v] = order
+            order += 1
+
+        up_offsets = array("i", [0])
+        up_targets, up_weights, up_middle = array("i"), array("d"), array("i")
+        for v in range(n):
+            for u, (w, middle) in upward[v]:
+                up_targets.append(u)
+                up_weights.append(w)
+                up_middle.append(middle)
+            up_offsets.append(len(up_targets))
+
+        stats = {
+            "preprocessing_time": time.perf_counter() - t_start,
+            "shortcuts": shortcut_count,
+        }
+        hierarchy = cls(rank, up_offsets, up_targets, up_weights, up_middle, stats)
+        hierarchy.stats["query_speedup"] = hierarchy.calibrate(C, calibration_queries, seed)
+        return hierarchy
+
+    def calibrate(self, C, queries=20, seed=0):
+        """
+        Średnie przyspieszenie zapytania CH względem Dijkstry na losowych parach.
+        """
+        n = len(C)
+        if n < 2 or queries <= 0:
+            return 0.0
+        rng = random.Random(seed)
+        pairs = [tuple(rng.sample(range(n), 2)) for _ in range(queries)]
+        t0 = time.perf_counter()
+        for s, t in pairs:
+            single_source_distances(C, s, t)
+        t1 = time.perf_counter()
+        for s, t in pairs:
+            self.search(s, t)
+        t2 = time.perf_counter()
+        return (t1 - t0) / max(t2 - t1, 1e-9)
+
+    def nbytes(self):
+        buffers = (self.rank, self.up_offsets, self.up_targets, self.up_weights, self.up_middle)
+        return sum(len(b) * b.itemsize for b in buffers)
+
+    def save(self, path, C, fingerprint=""):
+        # plik tymczasowy podmieniany na końcu: przerwany zapis nie zostawia uciętego pliku
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                node_ids=np.asarray(C.node_ids, dtype=np.int64),
+                rank=np.frombuffer(self.rank, dtype=np.int32),
+                up_offsets=np.frombuffer(self.up_offsets, dtype=np.int32),
+                up_targets=np.frombuffer(self.up_targets, dtype=np.int32),
+                up_weights=np.frombuffer(self.up_weights, dtype=np.float64),
+                up_middle=np.frombuffer(self.up_middle, dtype=np.int32),
+                preprocessing_time=np.float64(self.stats.get("preprocessing_time", 0.0)),
+                shortcuts=np.int64(self.stats.get("shortcuts", 0)),
+                query_speedup=np.float64(self.stats.get("query_speedup", 0.0)),
+                fingerprint=np.str_(fingerprint),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, C, fingerprint=None):
+        """
+        Wczytuje hierarchię z dysku; zwraca None, jeśli plik nie pasuje do grafu.
+        """
+        with np.load(path) as data:
+            if fingerprint is not None and str(data["fingerprint"]) != fingerprint:
+                return None
+            if data["node_ids"].tolist() != list(C.node_ids):
+                return None
+            stats = {
+                "preprocessing_time": float(data["preprocessing_time"]),
+                "shortcuts": int(data["shortcuts"]),
+                "query_speedup": float(data["query_speedup"]),
+            }
+            return cls(
+                array("i", data["rank"].tobytes()),
+                array("i", data["up_offsets"].tobytes()),
+                array("i", data["up_targets"].tobytes()),
+                array("d", data["up_weights"].tobytes()),
+                array("i", data["up_middle"].tobytes()),
+                stats,
+            )
+
+    @classmethod
+    def load_or_build(cls, C, graph_file):
+        """
+        Wczytuje hierarchię zapisaną obok pliku grafu albo buduje ją i zapisuje.
+        """
+        path = hierarchy_path(graph_file)
+        fingerprint = file_fingerprint(graph_file)
+        if os.path.exists(path):
+            try:
+                hierarchy = cls.load(path, C, fingerprint)
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                hierarchy = None
+            if hierarchy is not None:
+                return hierarchy
+        print("Budowanie hierarchii kontrakcji (CH)...")
+        hierarchy = cls.build(C)
+        hierarchy.save(path, C, fingerprint)
+        return hierarchy
+
+    def search(self, s, t, counters=None):
+        """
+        Dwukierunkowe wyszukiwanie "w górę" hierarchii.
+        Zwraca (koszt, węzeł spotkania, rodzice w przód, rodzice wstecz, liczba ustalonych).
+        Rodzic to para (poprzedni węzeł, indeks krawędzi w górę).
+        Jeśli podano słownik `counters`, dopisywane są do niego liczniki
+        wyszukiwania (jak routing.COUNTER_KEYS).
+        """
+        inf = float("inf")
+        offsets, targets, weights = self.up_offsets, self.up_targets, self.up_weights
+        dist = ({s: 0.0}, {t: 0.0})
+        parents = ({s: None}, {t: None})
+        queues = ([(0.0, s)], [(0.0, t)])
+        settled = (set(), set())
+        best, meeting = inf, None
+        if s == t:
+            best, meeting = 0.0, s
+        pushes, stale_pops, relaxations, peak_frontier = 2, 0, 0, 2
+
+        while queues[0] or queues[1]:
+            for side in (0, 1):
+                queue = queues[side]
+                if not queue:
+                    continue
+                if queue[0][0] >= best:
+                    queue.clear()
+                    continue
+                cost, u = heapq.heappop(queue)
+                if u in settled[side]:
+                    stale_pops += 1
+                    continue
+                settled[side].add(u)
+                other = dist[1 - side].get(u)
+                if other is not None and cost + other < best:
+                    best, meeting = cost + other, u
+                d, p = dist[side], parents[side]
+                first, last = offsets[u], offsets[u + 1]
+                relaxations += last - first
+                for k in range(first, last):
+                    v = targets[k]
+                    new_cost = cost + weights[k]
+                    if new_cost < d.get(v, inf):
+                        d[v] = new_cost
+                        p[v] = (u, k)
+                        heapq.heappush(queue, (new_cost, v))
+                        pushes += 1
+                if len(queues[0]) + len(queues[1]) > peak_frontier:
+                    peak_frontier = len(queues[0]) + len(queues[1])
+
+        settled_count = len(settled[0]) + len(settled[1])
+        if counters is not None:
+            counters.update(pushes=pushes, pops=settled_count + stale_pops, stale_pops=stale_pops,
+                            relaxations=relaxations, heuristic_evals=0, peak_frontier=peak_frontier)
+        return best, meeting, parents[0], parents[1], settled_count
+
+    def _middle(self, a, b):
+        low, high = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        best, middle = None, -1
+        for k in range(self.up_offsets[low], self.up_offsets[low + 1]):
+            if self.up_targets[k] == high and (best is None or self.up_weights[k] < best):
+                best, middle = self.up_weights[k], self.up_middle[k]
+        return middle
+
+    def _unpack_edge(self, a, b, middle, out):
+        """
+        Rozwija krawędź a -> b (być może skrót) do ciągu węzłów oryginalnego grafu.
+        Dopisuje do `out` węzły po `a`, kończąc na `b`.
+        """
+        stack = [(a, b, middle)]
+        while stack:
+            x, y, mid = stack.pop()
+            if mid == -1:
+                out.append(y)
+                continue
+            stack.append((mid, y, self._middle(mid, y)))
+            stack.append((x, mid, self._middle(x, mid)))
+
+    def unpack_path(self, s, t, meeting, forward_parents, backward_parents):
+        """
+        Ścieżka (indeksy CSR) od s do t w oryginalnym grafie.
+        """
+        up_chain = []
+        v = meeting
+        while forward_parents[v] is not None:
+            u, k = forward_parents[v]
+            up_chain.append((u, v, self.up_middle[k]))
+            v = u
+        path = [s]
+        for u, v, middle in reversed(up_chain):
+            self._unpack_edge(u, v, middle, path)
+        v = meeting
+        while backward_parents[v] is not None:
+            u, k = backward_parents[v]
+            self._unpack_edge(v, u, self.up_middle[k], path)
+            v = u
+        return path
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import sys
+from array import array
+from heuristics import project_coordinates
+
+# wspólny rdzeń wyszukiwania (src/wyszukiwanie)
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+import wyszukiwanie
+
+
+_fingerprints = {}
+
+
+def fingerprint_path(path):
+    """
+    Ścieżka zapisanego skrótu obok pliku, np. data/rzeszow.sha1.json.
+    """
+    return os.path.splitext(path)[0] + ".sha1.json"
+
+
+def file_fingerprint(path):
+    """
+    Skrót SHA-1 zawartości pliku (np. data/rzeszow.graphml), używany do
+    unieważniania danych wyliczonych z grafu. Skrót zapisywany jest obok
+    pliku (fingerprint_path) razem z rozmiarem i czasem modyfikacji, więc
+    plik czytany jest ponownie dopiero wtedy, gdy któreś z nich się zmieni,
+    także między uruchomieniami programu.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key in _fingerprints:
+        return _fingerprints[key]
+    sidecar = fingerprint_path(path)
+    try:
+        with open(sidecar, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if (saved["size"], saved["mtime_ns"]) == key[1:]:
+            _fingerprints[key] = saved["sha1"]
+            return saved["sha1"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    _fingerprints[key] = digest.hexdigest()
+    try:
+        tmp = f"{sidecar}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": _fingerprints[key]}, f)
+        os.replace(tmp, sidecar)
+    except OSError:
+        pass  # np. katalog tylko do odczytu: skrót zostaje tylko w pamięci procesu
+    return _fingerprints[key]
+
+
+class CSRGraph:
+    """
+    Skompilowana reprezentacja grafu drogowego w formacie CSR.
+
+    Węzły OSM są mapowane na gęste indeksy 0..n-1, a lista sąsiedztwa
+    przechowywana jest w płaskich buforach `array`:
+    sąsiedzi węzła i to targets[offsets[i]:offsets[i + 1]],
+    a odpowiadające im długości krawędzi to weights[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, node_ids, offsets, targets, weights, lats, lons):
+        self.node_ids = node_ids  # indeks -> identyfikator węzła
+        self.index = {node: i for i, node in enumerate(node_ids)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.lats = lats
+        self.lons = lons
+        self._projected = None
+        self._reverse = None
+
+    @classmethod
+    def from_networkx(cls, G, weight="length"):
+        """
+        Buduje graf CSR z grafu networkx (np. zwróconego przez RoutePlanner.load_graph).
+        """
+        node_ids = list(G.nodes)
+        index = {node: i for i, node in enumerate(node_ids)}
+
+        offsets = array("i", [0])
+        targets = array("i")
+        weights = array("d")
+        lats = array("d")
+        lons = array("d")
+        for node in node_ids:
+            for v, data in G.adj[node].items():
+                targets.append(index[v])
+                weights.append(float(data.get(weight, 1)))
+            offsets.append(len(targets))
+            attrs = G.nodes[node]
+            lats.append(float(attrs.get("y", 0.0)))
+            lons.append(float(attrs.get("x", 0.0)))
+        return cls(node_ids, offsets, targets, weights, lats, lons)
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def nbytes(self):
+        """
+        Rozmiar buforów CSR i współrzędnych w bajtach (bez słownika indeksu).
+        """
+        buffers = (self.offsets, self.targets, self.weights, self.lats, self.lons)
+        return sum(len(b) * b.itemsize for b in buffers)
+
+    def coords(self, node):
+        """
+        Zwraca (lat, lon) węzła o podanym identyfikatorze.
+        """
+        i = self.index[node]
+        return self.lats[i], self.lons[i]
+
+    def projected(self):
+        """
+        Współrzędne węzłów w lokalnym układzie metrycznym (xs, ys), liczone raz.
+        """
+        if self._projected is None:
+            self._projected = project_coordinates(self.lats, self.lons)
+        return self._projected
+
+    def reverse(self):
+        """
+        Graf transponowany (łuki odwrócone), liczony raz; używany przez
+        wyszukiwanie wstecz od celu. Dla grafu nieskierowanego ma te same łuki.
+        """
+        if self._reverse is None:
+            n = len(self.node_ids)
+            counts = [0] * (n + 1)
+            for v in self.targets:
+                counts[v + 1] += 1
+            offsets = array("i", [0]) * (n + 1)
+            for i in range(n):
+                offsets[i + 1] = offsets[i] + counts[i + 1]
+            position = array("i", offsets[:-1])
+            targets = array("i", [0]) * len(self.targets)
+            weights = array("d", [0.0]) * len(self.weights)
+            for u in range(n):
+                for k in range(self.offsets[u], self.offsets[u + 1]):
+                    v = self.targets[k]
+                    targets[position[v]] = u
+                    weights[position[v]] = self.weights[k]
+                    position[v] += 1
+            reverse = CSRGraph(self.node_ids, offsets, targets, weights, self.lats, self.lons)
+            reverse.index = self.index
+            reverse._projected = self._projected
+            reverse._reverse = self
+            self._reverse = reverse
+        return self._reverse
+
+    def edge_weight(self, u, v):
+        i, j = self.index[u], self.index[v]
+        best = None
+        for k in range(self.offsets[i], self.offsets[i + 1]):
+            if self.targets[k] == j and (best is None or self.weights[k] < best):
+                best = self.weights[k]
+        if best is None:
+            raise KeyError(f"Brak krawędzi {u} -> {v}")
+        return best
+
+    def path_length(self, path):
+        """
+        Suma długości krawędzi ścieżki podanej jako lista identyfikatorów węzłów.
+        """
+        return sum(self.edge_weight(u, v) for u, v in zip(path[:-1], path[1:]))
+
+
+def single_source_distances(C, source, target=None):
+    """
+    Dijkstra z jednego źródła (indeks CSR) do wszystkich węzłów grafu
+    (wyszukiwanie.odleglosci). Zwraca array('d') odległości, inf dla węzłów
+    nieosiągalnych. Jeśli podano `target`, przeszukiwanie kończy się po
+    ustaleniu jego odległości.
+    """
+    dist, _ = wyszukiwanie.odleglosci(wyszukiwanie.AdapterCSR.dla(C), source, None if target is None else [target])
+    return dist
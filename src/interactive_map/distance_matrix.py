@@ -0,0 +1,144 @@
+"""
+Macierz odległości źródła x cele na grafie CSR.
+
+Dla każdego źródła wykonywana jest jedna Dijkstra "jeden-do-wielu", kończona
+po ustaleniu wszystkich celów. Źródła rozdzielane są między procesy puli;
+na systemach z `fork` procesy dziedziczą graf tylko do odczytu bez kopiowania.
+
+Uruchomienie (pomiar skalowania): python distance_matrix.py --points 200 --processes 1 2 4
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+import graph_store
+import wyszukiwanie  # src jest w sys.path od importu csr_graph (graph_store)
+from spatial_index import SpatialIndex
+
+_worker_graph = None
+
+
+def snap_points(C, points, index=None):
+    """
+    Zamienia listę identyfikatorów węzłów lub par (lat, lon) na indeksy CSR.
+    Parą współrzędnych jest każda dwuelementowa sekwencja lub tablica numpy;
+    wartość skalarna musi być identyfikatorem węzła grafu (inaczej KeyError).
+    Współrzędne przypisywane są do najbliższego węzła grafu jednym
+    zapytaniem do indeksu przestrzennego (spatial_index.SpatialIndex).
+    """
+    indices = [None] * len(points)
+    coords = []
+    for i, point in enumerate(points):
+        if np.ndim(point) == 0:
+            if point not in C.index:
+                raise KeyError(f"Brak węzła {point!r} w grafie")
+            indices[i] = C.index[point]
+        elif np.ndim(point) == 1 and len(point) == 2:
+            coords.append((i, float(point[0]), float(point[1])))
+        else:
+            raise ValueError(f"Punkt {point!r} nie jest identyfikatorem węzła ani parą (lat, lon)")
+    if coords:
+        index = index or SpatialIndex.build(C, edges=False)
+        nearest, _ = index.nearest_nodes([lat for _, lat, _ in coords], [lon for _, _, lon in coords])
+        for (i, _, _), node in zip(coords, nearest):
+            indices[i] = int(node)
+    return indices
+
+
+def one_to_many(C, source, targets, return_paths=False):
+    """
+    Dijkstra ze źródła `source` zatrzymywana po ustaleniu wszystkich `targets`
+    (indeksy CSR; wyszukiwanie.odleglosci). Zwraca (lista odległości,
+    lista ścieżek jako indeksy lub None).
+    """
+    dist, parents = wyszukiwanie.odleglosci(wyszukiwanie.AdapterCSR.dla(C), source, targets, return_paths)
+    distances = [dist[t] for t in targets]
+    paths = None
+    if return_paths:
+        paths = []
+        for t, d in zip(targets, distances):
+            if d == float("inf"):
+                paths.append(None)
+                continue
+            path = [t]
+            while path[-1] != source:
+                path.append(parents[path[-1]])
+            path.reverse()
+            paths.append(path)
+    return distances, paths
+
+
+def _init_worker(C):
+    global _worker_graph
+    _worker_graph = C
+
+
+def _worker_row(task):
+    source, targets, return_paths = task
+    return one_to_many(_worker_graph, source, targets, return_paths)
+
+
+def _pool_context():
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def distance_matrix(C, origins, destinations=None, return_paths=False, processes=None, index=None):
+    """
+    Macierz odległości (w metrach) między punktami `origins` i `destinations`
+    (identyfikatory węzłów lub pary (lat, lon)); domyślnie destinations = origins.
+
+    processes=None używa wszystkich rdzeni, processes=1 liczy w bieżącym procesie;
+    `index` to opcjonalny, już zbudowany SpatialIndex do dopasowania współrzędnych.
+    Zwraca numpy.ndarray (inf dla par bez połączenia), a przy return_paths=True
+    parę (macierz, ścieżki), gdzie paths[i][j] to lista identyfikatorów węzłów.
+    """
+    sources = snap_points(C, origins, index)
+    targets = sources if destinations is None else snap_points(C, destinations, index)
+    tasks = [(source, targets, return_paths) for source in sources]
+
+    processes = processes or os.cpu_count() or 1
+    processes = min(processes, len(tasks)) if tasks else 1
+    if processes <= 1:
+        rows = [one_to_many(C, *task) for task in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (processes * 4))
+        with _pool_context().Pool(processes, initializer=_init_worker, initargs=(C,)) as pool:
+            rows = pool.map(_worker_row, tasks, chunksize=chunksize)
+
+    matrix = np.array([distances for distances, _ in rows], dtype=np.float64).reshape(len(sources), len(targets))
+    if not return_paths:
+        return matrix
+    node_ids = C.node_ids
+    paths = [[None if p is None else [node_ids[i] for i in p] for p in row_paths] for _, row_paths in rows]
+    return matrix, paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph", default="data/rzeszow.graphml")
+    parser.add_argument("--points", type=int, default=200)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    C = graph_store.attach_graph(args.graph)
+    points = random.Random(args.seed).sample(C.node_ids, min(args.points, len(C)))
+    baseline = None
+    for processes in args.processes:
+        t0 = time.perf_counter()
+        matrix = distance_matrix(C, points, processes=processes)
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or elapsed
+        print(f"procesy: {processes:2d}  czas: {elapsed:7.2f} s  "
+              f"przyspieszenie względem pierwszego pomiaru: x{baseline / elapsed:.2f}  "
+              f"macierz: {matrix.shape}")
+
+
+if __name__ == "__main__":
+    main()
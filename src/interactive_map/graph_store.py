@@ -0,0 +1,296 @@
+import argparse
+import bisect
+import mmap
+import os
+import random
+import struct
+import time
+import zipfile
+from array import array
+
+import numpy as np
+
+from csr_graph import CSRGraph, file_fingerprint
+
+FORMAT_VERSION = 1
+
+# Nagłówek pliku mapowanego: magia, wersja, n, m, odcisk GraphML (40 znaków hex).
+MAPPED_MAGIC = b"CSRG"
+MAPPED_HEADER = struct.Struct("<4sIQQ40s")
+# Kolejność i typy sekcji pliku mapowanego; długość w elementach zależy od n i m.
+MAPPED_SECTIONS = [
+    ("node_ids", "q", "n"),
+    ("sorted_ids", "q", "n"),
+    ("sorted_pos", "i", "n"),
+    ("offsets", "i", "n+1"),
+    ("targets", "i", "m"),
+    ("weights", "d", "m"),
+    ("rev_offsets", "i", "n+1"),
+    ("rev_targets", "i", "m"),
+    ("rev_weights", "d", "m"),
+    ("lats", "d", "n"),
+    ("lons", "d", "n"),
+    ("xs", "d", "n"),
+    ("ys", "d", "n"),
+]
+
+
+def binary_path(graph_file):
+    """
+    Ścieżka binarnej kopii grafu obok pliku GraphML, np. data/rzeszow.csr.npz.
+    """
+    return os.path.splitext(graph_file)[0] + ".csr.npz"
+
+
+def save_csr(C, path, fingerprint=""):
+    """
+    Zapisuje graf CSR (identyfikatory węzłów, współrzędne, sąsiedztwo, długości)
+    w nieskompresowanym pliku .npz. Zapis idzie do pliku tymczasowego
+    podmienianego na końcu, więc przerwany zapis nie zostawia uciętego pliku.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            version=np.int32(FORMAT_VERSION),
+            fingerprint=np.str_(fingerprint),
+            node_ids=np.asarray(C.node_ids, dtype=np.int64),
+            offsets=np.frombuffer(C.offsets, dtype=np.int32),
+            targets=np.frombuffer(C.targets, dtype=np.int32),
+            weights=np.frombuffer(C.weights, dtype=np.float64),
+            lats=np.frombuffer(C.lats, dtype=np.float64),
+            lons=np.frombuffer(C.lons, dtype=np.float64),
+        )
+    os.replace(tmp_path, path)
+
+
+def load_csr(path, fingerprint=None):
+    """
+    Wczytuje graf CSR z pliku .npz; zwraca None przy niezgodnej wersji
+    formatu lub odcisku pliku GraphML.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        if int(data["version"]) != FORMAT_VERSION:
+            return None
+        if fingerprint is not None and str(data["fingerprint"]) != fingerprint:
+            return None
+        return CSRGraph(
+            data["node_ids"].tolist(),
+            array("i", data["offsets"].tobytes()),
+            array("i", data["targets"].tobytes()),
+            array("d", data["weights"].tobytes()),
+            array("d", data["lats"].tobytes()),
+            array("d", data["lons"].tobytes()),
+        )
+
+
+def load_graph(graph_file):
+    """
+    Graf CSR dla pliku GraphML. Przy pierwszym wczytaniu GraphML jest
+    parsowany przez osmnx i zapisywany w formacie binarnym; kolejne
+    uruchomienia wczytują tylko plik .npz (o ile skrót GraphML się zgadza).
+    """
+    path = binary_path(graph_file)
+    fingerprint = file_fingerprint(graph_file)
+    if os.path.exists(path):
+        try:
+            C = load_csr(path, fingerprint)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            C = None
+        if C is not None:
+            return C
+
+    # osmnx importowany dopiero tutaj: sam import trwa dłużej niż wczytanie .npz
+    import networkx as nx
+    import osmnx as ox
+
+    C = CSRGraph.from_networkx(nx.Graph(ox.load_graphml(graph_file)))
+    save_csr(C, path, fingerprint)
+    return C
+
+
+def mapped_path(graph_file):
+    """
+    Ścieżka pliku mapowanego w pamięci obok pliku GraphML, np. data/rzeszow.csr.bin.
+    """
+    return os.path.splitext(graph_file)[0] + ".csr.bin"
+
+
+def _section_length(size, n, m):
+    return {"n": n, "n+1": n + 1, "m": m}[size]
+
+
+def export_mapped(C, path, fingerprint=""):
+    """
+    Zapisuje graf CSR w płaskim pliku do mapowania w pamięci (mmap).
+    Oprócz sąsiedztwa plik zawiera graf odwrócony, rzutowane współrzędne
+    i posortowane identyfikatory, więc procesy podłączające się do niego
+    nie muszą niczego wyliczać ani kopiować.
+    """
+    n, m = len(C), C.edge_count
+    R = C.reverse()
+    xs, ys = C.projected()
+    order = sorted(range(n), key=C.node_ids.__getitem__)
+    data = {
+        "node_ids": array("q", C.node_ids),
+        "sorted_ids": array("q", (C.node_ids[i] for i in order)),
+        "sorted_pos": array("i", order),
+        "offsets": C.offsets, "targets": C.targets, "weights": C.weights,
+        "rev_offsets": R.offsets, "rev_targets": R.targets, "rev_weights": R.weights,
+        "lats": C.lats, "lons": C.lons, "xs": xs, "ys": ys,
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAPPED_HEADER.pack(MAPPED_MAGIC, FORMAT_VERSION, n, m, fingerprint.encode("ascii").ljust(40)))
+        for name, typecode, size in MAPPED_SECTIONS:
+            f.write(b"\0" * (-f.tell() % 8))
+            buffer = data[name]
+            if len(buffer) != _section_length(size, n, m):
+                raise ValueError(f"Niepoprawna długość sekcji {name}")
+            f.write(array(typecode, buffer).tobytes())
+    os.replace(tmp_path, path)
+
+
+class _SortedIndex:
+    """
+    Odwzorowanie identyfikator węzła -> indeks CSR oparte na wyszukiwaniu
+    binarnym w posortowanych identyfikatorach (bez słownika w każdym procesie).
+    """
+
+    def __init__(self, sorted_ids, sorted_pos):
+        self.sorted_ids = sorted_ids
+        self.sorted_pos = sorted_pos
+
+    def _find(self, node):
+        i = bisect.bisect_left(self.sorted_ids, node)
+        if i < len(self.sorted_ids) and self.sorted_ids[i] == node:
+            return self.sorted_pos[i]
+        return -1
+
+    def __getitem__(self, node):
+        i = self._find(node)
+        if i < 0:
+            raise KeyError(node)
+        return i
+
+    def __contains__(self, node):
+        try:
+            return self._find(node) >= 0
+        except TypeError:
+            return False
+
+    def __len__(self):
+        return len(self.sorted_ids)
+
+
+class MappedCSRGraph(CSRGraph):
+    """
+    Graf CSR tylko do odczytu, którego bufory są widokami (memoryview)
+    na plik zmapowany w pamięci. Strony pliku są współdzielone przez
+    wszystkie procesy, które się do niego podłączą, więc pamięć rezydentna
+    nie rośnie z liczbą procesów. Wszystkie funkcje wyszukiwania z routing.py
+    działają na nim bez zmian.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, m, fingerprint = MAPPED_HEADER.unpack_from(self._mmap, 0)
+        if magic != MAPPED_MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Nieobsługiwany plik grafu: {path}")
+        self.fingerprint = fingerprint.decode("ascii").strip()
+        view = memoryview(self._mmap)
+        sections = {}
+        position = MAPPED_HEADER.size
+        for name, typecode, size in MAPPED_SECTIONS:
+            position += -position % 8
+            length = _section_length(size, n, m) * struct.calcsize(typecode)
+            sections[name] = view[position:position + length].cast(typecode)
+            position += length
+
+        self.node_ids = sections["node_ids"]
+        self.index = _SortedIndex(sections["sorted_ids"], sections["sorted_pos"])
+        self.offsets, self.targets, self.weights = sections["offsets"], sections["targets"], sections["weights"]
+        self.lats, self.lons = sections["lats"], sections["lons"]
+        self._projected = (sections["xs"], sections["ys"])
+        reverse = CSRGraph.__new__(CSRGraph)
+        reverse.node_ids, reverse.index = self.node_ids, self.index
+        reverse.offsets, reverse.targets, reverse.weights = sections["rev_offsets"], sections["rev_targets"], sections["rev_weights"]
+        reverse.lats, reverse.lons = self.lats, self.lons
+        reverse._projected, reverse._reverse = self._projected, self
+        self._reverse = reverse
+
+    def __reduce__(self):
+        # przy przekazaniu do innego procesu podłączamy się do tego samego pliku
+        return (MappedCSRGraph, (self.path,))
+
+
+def attach_graph(graph_file):
+    """
+    Podłącza się do zmapowanej kopii grafu, tworząc ją przy pierwszym użyciu
+    (albo gdy zmienił się plik GraphML).
+    """
+    path = mapped_path(graph_file)
+    fingerprint = file_fingerprint(graph_file)
+    if os.path.exists(path):
+        try:
+            C = MappedCSRGraph(path)
+        except (OSError, ValueError, struct.error):
+            C = None
+        if C is not None and C.fingerprint == fingerprint:
+            return C
+    export_mapped(load_graph(graph_file), path, fingerprint)
+    return MappedCSRGraph(path)
+
+
+def _private_memory_kb():
+    """
+    Prywatna (niewspółdzielona) pamięć procesu w kB z /proc (Linux), albo None.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return sum(int(fields[k].split()[0]) for k in ("Private_Clean", "Private_Dirty"))
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _worker_probe(args):
+    import routing
+
+    C, queries, seed = args
+    rng = random.Random(seed)
+    n = len(C)
+    before = _private_memory_kb()
+    for _ in range(queries):
+        s, t = C.node_ids[rng.randrange(n)], C.node_ids[rng.randrange(n)]
+        routing.find_path(C, s, t, "A*")
+    after = _private_memory_kb()
+    return os.getpid(), before, after
+
+
+def main():
+    """
+    Pomiar: N procesów podłącza się do zmapowanego grafu i wykonuje zapytania;
+    wypisywana jest prywatna pamięć każdego z nich.
+    """
+    import multiprocessing
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--graph", default="data/rzeszow.graphml")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    C = attach_graph(args.graph)
+    print(f"Podłączono graf {C.path}: {len(C)} węzłów, {C.edge_count} łuków, {time.perf_counter() - t0:.3f} s")
+    with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+        tasks = [(C, args.queries, seed) for seed in range(args.workers)]
+        for pid, before, after in pool.map(_worker_probe, tasks):
+            print(f"proces {pid}: pamięć prywatna przed/po zapytaniach: {before} / {after} kB")
+
+
+if __name__ == "__main__":
+    main()
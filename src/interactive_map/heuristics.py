@@ -0,0 +1,65 @@
+from array import array
+from math import radians, cos, sqrt
+
+EARTH_RADIUS = 6371000  # promień Ziemi w metrach (jak w routing.great_circle_vec)
+# Margines bezpieczeństwa: rzutowanie płaskie jest przybliżeniem odległości
+# po kole wielkim, więc skracamy je minimalnie, żeby heurystyka pozostała dopuszczalna.
+ADMISSIBLE_SCALE = 0.999
+
+
+def projection_scales(lats):
+    """
+    Współczynniki (kx, ky) w metrach na stopień długości/szerokości.
+
+    Oś x skalowana jest cosinusem największej (co do modułu) szerokości
+    w grafie, dzięki czemu odległość w rzucie nie przekracza odległości
+    po kole wielkim i heurystyka euklidesowa pozostaje dopuszczalna.
+    """
+    lat_extreme = max(abs(min(lats)), abs(max(lats))) if len(lats) else 0.0
+    ky = radians(1) * EARTH_RADIUS * ADMISSIBLE_SCALE
+    kx = ky * cos(radians(lat_extreme))
+    return kx, ky
+
+
+def project_coordinates(lats, lons):
+    """
+    Rzutuje współrzędne geograficzne na lokalny układ metryczny x/y
+    (skale z projection_scales).
+    """
+    if not lats:
+        return array("d"), array("d")
+    kx, ky = projection_scales(lats)
+    xs = array("d", (lon * kx for lon in lons))
+    ys = array("d", (lat * ky for lat in lats))
+    return xs, ys
+
+
+def make_heuristic(xs, ys, target, heuristic_type="euklidesowa"):
+    """
+    Zwraca funkcję h(v) dla ustalonego celu, liczoną na rzutowanych
+    współrzędnych i zapamiętywaną w obrębie jednego zapytania.
+    "manhattan" (suma odległości wzdłuż osi razy 1.2, jak w
+    routing.get_heuristic_func) jest niedopuszczalna, więc A* z nią nie
+    gwarantuje najkrótszej trasy.
+    """
+    tx, ty = xs[target], ys[target]
+    cache = {}
+
+    if heuristic_type == "euklidesowa":
+        def h(v):
+            value = cache.get(v)
+            if value is None:
+                dx = xs[v] - tx
+                dy = ys[v] - ty
+                value = cache[v] = sqrt(dx * dx + dy * dy)
+            return value
+    elif heuristic_type == "manhattan":
+        def h(v):
+            value = cache.get(v)
+            if value is None:
+                value = cache[v] = 1.2 * (abs(xs[v] - tx) + abs(ys[v] - ty))
+            return value
+    else:
+        def h(v):
+            return 0.0
+    return h
@@ -0,0 +1,148 @@
+import os
+import random
+import time
+import zipfile
+
+import numpy as np
+
+from csr_graph import file_fingerprint, single_source_distances
+
+# Tablice zapisywane są jako float32, więc od dolnego ograniczenia odejmujemy
+# margines na błąd zaokrąglenia (w metrach), żeby heurystyka pozostała dopuszczalna.
+ALT_EPS = 0.01
+
+
+def landmarks_path(graph_file):
+    """
+    Ścieżka pliku z tablicami punktów orientacyjnych obok pliku grafu,
+    np. data/rzeszow.graphml -> data/rzeszow.landmarks.npz.
+    """
+    return os.path.splitext(graph_file)[0] + ".landmarks.npz"
+
+
+def select_landmarks(C, k=16, seed=0):
+    """
+    Wybór punktów orientacyjnych metodą "farthest": każdy kolejny to węzeł
+    najdalszy (w sensie odległości drogowej) od już wybranych.
+    Zwraca (lista indeksów CSR, lista tablic odległości).
+    """
+    n = len(C)
+    k = min(k, n)
+    rng = random.Random(seed)
+    start = rng.randrange(n)
+    nearest = single_source_distances(C, start)
+    landmarks, tables = [], []
+    for _ in range(k):
+        best, best_dist = None, -1.0
+        for v in range(n):
+            d = nearest[v]
+            if d != float("inf") and d > best_dist:
+                best, best_dist = v, d
+        if best is None or best_dist == 0.0:
+            break
+        dist = single_source_distances(C, best)
+        landmarks.append(best)
+        tables.append(dist)
+        if len(tables) == 1:
+            nearest = dist[:]
+        else:
+            for v in range(n):
+                if dist[v] < nearest[v]:
+                    nearest[v] = dist[v]
+    return landmarks, tables
+
+
+class LandmarkTable:
+    """
+    Odległości od K punktów orientacyjnych do wszystkich węzłów grafu,
+    używane przez heurystykę ALT: h(v) = max_L |d(L, t) - d(L, v)|.
+    """
+
+    def __init__(self, landmarks, distances, build_time=0.0):
+        self.landmarks = landmarks  # indeksy CSR
+        self.distances = distances  # lista K list odległości (float)
+        self.build_time = build_time
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    @classmethod
+    def build(cls, C, k=16, seed=0):
+        t0 = time.perf_counter()
+        landmarks, tables = select_landmarks(C, k, seed)
+        distances = [np.asarray(t, dtype=np.float32).tolist() for t in tables]
+        return cls(landmarks, distances, time.perf_counter() - t0)
+
+    def save(self, path, C, fingerprint=""):
+        # plik tymczasowy podmieniany na końcu: przerwany zapis nie zostawia uciętego pliku
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                node_ids=np.asarray(C.node_ids, dtype=np.int64),
+                landmarks=np.asarray(self.landmarks, dtype=np.int32),
+                distances=np.asarray(self.distances, dtype=np.float32),
+                build_time=np.float64(self.build_time),
+                fingerprint=np.str_(fingerprint),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, C, fingerprint=None):
+        """
+        Wczytuje tablice z dysku; zwraca None, jeśli plik nie pasuje do grafu.
+        """
+        with np.load(path) as data:
+            if fingerprint is not None and str(data["fingerprint"]) != fingerprint:
+                return None
+            if data["node_ids"].tolist() != list(C.node_ids):
+                return None
+            return cls(data["landmarks"].tolist(), data["distances"].tolist(), float(data["build_time"]))
+
+    @classmethod
+    def load_or_build(cls, C, graph_file, k=16):
+        """
+        Wczytuje tablice zapisane obok pliku grafu albo wylicza je i zapisuje.
+        """
+        path = landmarks_path(graph_file)
+        fingerprint = file_fingerprint(graph_file)
+        if os.path.exists(path):
+            try:
+                table = cls.load(path, C, fingerprint)
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                table = None
+            if table is not None and len(table) >= min(k, len(C)):
+                return table
+        print(f"Wyznaczanie {k} punktów orientacyjnych ALT...")
+        table = cls.build(C, k)
+        table.save(path, C, fingerprint)
+        return table
+
+    def heuristic(self, s, t, active=4):
+        """
+        Zwraca funkcję h(v) dla celu t, używającą `active` punktów
+        orientacyjnych dających największe ograniczenie dla pary (s, t).
+        """
+        inf = float("inf")
+        candidates = []
+        for row in self.distances:
+            ds, dt = row[s], row[t]
+            if ds != inf and dt != inf:
+                candidates.append((abs(dt - ds), dt, row))
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        chosen = [(dt, row) for _, dt, row in candidates[:active]]
+        cache = {}
+
+        def h(v):
+            value = cache.get(v)
+            if value is None:
+                value = 0.0
+                for dt, row in chosen:
+                    diff = dt - row[v]
+                    if diff < 0:
+                        diff = -diff
+                    if diff > value:
+                        value = diff
+                value = cache[v] = max(value - ALT_EPS, 0.0)
+            return value
+        return h
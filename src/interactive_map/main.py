@@ -1,9 +1,10 @@
 import sys
 import json
-import tracemalloc
-import time
 import os
 import random
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, CancelledError
 
 IS_WIN = sys.platform == "win32"
 if IS_WIN:
@@ -13,13 +14,17 @@ if IS_WIN:
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton, QLabel,
     QMessageBox, QHBoxLayout, QGroupBox, QStyle, QLineEdit,
-    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QFileDialog
+    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QFileDialog, QCheckBox
 )
 from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineProfile
-from PyQt5.QtCore import QUrl, QSize, Qt, QObject, pyqtSlot
+from PyQt5.QtCore import QUrl, QSize, Qt, QObject, pyqtSlot, pyqtSignal, QRunnable, QThreadPool
 from PyQt5.QtWebChannel import QWebChannel
 from PyQt5.QtGui import QFont, QIcon
+import route_workers
 import routing
+import graph_store
+from route_cache import RouteCache
+from spatial_index import SpatialIndex
 import folium
 import osmnx as ox
 from geopy.geocoders import Nominatim
@@ -30,6 +35,11 @@ import pyqtgraph as pg
 pg.setConfigOption('background', '#3C3C3C')
 pg.setConfigOption('foreground', '#F0F0F0')
 
+GRAPH_FILE = "data/rzeszow.graphml"
+
+def format_measurement(value):
+    return "-" if value is None else f"{value:.4f}"
+
 class WebBridge(QObject):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -39,6 +49,7 @@ class WebBridge(QObject):
     def receive_coords_from_js(self, lat, lon, click_count):
         formatted_coords = f"{lat:.6f}, {lon:.6f}"
         if click_count == 1:
+            self.main_window.cancel_pending_routes()
             self.main_window.start_address_input.setText(formatted_coords)
             self.main_window.end_address_input.clear()
         elif click_count == 2:
@@ -82,6 +93,32 @@ class BarChartWidget(pg.PlotWidget):
         bar3 = pg.BarGraphItem(y=y_ticks, x0=start_recon, width=recon_times, height=0.5, brush='#F1C40F'); self.addItem(bar3)
         self.getAxis('left').setTicks([list(zip(y_ticks, names))])
 
+class RouteSignals(QObject):
+    finished = pyqtSignal(int, object, object)  # (generacja, algorytm, wynik)
+    failed = pyqtSignal(int, object, str)
+    tables_ready = pyqtSignal(str)  # pusty napis albo komunikat błędu budowy ALT/CH
+
+class RouteTask(QRunnable):
+    """
+    Zadanie puli QThreadPool: zleca wyznaczenie trasy procesowi roboczemu
+    i czeka na wynik, nie blokując głównego wątku Qt.
+    """
+    def __init__(self, planner, generation, algo, name_for_func, start_node, end_node, measure_memory=True):
+        super().__init__()
+        self.planner, self.generation, self.algo = planner, generation, algo
+        self.args = (name_for_func, algo["h"], start_node, end_node, measure_memory)
+
+    def run(self):
+        # pod blokadą cancel_pending_routes nie wejdzie między sprawdzenie generacji a dopisanie future
+        with self.planner.route_lock:
+            if self.generation != self.planner.route_generation: return
+            future = self.planner.route_executor.submit(route_workers.run_algorithm, *self.args)
+            self.planner.route_futures.append(future)
+        try: result = future.result()
+        except CancelledError: return
+        except Exception as e: self.planner.route_signals.failed.emit(self.generation, self.algo, str(e)); return
+        self.planner.route_signals.finished.emit(self.generation, self.algo, result)
+
 class RoutePlanner(QWidget):
     def __init__(self):
         super().__init__()
@@ -92,9 +129,15 @@ class RoutePlanner(QWidget):
         if os.path.exists(icon_path): self.setWindowIcon(QIcon(icon_path))
         if IS_WIN: self.set_dark_title_bar()
         
-        self.G = self.load_graph()
+        self.C = self.load_graph()
+        self.spatial_index = SpatialIndex.load_or_build(self.C, GRAPH_FILE)
+        self.route_cache = RouteCache(GRAPH_FILE, maxsize=512, cache_dir=os.path.join("cache", "routes"))
+        self.thread_pool = QThreadPool.globalInstance()
+        self.route_executor = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1), mp_context=multiprocessing.get_context("spawn"), initializer=route_workers.init_worker, initargs=(GRAPH_FILE,))
+        self.route_signals = RouteSignals(); self.route_signals.finished.connect(self.on_route_finished); self.route_signals.failed.connect(self.on_route_failed); self.route_signals.tables_ready.connect(self.on_tables_ready)
+        self.route_lock = threading.Lock(); self.route_generation = 0; self.route_futures = []; self.pending_routes = None
         self.geolocator = Nominatim(user_agent="rzeszow_planner_gui")
-        self.algorithms = [{"name": "Dijkstra", "h": None, "c": "red", "dash": "10, 5"}, {"name": "A* (Euklidesowa)", "h": "euklidesowa", "c": "green", "dash": None}, {"name": "A* (Manhattan)", "h": "manhattan", "c": "purple", "dash": "1, 5"}, {"name": "BFS", "h": None, "c": "blue", "dash": "20, 10, 5, 10"}]
+        self.algorithms = [{"name": "Dijkstra", "h": None, "c": "red", "dash": "10, 5"}, {"name": "A* (Euklidesowa)", "h": "euklidesowa", "c": "green", "dash": None}, {"name": "A* (Manhattan)", "h": "manhattan", "c": "purple", "dash": "1, 5"}, {"name": "A* (ALT)", "h": "ALT", "c": "orange", "dash": "15, 5"}, {"name": "BFS", "h": None, "c": "blue", "dash": "20, 10, 5, 10"}, {"name": "CH", "h": None, "c": "black", "dash": "2, 8"}, {"name": "Bi-Dijkstra", "h": None, "c": "darkred", "dash": "10, 10"}, {"name": "Bi-A* (Euklidesowa)", "alg": "Bi-A*", "h": "euklidesowa", "c": "darkgreen", "dash": "5, 10"}, {"name": "Bi-BFS", "h": None, "c": "cadetblue", "dash": "20, 5"}]
         self.latest_results = []
 
         self.bridge = WebBridge(self)
@@ -118,12 +161,17 @@ class RoutePlanner(QWidget):
         single_route_group = QGroupBox("Wyznacz Trasę"); single_route_layout = QHBoxLayout(); single_route_layout.setContentsMargins(10, 20, 10, 10)
         self.algo_selection_box = QComboBox()
         for algo in self.algorithms: self.algo_selection_box.addItem(algo["name"])
+        # ALT i CH niedostępne, dopóki proces roboczy nie zbuduje (albo nie sprawdzi) ich plików
+        self.tables_ready = False; self.set_table_algorithms_enabled(False)
+        self.route_executor.submit(route_workers.prepare_tables).add_done_callback(self.emit_tables_ready)
         find_route_button = QPushButton("Wyznacz"); find_route_button.clicked.connect(self.find_single_route)
         single_route_layout.addWidget(self.algo_selection_box); single_route_layout.addWidget(find_route_button)
         single_route_group.setLayout(single_route_layout); left_panel_layout.addWidget(single_route_group)
 
         compare_button = QPushButton("Porównaj Wszystkie Algorytmy"); compare_button.clicked.connect(self.run_comparison)
         left_panel_layout.addWidget(compare_button)
+        self.memory_checkbox = QCheckBox("Pomiar pamięci (osobny przebieg)"); self.memory_checkbox.setChecked(True)
+        left_panel_layout.addWidget(self.memory_checkbox)
 
         results_group = QGroupBox("Wyniki"); results_layout = QVBoxLayout(); results_layout.setContentsMargins(10, 20, 10, 10)
         self.results_table = QTableWidget(); self.results_table.setColumnCount(5)
@@ -148,41 +196,93 @@ class RoutePlanner(QWidget):
         filePath, _ = QFileDialog.getSaveFileName(self, "Zapisz jako...", "", "Pliki Excel (*.xlsx);;Wszystkie pliki (*)")
         if filePath:
             try:
-                export_data = [{'Algorytm': r.get('name', ''), 'Długość (km)': f"{r.get('len', 0):.2f}", 'Czas (s)': f"{r.get('time', 0):.4f}", 'Pamięć (MB)': f"{r.get('mem', 0):.4f}", 'Odwiedzone węzły': r.get('visited', 0)} for r in self.latest_results]
+                export_data = [{'Algorytm': r.get('name', ''), 'Długość (km)': f"{r.get('len', 0):.2f}", 'Czas (s)': format_measurement(r.get('time')), 'Pamięć (MB)': format_measurement(r.get('mem')), 'Odwiedzone węzły': r.get('visited', 0), 'Z cache': 'tak' if r.get('cached') else 'nie', **{key: r.get('time_components', {}).get(key, '') for key in routing.COUNTER_KEYS}} for r in self.latest_results]
                 df = pd.DataFrame(export_data); df.to_excel(filePath, index=False)
                 QMessageBox.information(self, "Sukces", f"Wyniki pomyślnie wyeksportowano do:\n{filePath}")
             except Exception as e: self.show_error("Błąd eksportu", f"Nie udało się zapisać pliku. Błąd: {e}")
 
+    @staticmethod
+    def needs_tables(algo):
+        return algo["h"] == "ALT" or algo["name"] == "CH"
+
+    def set_table_algorithms_enabled(self, enabled):
+        for i, algo in enumerate(self.algorithms):
+            if self.needs_tables(algo): self.algo_selection_box.model().item(i).setEnabled(enabled)
+
+    def emit_tables_ready(self, future):
+        # wywoływane w wątku puli procesów; sygnał przenosi wynik do wątku GUI
+        if future.cancelled(): return
+        error = future.exception()
+        self.route_signals.tables_ready.emit("" if error is None else str(error))
+
+    def on_tables_ready(self, message):
+        if message: self.show_error("Błąd przygotowania ALT/CH", f"Algorytmy ALT i CH pozostają niedostępne: {message}"); return
+        self.tables_ready = True; self.set_table_algorithms_enabled(True)
+
+    def cancel_pending_routes(self):
+        with self.route_lock:
+            self.route_generation += 1
+            for future in self.route_futures: future.cancel()
+            self.route_futures = []
+        self.pending_routes = None
+
     def process_routes(self, algorithms_to_process, start_c, end_c):
-        self.results_table.setRowCount(0); self.bar_chart_widget.clear(); QApplication.processEvents()
+        self.cancel_pending_routes(); generation = self.route_generation
+        self.results_table.setRowCount(0); self.bar_chart_widget.clear()
         try:
-            start_node = ox.distance.nearest_nodes(self.G, X=start_c[1], Y=start_c[0])
-            end_node = ox.distance.nearest_nodes(self.G, X=end_c[1], Y=end_c[0])
-            results_data, map_data = [], []
-            for algo in algorithms_to_process:
-                tracemalloc.start(); start_time = time.perf_counter()
-                name_for_func = "A*" if "A*" in algo["name"] else algo["name"]
-                path, visited_count, time_components = routing.find_path(self.G, start_node, end_node, name_for_func, algo["h"])
-                end_time = time.perf_counter(); _, peak = tracemalloc.get_traced_memory(); tracemalloc.stop()
-                if path:
-                    length = nx.path_weight(self.G, path, weight="length") / 1000
-                    results_data.append({ "name": algo["name"], "len": length, "time": end_time - start_time, "mem": peak / (1024**2), "visited": visited_count, "time_components": time_components })
-                    map_data.append({"path": path, "c": algo["c"], "name": algo["name"], "len": length, "dash": algo.get("dash")})
-            if not results_data: self.show_error("Błąd", "Nie udało się znaleźć trasy."); return
-            self.latest_results = results_data
-            self.update_results_table(results_data)
-            self.bar_chart_widget.update_chart(results_data)
-            self.generate_comparison_map(start_c, end_c, map_data)
-        except nx.NetworkXNoPath: self.show_error("Błąd trasy", "Nie można znaleźć połączenia.")
-        except Exception as e: self.show_error("Błąd przetwarzania", f"Wystąpił błąd: {e}")
-        
+            nearest, _ = self.spatial_index.nearest_nodes([start_c[0], end_c[0]], [start_c[1], end_c[1]])
+            start_node, end_node = (self.C.node_ids[int(i)] for i in nearest)
+        except Exception as e: self.show_error("Błąd przetwarzania", f"Wystąpił błąd: {e}"); return
+        self.pending_routes = {"start_c": start_c, "end_c": end_c, "start_node": start_node, "end_node": end_node, "remaining": len(algorithms_to_process), "results": [], "map_data": []}
+        self.status_label.setText("Wyznaczanie tras...")
+        for algo in algorithms_to_process:
+            name_for_func = algo.get("alg") or ("A*" if "A*" in algo["name"] else algo["name"])
+            cached = self.route_cache.get(start_node, end_node, name_for_func, algo["h"])
+            if cached is not None:
+                # czas i pamięć z pierwotnego wyznaczenia trasy (None we wpisach zapisanych bez nich)
+                path, visited_count, time_components = cached
+                result = {"path": list(path), "visited": visited_count, "time_components": dict(time_components, cache_hit=1), "time": time_components.get("query_time"), "mem": time_components.get("query_mem")}
+                self.on_route_finished(generation, algo, result)
+            else:
+                self.thread_pool.start(RouteTask(self, generation, algo, name_for_func, start_node, end_node, self.memory_checkbox.isChecked()))
+
+    def on_route_finished(self, generation, algo, result):
+        pending = self.pending_routes
+        if generation != self.route_generation or pending is None: return
+        pending["remaining"] -= 1
+        path = result["path"]
+        if path:
+            if not result["time_components"].get("cache_hit"):
+                name_for_func = algo.get("alg") or ("A*" if "A*" in algo["name"] else algo["name"])
+                self.route_cache.put(pending["start_node"], pending["end_node"], name_for_func, algo["h"], (path, result["visited"], dict(result["time_components"], query_time=result["time"], query_mem=result["mem"])))
+            length = self.C.path_length(path) / 1000
+            pending["results"].append({ "name": algo["name"], "len": length, "time": result["time"], "mem": result["mem"], "visited": result["visited"], "time_components": result["time_components"], "cached": bool(result["time_components"].get("cache_hit")) })
+            pending["map_data"].append({"path": path, "c": algo["c"], "name": algo["name"], "len": length, "dash": algo.get("dash")})
+            self.latest_results = list(pending["results"])
+            self.update_results_table(list(pending["results"]))
+            self.bar_chart_widget.update_chart(list(pending["results"]))
+        if pending["remaining"] == 0: self.finish_routes(pending)
+
+    def on_route_failed(self, generation, algo, message):
+        pending = self.pending_routes
+        if generation != self.route_generation or pending is None: return
+        self.cancel_pending_routes()
+        self.show_error("Błąd przetwarzania", f"{algo['name']}: wystąpił błąd: {message}")
+
+    def finish_routes(self, pending):
+        self.pending_routes = None
+        if not pending["results"]: self.show_error("Błąd", "Nie udało się znaleźć trasy."); return
+        self.generate_comparison_map(pending["start_c"], pending["end_c"], pending["map_data"])
+        stats = self.route_cache.stats()
+        self.status_label.setText(f"Cache tras: trafienia {stats['hits'] + stats['disk_hits']}, chybienia {stats['misses']}")
+
     def update_results_table(self, results):
         self.results_table.setRowCount(len(results)); results.sort(key=lambda x: x['len'])
         for row, res in enumerate(results):
-            self.results_table.setItem(row, 0, QTableWidgetItem(res["name"]))
+            self.results_table.setItem(row, 0, QTableWidgetItem(res["name"] + (" (cache)" if res.get("cached") else "")))
             self.results_table.setItem(row, 1, QTableWidgetItem(f"{res['len']:.2f}"))
-            self.results_table.setItem(row, 2, QTableWidgetItem(f"{res['time']:.4f}"))
-            self.results_table.setItem(row, 3, QTableWidgetItem(f"{res['mem']:.4f}"))
+            self.results_table.setItem(row, 2, QTableWidgetItem(format_measurement(res['time'])))
+            self.results_table.setItem(row, 3, QTableWidgetItem(format_measurement(res['mem'])))
             self.results_table.setItem(row, 4, QTableWidgetItem(f"{res['visited']}"))
             
     def generate_comparison_map(self, start_coords, end_coords, map_data):
@@ -191,7 +291,7 @@ class RoutePlanner(QWidget):
         folium.Marker(start_coords, popup="Start", icon=blue_icon).add_to(m)
         folium.Marker(end_coords, popup="Koniec", icon=red_icon).add_to(m)
         for data in map_data:
-            route_coords = [(self.G.nodes[n]['y'], self.G.nodes[n]['x']) for n in data['path']]
+            route_coords = [self.C.coords(n) for n in data['path']]
             folium.PolyLine(locations=route_coords, color=data['c'], weight=4, opacity=0.8, tooltip=f"{data['name']}: {data['len']:.2f} km", dash_array=data.get('dash')).add_to(m)
         if len(map_data) > 1:
             legend_html = self.generate_legend_html(map_data)
@@ -225,6 +325,7 @@ class RoutePlanner(QWidget):
         except Exception as e: print(f"Nie można ustawić ciemnego paska tytułu: {e}")
         
     def clear_points(self):
+        self.cancel_pending_routes()
         coords_file = os.path.join("data", "coords.json");
         if os.path.exists(coords_file): os.remove(coords_file)
         self.start_address_input.clear(); self.end_address_input.clear()
@@ -232,16 +333,14 @@ class RoutePlanner(QWidget):
         self.load_clickable_map()
         
     def load_graph(self):
-        graph_file = "data/rzeszow.graphml"
+        graph_file = GRAPH_FILE
         if not os.path.exists(graph_file):
             print("Pobieranie mapy Rzeszowa...")
             center_point = (50.0375, 22.0044)
             G = ox.graph_from_point(center_point, dist=15000, network_type="drive")
             G = nx.Graph(G)  # konwersja do nieskierowanego grafu
             ox.save_graphml(G, graph_file)
-            return G
-        G = ox.load_graphml(graph_file)
-        return nx.Graph(G)
+        return graph_store.attach_graph(graph_file)
         
     def load_clickable_map(self):
         m = folium.Map(location=[50.0412, 21.9991], zoom_start=12)
@@ -300,8 +399,13 @@ class RoutePlanner(QWidget):
     def run_comparison(self):
         start_c, end_c = self._get_start_end_points();
         if not start_c: return
-        self.process_routes(self.algorithms, start_c, end_c)
+        self.process_routes([algo for algo in self.algorithms if self.tables_ready or not self.needs_tables(algo)], start_c, end_c)
         
+    def closeEvent(self, event):
+        self.cancel_pending_routes()
+        self.route_executor.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(event)
+
     def show_error(self, title, text):
         msg_box = QMessageBox(self); msg_box.setIcon(QMessageBox.Critical); msg_box.setText(title)
         msg_box.setInformativeText(text); msg_box.setWindowTitle("Błąd"); msg_box.exec_()
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import shutil
+from collections import OrderedDict
+
+import routing
+from csr_graph import file_fingerprint
+
+
+class RouteCache:
+    """
+    Ograniczony (LRU) bufor wyników routing.find_path.
+
+    Klucz to (start_node, end_node, algorytm, heurystyka, odcisk pliku grafu).
+    Opcjonalna warstwa dyskowa zapisuje wyniki jako JSON w katalogu
+    cache_dir/<odcisk grafu>/. Zmiana pliku grafu (rozmiar lub czas modyfikacji)
+    powoduje przeliczenie odcisku i unieważnienie starych wpisów.
+    """
+
+    def __init__(self, graph_file, maxsize=256, cache_dir=None):
+        self.graph_file = graph_file
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._stat = None
+        self._fingerprint = None
+
+    def fingerprint(self):
+        """
+        Odcisk pliku grafu; przeliczany tylko wtedy, gdy plik się zmienił.
+        """
+        st = os.stat(self.graph_file)
+        stat = (st.st_size, st.st_mtime_ns)
+        if stat != self._stat:
+            fingerprint = file_fingerprint(self.graph_file)
+            if fingerprint != self._fingerprint:
+                self.entries.clear()
+                self._fingerprint = fingerprint
+                self._purge_disk()
+            self._stat = stat
+        return self._fingerprint
+
+    def _disk_dir(self):
+        return os.path.join(self.cache_dir, self._fingerprint)
+
+    def _disk_file(self, key):
+        digest = hashlib.sha1(json.dumps(key[:4], default=str).encode("utf-8")).hexdigest()
+        return os.path.join(self._disk_dir(), digest + ".json")
+
+    def _purge_disk(self):
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name != self._fingerprint:
+                shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+    def get(self, start_node, end_node, algorithm_name, heuristic=None):
+        key = (start_node, end_node, algorithm_name, heuristic, self.fingerprint())
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        if self.cache_dir:
+            disk_file = self._disk_file(key)
+            if os.path.exists(disk_file):
+                try:
+                    with open(disk_file, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    result = (data["path"], data["visited_count"], data["time_components"])
+                except (OSError, ValueError, KeyError):
+                    result = None
+                if result is not None:
+                    self.disk_hits += 1
+                    self._remember(key, result)
+                    return result
+        self.misses += 1
+        return None
+
+    def put(self, start_node, end_node, algorithm_name, heuristic, result):
+        key = (start_node, end_node, algorithm_name, heuristic, self.fingerprint())
+        self._remember(key, result)
+        if self.cache_dir:
+            os.makedirs(self._disk_dir(), exist_ok=True)
+            path, visited_count, time_components = result
+            with open(self._disk_file(key), "w", encoding="utf-8") as f:
+                json.dump({"path": path, "visited_count": visited_count, "time_components": time_components}, f)
+
+    def _remember(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def find_path(self, G, start_node, end_node, algorithm_name, heuristic="euklidesowa", *args, **kwargs):
+        """
+        routing.find_path z buforowaniem wyniku. Wynik z bufora ma w
+        time_components dodatkowy klucz 'cache_hit' = 1.
+        """
+        cached = self.get(start_node, end_node, algorithm_name, heuristic)
+        if cached is not None:
+            path, visited_count, time_components = cached
+            return list(path), visited_count, dict(time_components, cache_hit=1)
+        result = routing.find_path(G, start_node, end_node, algorithm_name, heuristic, *args, **kwargs)
+        if result[0] is not None:
+            self.put(start_node, end_node, algorithm_name, heuristic, result)
+        return result
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "size": len(self.entries)}
@@ -0,0 +1,61 @@
+"""
+Funkcje wykonywane w procesach roboczych RoutePlanner.
+
+Każdy proces podłącza się do zmapowanego w pamięci grafu (graph_store.attach_graph),
+więc kolejne procesy nie kopiują grafu. Tablice ALT i hierarchia CH zapisane
+obok pliku GraphML wczytywane są dopiero przy pierwszym zapytaniu, które ich
+potrzebuje (heurystyka "ALT", algorytm "CH"), więc proces obsługujący tylko
+pozostałe algorytmy nie trzyma ich prywatnej kopii. Brakujące pliki buduje
+jedno zadanie prepare_tables zlecane przez GUI po starcie puli.
+"""
+import time
+
+import graph_store
+import routing
+from contraction import ContractionHierarchy
+from landmarks import LandmarkTable
+
+_state = {}
+
+
+def init_worker(graph_file):
+    _state["graph_file"] = graph_file
+    _state["C"] = graph_store.attach_graph(graph_file)
+
+
+def _landmarks():
+    if "landmarks" not in _state:
+        _state["landmarks"] = LandmarkTable.load_or_build(_state["C"], _state["graph_file"])
+    return _state["landmarks"]
+
+
+def _hierarchy():
+    if "hierarchy" not in _state:
+        _state["hierarchy"] = ContractionHierarchy.load_or_build(_state["C"], _state["graph_file"])
+    return _state["hierarchy"]
+
+
+def prepare_tables():
+    """
+    Buduje brakujące (albo nieaktualne) pliki ALT i CH obok pliku grafu.
+    Zlecane raz po starcie puli, żeby budowa nie blokowała wątku GUI.
+    """
+    _landmarks()
+    _hierarchy()
+
+
+def run_algorithm(algorithm_name, heuristic, start_node, end_node, measure_memory=True):
+    """
+    Wyznacza trasę jednym algorytmem; zwraca słownik z wynikiem i pomiarami.
+    Czas mierzony jest bez tracemalloc; szczytowa pamięć (o ile measure_memory)
+    pochodzi z osobnego, drugiego przebiegu tego samego zapytania (bez pomiaru mem=None).
+    """
+    C = _state["C"]
+    landmarks = _landmarks() if heuristic == "ALT" else None
+    hierarchy = _hierarchy() if algorithm_name == "CH" else None
+    args = (C, start_node, end_node, algorithm_name, heuristic, landmarks, hierarchy)
+    start_time = time.perf_counter()
+    path, visited_count, time_components = routing.find_path(*args)
+    end_time = time.perf_counter()
+    mem = routing.measure_peak_memory(*args) if measure_memory else None
+    return {"path": path, "visited": visited_count, "time_components": time_components, "time": end_time - start_time, "mem": mem}
@@ -1,10 +1,18 @@
-import osmnx as ox
-import networkx as nx
-from math import sqrt
-from collections import deque
 import heapq
+import os
+import sys
 import time
+import tracemalloc
 from math import radians, cos, sin, asin, sqrt
+from array import array
+from csr_graph import CSRGraph
+from heuristics import make_heuristic
+
+# wspólny rdzeń wyszukiwania (src/wyszukiwanie) używany też przez graphs i Grid2D
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+import wyszukiwanie
 
 def great_circle_vec(lat1, lon1, lat2, lon2):
     """
@@ -21,6 +29,13 @@ def great_circle_vec(lat1, lon1, lat2, lon2):
 
 
 def get_heuristic_func(u, v, G, heuristic_type="euklidesowa"):
+    """
+    Heurystyka A* na grafie networkx: odległość po kole wielkim
+    ("euklidesowa", dopuszczalna) albo suma odległości wzdłuż osi razy 1.2
+    ("manhattan"). Współczynnik 1.2 sprawia, że "manhattan" przeszacowuje
+    odległość (jest niedopuszczalna): A* rozwija mniej węzłów, ale trasa
+    może być dłuższa od najkrótszej.
+    """
     u_node = G.nodes[u]
     v_node = G.nodes[v]
 
@@ -32,77 +47,307 @@ def get_heuristic_func(u, v, G, heuristic_type="euklidesowa"):
         return 1.2 * (dx + dy)
     return 0.0
 
-def find_path(G, start_node, end_node, algorithm_name, heuristic="euklidesowa"):
+# Liczniki zapisywane przez find_path w time_components obok czasów.
+COUNTER_KEYS = ["pushes", "pops", "stale_pops", "relaxations", "heuristic_evals", "peak_frontier"]
+
+def add_counters(time_components, pushes, pops, stale_pops, relaxations, heuristic_evals, peak_frontier):
+    """
+    Dopisuje liczniki wyszukiwania: wstawienia i zdjęcia z kolejki, zdjęcia
+    nieaktualnych wpisów, relaksacje krawędzi, wywołania heurystyki
+    i największy rozmiar frontu.
+    """
+    time_components.update(zip(COUNTER_KEYS, (pushes, pops, stale_pops, relaxations, heuristic_evals, peak_frontier)))
+
+def search_core(adapter, s, t, algorithm_name, h=None):
+    """
+    Jednokierunkowe A*, Dijkstra i BFS ze wspólnego rdzenia (wyszukiwanie).
+    Długości krawędzi są zmiennoprzecinkowe, więc frontem jest kopiec binarny.
+    """
+    if algorithm_name == "A*":
+        return wyszukiwanie.astar(adapter, s, t, h, wyszukiwanie.KopiecBinarny())
+    if algorithm_name == "Dijkstra":
+        return wyszukiwanie.dijkstra(adapter, s, t, wyszukiwanie.KopiecBinarny())
+    if algorithm_name == "BFS":
+        return wyszukiwanie.bfs(adapter, s, t)
+    raise ValueError("Nieznany algorytm: " + algorithm_name)
+
+def add_core_result(time_components, result):
+    """
+    Przepisuje czasy i liczniki wyniku rdzenia do time_components.
+    """
+    counters = result.liczniki
+    time_components['init_time'] += result.czasy.get("przygotowanie", 0.0)
+    time_components['loop_time'] = result.czasy.get("wyszukiwanie", 0.0)
+    add_counters(time_components, counters["wstawienia"], result.rozwiniete + counters["nieaktualne"],
+                 counters["nieaktualne"], counters["relaksacje"], counters["heurystyka"], result.szczyt_frontu)
+
+def measure_peak_memory(G, start_node, end_node, algorithm_name, heuristic="euklidesowa", landmarks=None, hierarchy=None):
+    """
+    Szczytowe zużycie pamięci (MB) jednego wywołania find_path, mierzone
+    tracemalloc w osobnym przebiegu, żeby nie zniekształcać pomiaru czasu.
+    """
+    tracemalloc.start()
+    try:
+        find_path(G, start_node, end_node, algorithm_name, heuristic, landmarks, hierarchy)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024**2)
+
+def find_path(G, start_node, end_node, algorithm_name, heuristic="euklidesowa", landmarks=None, hierarchy=None):
+    if isinstance(G, CSRGraph):
+        return find_path_csr(G, start_node, end_node, algorithm_name, heuristic, landmarks, hierarchy)
+    if heuristic == "ALT":
+        raise ValueError("Heurystyka ALT wymaga grafu CSR i tablic punktów orientacyjnych")
+
     time_components = {}
-    visited_count = 0
     path = None
-    parents = {start_node: None}
 
     t0 = time.perf_counter()
+    adapter = wyszukiwanie.AdapterNetworkx.dla(G, "length")
+    if algorithm_name == "A*":
+        def h(v):
+            return get_heuristic_func(v, end_node, G, heuristic)
+    else:
+        h = None
     t1 = time.perf_counter()
     time_components['init_time'] = t1 - t0
 
-    if algorithm_name in ["A*", "Dijkstra"]:
-        queue = [(0.0, 0.0, start_node)]
-        costs = {start_node: 0.0}
-        visited = set()
+    result = search_core(adapter, start_node, end_node, algorithm_name, h)
+    add_core_result(time_components, result)
+    if result.znaleziono:
+        path = result.sciezka
+    time_components['reconstruction_time'] = result.czasy.get("sciezka", 0.0)
 
-        t0 = time.perf_counter()
-        while queue:
-            priority, cost, u = heapq.heappop(queue)
-            if u in visited:
-                continue
-            visited.add(u)
-            visited_count += 1
+    return path, result.rozwiniete, time_components
 
-            if u == end_node:
-                break
 
-            for v, data in G.adj[u].items():
-                edge_cost = data.get("length", 1)
-                new_cost = cost + edge_cost
+BIDIRECTIONAL_ALGORITHMS = ["Bi-Dijkstra", "Bi-A*", "Bi-BFS"]
 
-                if v not in costs or new_cost < costs[v]:
-                    costs[v] = new_cost
-                    new_priority = new_cost
-                    if algorithm_name == "A*":
-                        new_priority += get_heuristic_func(v, end_node, G, heuristic)
-                    heapq.heappush(queue, (new_priority, new_cost, v))
-                    parents[v] = u
+def query_heuristic(C, s, t, heuristic="euklidesowa", landmarks=None):
+    """
+    Heurystyka h(v) szacująca odległość do celu t (indeksy CSR).
+    """
+    if heuristic == "ALT":
+        if landmarks is None:
+            raise ValueError("Heurystyka ALT wymaga tablic punktów orientacyjnych")
+        return landmarks.heuristic(s, t)
+    xs, ys = C.projected()
+    return make_heuristic(xs, ys, t, heuristic)
 
-        t1 = time.perf_counter()
-        time_components['loop_time'] = t1 - t0
+def find_path_csr(C, start_node, end_node, algorithm_name, heuristic="euklidesowa", landmarks=None, hierarchy=None):
+    """
+    Wariant find_path działający na grafie CSR (csr_graph.CSRGraph).
+    Przyjmuje i zwraca identyfikatory węzłów OSM, wynik ma tę samą postać
+    (path, visited_count, time_components).
+    Heurystyka "ALT" wymaga tablic punktów orientacyjnych (landmarks.LandmarkTable),
+    a algorytm "CH" hierarchii kontrakcji (contraction.ContractionHierarchy).
+    """
+    if algorithm_name == "CH":
+        return find_path_ch(C, start_node, end_node, hierarchy)
+    if algorithm_name in BIDIRECTIONAL_ALGORITHMS:
+        return find_path_bidirectional(C, start_node, end_node, algorithm_name, heuristic, landmarks)
 
-    elif algorithm_name == "BFS":
-        queue = deque([start_node])
-        visited = set([start_node])
+    time_components = {}
+    path = None
 
-        t0 = time.perf_counter()
-        while queue:
-            u = queue.popleft()
-            visited_count += 1
+    t0 = time.perf_counter()
+    s = C.index[start_node]
+    t = C.index[end_node]
+    h = query_heuristic(C, s, t, heuristic, landmarks) if algorithm_name == "A*" else None
+    t1 = time.perf_counter()
+    time_components['init_time'] = t1 - t0
 
-            if u == end_node:
-                break
+    result = search_core(wyszukiwanie.AdapterCSR.dla(C), s, t, algorithm_name, h)
+    add_core_result(time_components, result)
+
+    t0 = time.perf_counter()
+    if result.znaleziono:
+        node_ids = C.node_ids
+        path = [node_ids[i] for i in result.sciezka]
+    t1 = time.perf_counter()
+    time_components['reconstruction_time'] = t1 - t0 + result.czasy.get("sciezka", 0.0)
+
+    return path, result.rozwiniete, time_components
+
+
+def find_path_ch(C, start_node, end_node, hierarchy):
+    """
+    Zapytanie w hierarchii kontrakcji: dwukierunkowe wyszukiwanie w górę
+    i rozwinięcie skrótów. Poza czasami time_components zawiera statystyki
+    hierarchii (czas preprocessingu, liczba skrótów, rozmiar, przyspieszenie).
+    """
+    if hierarchy is None:
+        raise ValueError("Algorytm CH wymaga hierarchii kontrakcji")
+    time_components = {}
+    path = None
+
+    t0 = time.perf_counter()
+    s = C.index[start_node]
+    t = C.index[end_node]
+    t1 = time.perf_counter()
+    time_components['init_time'] = t1 - t0
+
+    t0 = time.perf_counter()
+    cost, meeting, forward_parents, backward_parents, visited_count = hierarchy.search(s, t, time_components)
+    t1 = time.perf_counter()
+    time_components['loop_time'] = t1 - t0
+
+    t0 = time.perf_counter()
+    if meeting is not None:
+        node_ids = C.node_ids
+        path = [node_ids[i] for i in hierarchy.unpack_path(s, t, meeting, forward_parents, backward_parents)]
+    t1 = time.perf_counter()
+    time_components['reconstruction_time'] = t1 - t0
+
+    time_components['preprocessing_time'] = hierarchy.stats.get("preprocessing_time", 0.0)
+    time_components['hierarchy_shortcuts'] = hierarchy.stats.get("shortcuts", 0)
+    time_components['hierarchy_bytes'] = hierarchy.nbytes()
+    time_components['query_speedup'] = hierarchy.stats.get("query_speedup", 0.0)
+
+    return path, visited_count, time_components
 
-            for v in G.neighbors(u):
-                if v not in visited:
-                    parents[v] = u
-                    visited.add(v)
-                    queue.append(v)
-        t1 = time.perf_counter()
-        time_components['loop_time'] = t1 - t0
+
+def find_path_bidirectional(C, start_node, end_node, algorithm_name, heuristic="euklidesowa", landmarks=None):
+    """
+    Dwukierunkowe warianty wyszukiwania na grafie CSR:
+    - "Bi-Dijkstra": stop, gdy suma minimów obu kolejek >= najlepszej znanej długości,
+    - "Bi-A*": jak wyżej, z uśrednionymi potencjałami p(v) = (h_t(v) - h_s(v)) / 2,
+    - "Bi-BFS": rozwijanie na przemian całych warstw mniejszego frontu.
+    time_components zawiera dodatkowo czasy i liczby odwiedzin w każdym kierunku.
+    """
+    time_components = {}
+    path = None
+    inf = float("inf")
+
+    t0 = time.perf_counter()
+    s = C.index[start_node]
+    t = C.index[end_node]
+    n = len(C)
+    R = C.reverse()
+    graphs = ((C.offsets, C.targets, C.weights), (R.offsets, R.targets, R.weights))
+    parents = (array("i", [-1]) * n, array("i", [-1]) * n)
+    parents[0][s] = s
+    parents[1][t] = t
+    side_time = [0.0, 0.0]
+    side_visited = [0, 0]
+    meeting = -1
+    t1 = time.perf_counter()
+    time_components['init_time'] = t1 - t0
+
+    t0 = time.perf_counter()
+    if algorithm_name == "Bi-BFS":
+        depth = (array("i", [-1]) * n, array("i", [-1]) * n)
+        depth[0][s] = 0
+        depth[1][t] = 0
+        frontiers = ([s], [t])
+        best = 0 if s == t else n + 1
+        meeting = s if s == t else -1
+        pushes, relaxations, peak_frontier = 2, 0, 2
+        while meeting == -1 and frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            ts = time.perf_counter()
+            offsets, targets, _ = graphs[side]
+            d, other, p = depth[side], depth[1 - side], parents[side]
+            next_frontier = []
+            for u in frontiers[side]:
+                side_visited[side] += 1
+                first, last = offsets[u], offsets[u + 1]
+                relaxations += last - first
+                for k in range(first, last):
+                    v = targets[k]
+                    if d[v] == -1:
+                        d[v] = d[u] + 1
+                        p[v] = u
+                        next_frontier.append(v)
+                        if other[v] != -1 and d[v] + other[v] < best:
+                            best, meeting = d[v] + other[v], v
+            pushes += len(next_frontier)
+            frontiers[side][:] = next_frontier
+            peak_frontier = max(peak_frontier, len(frontiers[0]) + len(frontiers[1]))
+            side_time[side] += time.perf_counter() - ts
+        add_counters(time_components, pushes, side_visited[0] + side_visited[1], 0, relaxations, 0, peak_frontier)
+
+    elif algorithm_name in ["Bi-Dijkstra", "Bi-A*"]:
+        use_heuristic = algorithm_name == "Bi-A*"
+        if use_heuristic:
+            h_forward = query_heuristic(C, s, t, heuristic, landmarks)
+            h_backward = query_heuristic(C, t, s, heuristic, landmarks)
+
+            def potential(v):
+                return (h_forward(v) - h_backward(v)) / 2
+        else:
+            def potential(v):
+                return 0.0
+
+        dist = (array("d", [inf]) * n, array("d", [inf]) * n)
+        dist[0][s] = 0.0
+        dist[1][t] = 0.0
+        settled = (bytearray(n), bytearray(n))
+        signs = (1.0, -1.0)
+        queues = ([(potential(s), s)], [(-potential(t), t)])
+        best = 0.0 if s == t else inf
+        meeting = s if s == t else -1
+        pushes, stale_pops, relaxations, peak_frontier = 2, 0, 0, 2
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            ts = time.perf_counter()
+            _, u = heapq.heappop(queues[side])
+            if not settled[side][u]:
+                settled[side][u] = 1
+                side_visited[side] += 1
+                offsets, targets, weights = graphs[side]
+                d, other, p = dist[side], dist[1 - side], parents[side]
+                queue, sign = queues[side], signs[side]
+                cost = d[u]
+                first, last = offsets[u], offsets[u + 1]
+                relaxations += last - first
+                for k in range(first, last):
+                    v = targets[k]
+                    new_cost = cost + weights[k]
+                    if new_cost < d[v]:
+                        d[v] = new_cost
+                        p[v] = u
+                        heapq.heappush(queue, (new_cost + sign * potential(v), v))
+                        pushes += 1
+                        if new_cost + other[v] < best:
+                            best, meeting = new_cost + other[v], v
+                if len(queues[0]) + len(queues[1]) > peak_frontier:
+                    peak_frontier = len(queues[0]) + len(queues[1])
+            else:
+                stale_pops += 1
+            side_time[side] += time.perf_counter() - ts
+        # potencjał Bi-A* to dwa wywołania heurystyki na każde wstawienie
+        heuristic_evals = 2 * pushes if use_heuristic else 0
+        add_counters(time_components, pushes, side_visited[0] + side_visited[1] + stale_pops, stale_pops, relaxations, heuristic_evals, peak_frontier)
 
     else:
         raise ValueError("Nieznany algorytm: " + algorithm_name)
+    t1 = time.perf_counter()
+    time_components['loop_time'] = t1 - t0
+    time_components['forward_time'] = side_time[0]
+    time_components['backward_time'] = side_time[1]
+    time_components['forward_visited'] = side_visited[0]
+    time_components['backward_visited'] = side_visited[1]
 
     t0 = time.perf_counter()
-    if end_node in parents:
-        path = [end_node]
-        while path[-1] != start_node:
-            path.append(parents[path[-1]])
-        path.reverse()
+    if meeting != -1:
+        node_ids = C.node_ids
+        forward = []
+        u = meeting
+        while u != s:
+            forward.append(u)
+            u = parents[0][u]
+        forward.append(s)
+        forward.reverse()
+        u = meeting
+        while u != t:
+            u = parents[1][u]
+            forward.append(u)
+        path = [node_ids[i] for i in forward]
     t1 = time.perf_counter()
     time_components['reconstruction_time'] = t1 - t0
 
-    return path, visited_count, time_components
+    return path, side_visited[0] + side_visited[1], time_components
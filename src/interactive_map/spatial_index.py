@@ -0,0 +1,182 @@
+import os
+import pickle
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from csr_graph import file_fingerprint
+from heuristics import projection_scales
+
+# Liczba kandydatów (najbliższych środków odcinków) sprawdzanych dokładnie
+# przy dopasowaniu do krawędzi.
+EDGE_CANDIDATES = 8
+
+
+def spatial_index_path(graph_file):
+    """
+    Ścieżka pliku indeksu obok pliku grafu, np. data/rzeszow.spatial.pkl.
+    """
+    return os.path.splitext(graph_file)[0] + ".spatial.pkl"
+
+
+def _segment_distances(px, py, ax, ay, bx, by):
+    """
+    Odległość punktu od odcinka AB i położenie rzutu (0..1), wektorowo.
+    """
+    dx, dy = bx - ax, by - ay
+    length2 = dx * dx + dy * dy
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = ((px - ax) * dx + (py - ay) * dy) / length2
+    t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+    qx, qy = ax + t * dx, ay + t * dy
+    return np.hypot(px - qx, py - qy), t
+
+
+class SpatialIndex:
+    """
+    Indeks przestrzenny (KD-drzewo) węzłów i opcjonalnie odcinków krawędzi,
+    w lokalnym układzie metrycznym. Zapytania przyjmują tablice współrzędnych
+    i są wektoryzowane.
+    """
+
+    def __init__(self, node_ids, kx, ky, node_tree, edges=None, edge_tree=None, half_max_length=0.0):
+        self.node_ids = node_ids
+        self.kx, self.ky = kx, ky
+        self.node_tree = node_tree
+        self.edges = edges  # tablica (m, 2) indeksów CSR końców odcinków
+        self.edge_tree = edge_tree
+        self.half_max_length = half_max_length
+        self.fingerprint = None
+
+    @classmethod
+    def build(cls, C, edges=True):
+        lats = np.frombuffer(C.lats, dtype=np.float64)
+        lons = np.frombuffer(C.lons, dtype=np.float64)
+        kx, ky = projection_scales(C.lats)
+        xy = np.column_stack((lons * kx, lats * ky))
+        node_tree = cKDTree(xy)
+        if not edges:
+            return cls(list(C.node_ids), kx, ky, node_tree)
+
+        offsets = np.frombuffer(C.offsets, dtype=np.int32)
+        targets = np.frombuffer(C.targets, dtype=np.int32)
+        sources = np.repeat(np.arange(len(C), dtype=np.int32), np.diff(offsets))
+        mask = sources < targets
+        segments = np.unique(np.column_stack((sources[mask], targets[mask])), axis=0)
+        a, b = xy[segments[:, 0]], xy[segments[:, 1]]
+        lengths = np.hypot(*(b - a).T)
+        edge_tree = cKDTree((a + b) / 2)
+        half_max_length = float(lengths.max()) / 2 if len(lengths) else 0.0
+        return cls(list(C.node_ids), kx, ky, node_tree, segments, edge_tree, half_max_length)
+
+    def project(self, lats, lons):
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        return lons * self.kx, lats * self.ky
+
+    def nearest_nodes(self, lats, lons):
+        """
+        Najbliższe węzły dla tablic współrzędnych.
+        Zwraca (indeksy CSR, odległości w metrach) jako tablice numpy.
+        """
+        x, y = self.project(lats, lons)
+        distances, indices = self.node_tree.query(np.column_stack((x, y)))
+        return indices, distances
+
+    def nearest_node(self, lat, lon):
+        """
+        Identyfikator węzła najbliższego punktowi (lat, lon).
+        """
+        indices, _ = self.nearest_nodes([lat], [lon])
+        return self.node_ids[int(indices[0])]
+
+    def nearest_edges(self, lats, lons):
+        """
+        Najbliższe odcinki drogi (prosta między węzłami krawędzi).
+        Zwraca (u, v, t, odległość): indeksy CSR końców, położenie rzutu
+        na odcinku (0 = u, 1 = v) i odległość w metrach.
+        """
+        if self.edge_tree is None:
+            raise ValueError("Indeks zbudowano bez odcinków krawędzi")
+        px, py = self.project(lats, lons)
+        points = np.column_stack((px, py))
+        chosen = np.zeros(len(points), dtype=np.int64)
+        best_t = np.zeros(len(points))
+        best_distance = np.full(len(points), np.inf)
+        pending = np.arange(len(points))
+        # Odcinek spoza kandydatów ma środek nie bliżej niż k-ty kandydat,
+        # więc wynik jest pewny, gdy best <= d_k - połowa najdłuższego odcinka.
+        for k in (EDGE_CANDIDATES, EDGE_CANDIDATES * 8):
+            k = min(k, len(self.edges))
+            if not len(pending):
+                break
+            found, t, distance, bound = self._edge_candidates(points[pending], k)
+            chosen[pending], best_t[pending], best_distance[pending] = found, t, distance
+            pending = pending[distance > bound - self.half_max_length] if k < len(self.edges) else pending[:0]
+
+        xy = self.node_tree.data
+        for i in pending:
+            nearby = np.asarray(self.edge_tree.query_ball_point(points[i], best_distance[i] + self.half_max_length))
+            if len(nearby) == 0:
+                continue
+            seg_i = self.edges[nearby]
+            a_i, b_i = xy[seg_i[:, 0]], xy[seg_i[:, 1]]
+            d_i, t_i = _segment_distances(px[i], py[i], a_i[:, 0], a_i[:, 1], b_i[:, 0], b_i[:, 1])
+            j = int(np.argmin(d_i))
+            chosen[i], best_t[i], best_distance[i] = nearby[j], t_i[j], d_i[j]
+
+        segments = self.edges[chosen]
+        return segments[:, 0], segments[:, 1], best_t, best_distance
+
+    def _edge_candidates(self, points, k):
+        """
+        Najlepszy z k odcinków o najbliższych środkach dla każdego punktu.
+        Zwraca (odcinek, t, odległość, odległość k-tego środka).
+        """
+        xy = self.node_tree.data
+        mid_distances, candidates = self.edge_tree.query(points, k=k)
+        mid_distances = mid_distances.reshape(len(points), k)
+        candidates = candidates.reshape(len(points), k)
+        seg = self.edges[candidates]
+        a, b = xy[seg[..., 0]], xy[seg[..., 1]]
+        px, py = points[:, 0:1], points[:, 1:2]
+        distances, t = _segment_distances(px, py, a[..., 0], a[..., 1], b[..., 0], b[..., 1])
+        best = np.argmin(distances, axis=1)
+        rows = np.arange(len(points))
+        return candidates[rows, best], t[rows, best], distances[rows, best], mid_distances[:, -1]
+
+    def save(self, path, fingerprint=""):
+        self.fingerprint = fingerprint
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path, C, fingerprint=None):
+        """
+        Wczytuje indeks z dysku; zwraca None, jeśli plik nie pasuje do grafu.
+        """
+        with open(path, "rb") as f:
+            index = pickle.load(f)
+        if fingerprint is not None and index.fingerprint != fingerprint:
+            return None
+        if index.node_ids != list(C.node_ids):
+            return None
+        return index
+
+    @classmethod
+    def load_or_build(cls, C, graph_file, edges=True):
+        """
+        Wczytuje indeks zapisany obok pliku grafu albo buduje go i zapisuje.
+        """
+        path = spatial_index_path(graph_file)
+        fingerprint = file_fingerprint(graph_file)
+        if os.path.exists(path):
+            try:
+                index = cls.load(path, C, fingerprint)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                index = None
+            if index is not None and (index.edge_tree is not None or not edges):
+                return index
+        index = cls.build(C, edges)
+        index.save(path, fingerprint)
+        return index
@@ -0,0 +1,28 @@
+"""
+Wspólny rdzeń wyszukiwania dla src/graphs, src/Grid2D i src/interactive_map.
+
+Algorytm (algorytmy.py) działa na adapterze grafu (adaptery.py: networkx,
+CSR, siatka), z wymiennym frontem (kolejki.py) i wymienną heurystyką
+(heurystyki.py), i zwraca Wynik (wynik.py); odleglosci liczy odległości
+jeden-do-wielu. Zgodność wyników wszystkich trzech części projektu
+sprawdza zgodnosc.py:
+    cd src && python -m wyszukiwanie.zgodnosc
+
+Poza rdzeniem zostają wyszukiwania o innej budowie: dwukierunkowe
+i zapytanie CH w interactive_map/routing.py, wyszukiwanie świadków
+w interactive_map/contraction.py, JPS, JPS+ i D* Lite w Grid2D/silnik_siatki.py
+oraz BFS ograniczony do klastra w Grid2D/hpa.py.
+"""
+from .adaptery import AdapterCSR, AdapterNetworkx, AdapterSiatki
+from .algorytmy import astar, bfs, dfs, dijkstra, odleglosci
+from .heurystyki import HEURYSTYKI, euklidesowa, manhattan, zerowa
+from .kolejki import KolejkaKubelkowa, KopiecBinarny, KopiecRadix, wybierz_kolejke
+from .wynik import OTWARTE, ZAMKNIETE, Wynik, odmierz
+
+__all__ = [
+    "AdapterCSR", "AdapterNetworkx", "AdapterSiatki",
+    "astar", "bfs", "dfs", "dijkstra", "odleglosci",
+    "HEURYSTYKI", "euklidesowa", "manhattan", "zerowa",
+    "KolejkaKubelkowa", "KopiecBinarny", "KopiecRadix", "wybierz_kolejke",
+    "OTWARTE", "ZAMKNIETE", "Wynik", "odmierz",
+]
@@ -0,0 +1,158 @@
+"""
+Adaptery grafów dla algorytmów z algorytmy.py.
+
+Adapter udostępnia:
+- sasiedzi(u) -> lista par (v, waga),
+- nastepniki(u) -> sami sąsiedzi, bez wag (BFS i DFS); obiekt z len(),
+- waga(u, v) -> waga krawędzi u-v (koszt ścieżki BFS i DFS),
+- wspolrzedne(u) -> (x, y) dla heurystyk geometrycznych z heurystyki.py,
+- maks_waga_calkowita() -> największa waga, jeśli wszystkie wagi są
+  całkowite i nieujemne, inaczej None (dobór frontu w kolejki.py).
+  Wagi sprawdzane są raz na adapter, więc adapter zakłada, że nie
+  zmieniają się po pierwszym zapytaniu (po zmianie wag trzeba utworzyć
+  nowy adapter).
+
+Wierzchołki to identyfikatory natywne dla danej reprezentacji: węzły
+networkx, indeksy 0..n-1 grafu CSR albo płaskie indeksy pól siatki.
+AdapterCSR i AdapterSiatki mają dodatkowo liczbę indeksów `n`, a algorytmy
+przechodzą dla nich na wersje tablicowe (algorytmy_csr.py, algorytmy_siatki.py).
+
+AdapterNetworkx.dla i AdapterCSR.dla zwracają adapter zapamiętany dla
+danego grafu, żeby kolejne zapytania nie sprawdzały wag od nowa.
+"""
+import weakref
+
+from .kolejki import wagi_calkowite
+
+_NIE_SPRAWDZONO = object()
+
+
+class AdapterNetworkx:
+    """
+    Graf networkx; waga krawędzi z atrybutu `atrybut` (domyślnie 1).
+    Współrzędne ze słownika `pos` albo z atrybutów węzłów 'x' i 'y'.
+    """
+
+    _adaptery = weakref.WeakKeyDictionary()
+
+    def __init__(self, graf, atrybut="weight", pos=None):
+        self.graf = graf
+        # słownik słowników sąsiedztwa bez widoków tylko do odczytu (tak jak w algorytmach networkx);
+        # graf.adj[u] tworzy przy każdym dostępie nowy AtlasView
+        self.adj = getattr(graf, "_adj", graf.adj)
+        self.atrybut = atrybut
+        self.pos = pos
+        self._maks_waga = _NIE_SPRAWDZONO
+
+    @classmethod
+    def dla(cls, graf, atrybut="weight"):
+        """
+        Adapter grafu `graf` (bez pos) wspólny dla kolejnych zapytań.
+        """
+        adaptery = cls._adaptery.setdefault(graf, {})
+        if atrybut not in adaptery:
+            adaptery[atrybut] = cls(graf, atrybut)
+        return adaptery[atrybut]
+
+    def sasiedzi(self, u):
+        atrybut = self.atrybut
+        return [(v, dane.get(atrybut, 1)) for v, dane in self.adj[u].items()]
+
+    def nastepniki(self, u):
+        return self.adj[u]
+
+    def waga(self, u, v):
+        return self.adj[u][v].get(self.atrybut, 1)
+
+    def wspolrzedne(self, u):
+        if self.pos is not None:
+            return self.pos[u]
+        wezel = self.graf.nodes[u]
+        return wezel["x"], wezel["y"]
+
+    def maks_waga_calkowita(self):
+        if self._maks_waga is _NIE_SPRAWDZONO:
+            self._maks_waga = wagi_calkowite(waga for _, _, waga in self.graf.edges(data=self.atrybut, default=1))
+        return self._maks_waga
+
+
+class AdapterCSR:
+    """
+    Graf CSR (csr_graph.CSRGraph z interactive_map albo dowolny obiekt
+    z tablicami offsets, targets, weights). Wierzchołki to indeksy;
+    współrzędne to rzut metryczny C.projected(), jeśli graf go udostępnia.
+    """
+
+    _adaptery = weakref.WeakKeyDictionary()
+
+    def __init__(self, C):
+        self.C = C
+        self.offsets = C.offsets
+        self.targets = C.targets
+        self.weights = C.weights
+        self.n = len(C.offsets) - 1
+        self._maks_waga = _NIE_SPRAWDZONO
+
+    @classmethod
+    def dla(cls, C):
+        """
+        Adapter grafu CSR `C` wspólny dla kolejnych zapytań.
+        """
+        adapter = cls._adaptery.get(C)
+        if adapter is None:
+            adapter = cls._adaptery[C] = cls(C)
+        return adapter
+
+    def sasiedzi(self, u):
+        pierwszy, ostatni = self.offsets[u], self.offsets[u + 1]
+        return list(zip(self.targets[pierwszy:ostatni], self.weights[pierwszy:ostatni]))
+
+    def nastepniki(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def waga(self, u, v):
+        pierwszy, ostatni = self.offsets[u], self.offsets[u + 1]
+        return min(w for t, w in zip(self.targets[pierwszy:ostatni], self.weights[pierwszy:ostatni]) if t == v)
+
+    def wspolrzedne(self, u):
+        xs, ys = self.C.projected()
+        return xs[u], ys[u]
+
+    def maks_waga_calkowita(self):
+        if self._maks_waga is _NIE_SPRAWDZONO:
+            self._maks_waga = wagi_calkowite(self.weights)
+        return self._maks_waga
+
+
+class AdapterSiatki:
+    """
+    Siatka z silnik_siatki (płaska mapa z ramką barier): sąsiedzi pola
+    u to wolne pola u +- 1 i u +- szerokosc, każdy ruch kosztuje 1.
+    Współrzędne to (kolumna, wiersz).
+    """
+
+    def __init__(self, siatka, wolne=0):
+        self.siatka = siatka
+        self.mapa = siatka.mapa
+        self.przesuniecia = siatka.przesuniecia
+        self.szerokosc = siatka.szerokosc
+        self.wolne = wolne
+        self.n = len(siatka.mapa)
+
+    def sasiedzi(self, u):
+        mapa, wolne = self.mapa, self.wolne
+        return [(u + d, 1) for d in self.przesuniecia if mapa[u + d] == wolne]
+
+    def nastepniki(self, u):
+        mapa, wolne = self.mapa, self.wolne
+        return [u + d for d in self.przesuniecia if mapa[u + d] == wolne]
+
+    def waga(self, u, v):
+        return 1
+
+    def wspolrzedne(self, u):
+        wiersz, kolumna = divmod(u, self.szerokosc)
+        return kolumna, wiersz
+
+    def maks_waga_calkowita(self):
+        return 1
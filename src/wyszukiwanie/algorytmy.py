@@ -0,0 +1,342 @@
+"""
+BFS, DFS, Dijkstra i A* wspólne dla grafów networkx, CSR i siatki.
+
+Każdy algorytm przyjmuje adapter (adaptery.py) i wierzchołki start, cel,
+a zwraca Wynik (wynik.py). Dijkstra i A* przyjmują dowolny front
+z interfejsem put/get/empty (kolejki.py, także queue.PriorityQueue),
+obsługiwany przez kolejki.operacje_frontu;
+A* dodatkowo funkcję h(v) zbudowaną np. fabryką z heurystyki.py.
+Nieaktualne wpisy frontu są pomijane przy zdjęciu (leniwe usuwanie)
+zamiast zmniejszania klucza.
+
+Ogólne wersje z tego pliku trzymają koszty i poprzedników w słownikach,
+więc wierzchołkiem może być dowolna wartość haszowalna. Dla AdapterCSR
+i AdapterSiatki algorytmy przechodzą na wersje tablicowe
+z algorytmy_csr.py i algorytmy_siatki.py, a dla AdapterNetworkx na wersje
+z algorytmy_networkx.py czytające wprost graf.adj (ten sam wynik, bez
+wywołania sasiedzi(u) na każdy wierzchołek).
+
+Obserwator dostaje (OTWARTE, v) przy pierwszym odwiedzeniu v
+i (ZAMKNIETE, u) po rozwinięciu u (cel nie jest rozwijany).
+"""
+import heapq
+import time
+from collections import deque
+
+from . import algorytmy_csr, algorytmy_networkx, algorytmy_siatki
+from .adaptery import AdapterCSR, AdapterNetworkx, AdapterSiatki
+from .kolejki import KopiecBinarny, operacje_frontu, wybierz_kolejke
+from .wynik import OTWARTE, ZAMKNIETE, Wynik, odmierz
+
+NIESKONCZONOSC = float("inf")
+
+
+def _wynik(adapter, skad, koszt, start, cel, rozwiniete, szczyt_frontu, czasy, znacznik, liczniki):
+    """
+    Wynik z drzewa poprzedników. BFS i DFS nie śledzą kosztów (koszt=None),
+    więc ich koszt to suma wag krawędzi znalezionej ścieżki.
+    """
+    znacznik = odmierz(czasy, "wyszukiwanie", znacznik)
+    if cel not in skad:
+        return Wynik(False, [], 0, rozwiniete, len(skad), szczyt_frontu, czasy, liczniki, skad)
+    sciezka = [cel]
+    while sciezka[-1] != start:
+        sciezka.append(skad[sciezka[-1]])
+    sciezka.reverse()
+    if koszt is None:
+        waga = adapter.waga
+        koszt_celu = sum(waga(u, v) for u, v in zip(sciezka, sciezka[1:]))
+    else:
+        koszt_celu = koszt[cel]
+    odmierz(czasy, "sciezka", znacznik)
+    return Wynik(True, sciezka, koszt_celu, rozwiniete, len(skad), szczyt_frontu, czasy, liczniki, skad)
+
+
+def bfs(adapter, start, cel, obserwator=None):
+    """
+    BFS po liczbie krawędzi; koszt wyniku to suma wag znalezionej ścieżki.
+    """
+    if isinstance(adapter, AdapterCSR):
+        return algorytmy_csr.bfs(adapter, start, cel, obserwator)
+    if isinstance(adapter, AdapterSiatki):
+        return algorytmy_siatki.bfs(adapter, start, cel, obserwator)
+    if isinstance(adapter, AdapterNetworkx):
+        return algorytmy_networkx.bfs(adapter, start, cel, obserwator)
+    czasy = {}
+    znacznik = time.perf_counter()
+    nastepniki = adapter.nastepniki
+    skad = {start: start}
+    kolejka = deque([start])
+    rozwiniete = 0
+    relaksacje = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while kolejka:
+        u = kolejka.popleft()
+        rozwiniete += 1
+        if u == cel:
+            break
+        lista = nastepniki(u)
+        relaksacje += len(lista)
+        for v in lista:
+            if v not in skad:
+                skad[v] = u
+                kolejka.append(v)
+                if obserwator is not None:
+                    obserwator(OTWARTE, v)
+        if len(kolejka) > szczyt_frontu:
+            szczyt_frontu = len(kolejka)
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": len(skad), "nieaktualne": 0, "relaksacje": relaksacje, "heurystyka": 0}
+    return _wynik(adapter, skad, None, start, cel, rozwiniete, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def dfs(adapter, start, cel, obserwator=None):
+    """
+    DFS ze stosem: wierzchołek oznaczany jest przy wstawieniu, a jego
+    poprzednik już się nie zmienia (ścieżka zwykle nie jest najkrótsza).
+    Na siatce (AdapterSiatki) jest to DFS z algorytmy_siatki.py, który
+    idzie w głąb po jednym sąsiedzie.
+    """
+    if isinstance(adapter, AdapterSiatki):
+        return algorytmy_siatki.dfs(adapter, start, cel, obserwator)
+    czasy = {}
+    znacznik = time.perf_counter()
+    nastepniki = adapter.nastepniki
+    skad = {start: start}
+    stos = [start]
+    rozwiniete = 0
+    relaksacje = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while stos:
+        u = stos.pop()
+        rozwiniete += 1
+        if u == cel:
+            break
+        lista = nastepniki(u)
+        relaksacje += len(lista)
+        for v in lista:
+            if v not in skad:
+                skad[v] = u
+                stos.append(v)
+                if obserwator is not None:
+                    obserwator(OTWARTE, v)
+        if len(stos) > szczyt_frontu:
+            szczyt_frontu = len(stos)
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": len(skad), "nieaktualne": 0, "relaksacje": relaksacje, "heurystyka": 0}
+    return _wynik(adapter, skad, None, start, cel, rozwiniete, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def dijkstra(adapter, start, cel, kolejka=None, obserwator=None):
+    """
+    Dijkstra; bez podanego frontu dobiera go wybierz_kolejke (kolejka
+    kubełkowa albo kopiec radix przy wagach całkowitych). Na siatce bez
+    podanego frontu przeszukiwanie idzie warstwami (algorytmy_siatki.py).
+    """
+    if isinstance(adapter, AdapterSiatki) and kolejka is None:
+        return algorytmy_siatki.dijkstra(adapter, start, cel, obserwator)
+    if kolejka is None:
+        kolejka = wybierz_kolejke(adapter)
+    if isinstance(adapter, AdapterCSR):
+        return algorytmy_csr.dijkstra(adapter, start, cel, kolejka, obserwator)
+    if isinstance(adapter, AdapterNetworkx):
+        return algorytmy_networkx.dijkstra(adapter, start, cel, kolejka, obserwator)
+    czasy = {}
+    znacznik = time.perf_counter()
+    front, wstaw, zdejmij = operacje_frontu(kolejka)
+    sasiedzi = adapter.sasiedzi
+    skad = {start: start}
+    koszt = {start: 0}
+    wstaw(front, (0, start))
+    rozwiniete = 0
+    wstawienia = 1
+    nieaktualne = 0
+    relaksacje = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while front:
+        g, u = zdejmij(front)
+        if g > koszt[u]:
+            nieaktualne += 1
+            continue
+        rozwiniete += 1
+        if u == cel:
+            break
+        lista = sasiedzi(u)
+        relaksacje += len(lista)
+        for v, waga in lista:
+            nowy_koszt = g + waga
+            if nowy_koszt < koszt.get(v, NIESKONCZONOSC):
+                if obserwator is not None and v not in koszt:
+                    obserwator(OTWARTE, v)
+                koszt[v] = nowy_koszt
+                skad[v] = u
+                wstaw(front, (nowy_koszt, v))
+                wstawienia += 1
+        # rozmiar frontu = wstawienia - zdjęcia (razem z nieaktualnymi wpisami)
+        if wstawienia - rozwiniete - nieaktualne > szczyt_frontu:
+            szczyt_frontu = wstawienia - rozwiniete - nieaktualne
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": wstawienia, "nieaktualne": nieaktualne, "relaksacje": relaksacje, "heurystyka": 0}
+    return _wynik(adapter, skad, koszt, start, cel, rozwiniete, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def astar(adapter, start, cel, h, kolejka=None, obserwator=None, ponowne_otwieranie=False):
+    """
+    A* z funkcją h(v) i zbiorem zamkniętych. Remisy f rozstrzygane są na
+    korzyść wierzchołków bliższych celowi (mniejsze h). Domyślny front
+    to KopiecBinarny.
+
+    Domyślnie wierzchołek rozwijany jest co najwyżej raz, a krawędzie do
+    zamkniętych są pomijane - przy spójnej heurystyce to zwykłe A*. Przy
+    ponowne_otwieranie=True zamknięty wierzchołek, do którego znaleziono
+    krótszą drogę, wraca do frontu i jest rozwijany jeszcze raz (liczniki
+    "ponowne_otwarcia", a rozwiniete liczy każde rozwinięcie); wtedy
+    dopuszczalna, choć niespójna heurystyka też daje najkrótszą trasę.
+    Niedopuszczalna heurystyka w żadnym trybie nie gwarantuje optimum,
+    bo wyszukiwanie kończy się po zdjęciu celu.
+    """
+    if kolejka is None:
+        kolejka = KopiecBinarny()
+    if isinstance(adapter, AdapterCSR):
+        return algorytmy_csr.astar(adapter, start, cel, h, kolejka, obserwator, ponowne_otwieranie)
+    if isinstance(adapter, AdapterSiatki):
+        return algorytmy_siatki.astar(adapter, start, cel, h, kolejka, obserwator, ponowne_otwieranie)
+    if isinstance(adapter, AdapterNetworkx):
+        return algorytmy_networkx.astar(adapter, start, cel, h, kolejka, obserwator, ponowne_otwieranie)
+    czasy = {}
+    znacznik = time.perf_counter()
+    front, wstaw, zdejmij = operacje_frontu(kolejka)
+    sasiedzi = adapter.sasiedzi
+    skad = {start: start}
+    koszt = {start: 0}
+    zamkniete = set()
+    hs = h(start)
+    wstaw(front, (hs, hs, start))
+    rozwiniete = 0
+    wstawienia = 1
+    nieaktualne = 0
+    relaksacje = 0
+    ponowne_otwarcia = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    # wpis (f, h, v): wpisy tego samego v różnią się tylko g, więc pierwszy zdjęty
+    # ma najmniejszy koszt, a późniejsze są nieaktualne; koszt bierzemy ze słownika
+    while front:
+        _, _, u = zdejmij(front)
+        if u in zamkniete:
+            nieaktualne += 1
+            continue
+        zamkniete.add(u)
+        rozwiniete += 1
+        if u == cel:
+            break
+        g = koszt[u]
+        lista = sasiedzi(u)
+        relaksacje += len(lista)
+        for v, waga in lista:
+            if v in zamkniete:
+                if not ponowne_otwieranie:
+                    continue
+                nowy_koszt = g + waga
+                if nowy_koszt >= koszt[v]:
+                    continue
+                zamkniete.discard(v)
+                ponowne_otwarcia += 1
+            else:
+                nowy_koszt = g + waga
+                if nowy_koszt >= koszt.get(v, NIESKONCZONOSC):
+                    continue
+                if obserwator is not None and v not in koszt:
+                    obserwator(OTWARTE, v)
+            koszt[v] = nowy_koszt
+            skad[v] = u
+            hv = h(v)
+            wstaw(front, (nowy_koszt + hv, hv, v))
+            wstawienia += 1
+        # rozmiar frontu = wstawienia - zdjęcia (razem z nieaktualnymi wpisami)
+        if wstawienia - rozwiniete - nieaktualne > szczyt_frontu:
+            szczyt_frontu = wstawienia - rozwiniete - nieaktualne
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": wstawienia, "nieaktualne": nieaktualne, "relaksacje": relaksacje,
+                "heurystyka": wstawienia, "ponowne_otwarcia": ponowne_otwarcia}
+    return _wynik(adapter, skad, koszt, start, cel, rozwiniete, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def odleglosci(adapter, start, cele=None, poprzednicy=False):
+    """
+    Odległości ze `start` do wszystkich osiągalnych wierzchołków (Dijkstra
+    jeden-do-wielu); przy podanych `cele` wyszukiwanie kończy się po
+    ustaleniu odległości każdego z nich. Przy wagach równych 1
+    (maks_waga_calkowita() == 1) przeszukiwanie idzie warstwami jak BFS.
+
+    Zwraca (odleglosc, skad); skad jest None, jeśli poprzednicy=False.
+    Dla AdapterCSR to tablice array('d') i array('i') indeksowane
+    wierzchołkiem (inf i -1 dla nieosiągniętych), dla innych adapterów
+    słowniki z samymi osiągniętymi wierzchołkami. Odległości wierzchołków
+    spoza `cele` mogą nie być ostateczne, jeśli wyszukiwanie skończyło się
+    wcześniej.
+    """
+    if isinstance(adapter, AdapterCSR):
+        return algorytmy_csr.odleglosci(adapter, start, cele, poprzednicy)
+    odleglosc = {start: 0}
+    skad = {start: start} if poprzednicy else None
+    pozostale = set(cele) if cele is not None else None
+    if pozostale is not None:
+        pozostale.discard(start)
+
+    if adapter.maks_waga_calkowita() == 1:
+        nastepniki = adapter.nastepniki
+        warstwa = [start]
+        d = 0
+        while warstwa and (pozostale is None or pozostale):
+            d += 1
+            nastepna = []
+            for u in warstwa:
+                for v in nastepniki(u):
+                    if v not in odleglosc:
+                        odleglosc[v] = d
+                        if skad is not None:
+                            skad[v] = u
+                        nastepna.append(v)
+                        if pozostale is not None:
+                            pozostale.discard(v)
+            warstwa = nastepna
+        return odleglosc, skad
+
+    if isinstance(adapter, AdapterNetworkx):
+        return algorytmy_networkx.odleglosci(adapter, start, cele, poprzednicy)
+    sasiedzi = adapter.sasiedzi
+    zamkniete = set()
+    kolejka = [(0, start)]
+    if pozostale is not None:
+        pozostale.add(start)
+    while kolejka and (pozostale is None or pozostale):
+        g, u = heapq.heappop(kolejka)
+        if u in zamkniete:
+            continue
+        zamkniete.add(u)
+        if pozostale is not None:
+            pozostale.discard(u)
+        for v, waga in sasiedzi(u):
+            nowy_koszt = g + waga
+            if nowy_koszt < odleglosc.get(v, NIESKONCZONOSC):
+                odleglosc[v] = nowy_koszt
+                if skad is not None:
+                    skad[v] = u
+                heapq.heappush(kolejka, (nowy_koszt, v))
+    return odleglosc, skad
@@ -0,0 +1,225 @@
+"""
+Wersje algorytmów z algorytmy.py dla AdapterCSR.
+
+Wierzchołki to indeksy 0..n-1, więc koszty, poprzednicy i znaczniki
+odwiedzin trzymane są w tablicach (array, bytearray) zamiast słowników,
+a sąsiedzi czytani są wprost z buforów offsets, targets, weights grafu.
+Wynik ma tę samą postać co w algorytmy.py; Wynik.drzewo to array('i')
+poprzedników z -1 dla nieodwiedzonych wierzchołków.
+
+Funkcje wywoływane są przez algorytmy.py, nie bezpośrednio.
+"""
+import heapq
+import time
+from array import array
+
+from .kolejki import operacje_frontu
+from .wynik import OTWARTE, ZAMKNIETE, Wynik, odmierz
+
+NIESKONCZONOSC = float("inf")
+
+
+def _wynik(adapter, skad, koszt_celu, start, cel, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik, liczniki):
+    """
+    Wynik z tablicy poprzedników; koszt_celu=None oznacza koszt liczony
+    z wag krawędzi ścieżki (BFS).
+    """
+    znacznik = odmierz(czasy, "wyszukiwanie", znacznik)
+    if skad[cel] == -1:
+        return Wynik(False, [], 0, rozwiniete, odwiedzone, szczyt_frontu, czasy, liczniki, skad)
+    sciezka = [cel]
+    while sciezka[-1] != start:
+        sciezka.append(skad[sciezka[-1]])
+    sciezka.reverse()
+    if koszt_celu is None:
+        waga = adapter.waga
+        koszt_celu = sum(waga(u, v) for u, v in zip(sciezka, sciezka[1:]))
+    odmierz(czasy, "sciezka", znacznik)
+    return Wynik(True, sciezka, koszt_celu, rozwiniete, odwiedzone, szczyt_frontu, czasy, liczniki, skad)
+
+
+def bfs(adapter, start, cel, obserwator=None):
+    """
+    BFS z frontem w liście zaalokowanej od razu na n wierzchołków
+    (wskaźniki głowy i ogona zamiast deque; każdy wierzchołek trafia do
+    frontu najwyżej raz) i znacznikami odwiedzin w bytearray. Lista, a nie
+    array('i'), bo odczyt z niej nie tworzy nowego obiektu int.
+    """
+    czasy = {}
+    znacznik = time.perf_counter()
+    offsets, targets, n = adapter.offsets, adapter.targets, adapter.n
+    skad = array("i", [-1]) * n
+    odwiedzone = bytearray(n)
+    kolejka = [start] * n
+    skad[start] = start
+    odwiedzone[start] = 1
+    glowa, ogon = 0, 1
+    relaksacje = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while glowa < ogon:
+        u = kolejka[glowa]
+        glowa += 1
+        if u == cel:
+            break
+        pierwszy, ostatni = offsets[u], offsets[u + 1]
+        relaksacje += ostatni - pierwszy
+        for v in targets[pierwszy:ostatni]:
+            if not odwiedzone[v]:
+                odwiedzone[v] = 1
+                skad[v] = u
+                kolejka[ogon] = v
+                ogon += 1
+                if obserwator is not None:
+                    obserwator(OTWARTE, v)
+        if ogon - glowa > szczyt_frontu:
+            szczyt_frontu = ogon - glowa
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": ogon, "nieaktualne": 0, "relaksacje": relaksacje, "heurystyka": 0}
+    return _wynik(adapter, skad, None, start, cel, glowa, ogon, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def dijkstra(adapter, start, cel, kolejka, obserwator=None):
+    czasy = {}
+    znacznik = time.perf_counter()
+    offsets, targets, weights, n = adapter.offsets, adapter.targets, adapter.weights, adapter.n
+    front, wstaw, zdejmij = operacje_frontu(kolejka)
+    koszt = array("d", [NIESKONCZONOSC]) * n
+    skad = array("i", [-1]) * n
+    zamkniete = bytearray(n)
+    koszt[start] = 0.0
+    skad[start] = start
+    wstaw(front, (0, start))
+    rozwiniete = 0
+    odwiedzone = 1
+    wstawienia = 1
+    nieaktualne = 0
+    relaksacje = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while front:
+        g, u = zdejmij(front)
+        if zamkniete[u]:
+            nieaktualne += 1
+            continue
+        zamkniete[u] = 1
+        rozwiniete += 1
+        if u == cel:
+            break
+        pierwszy, ostatni = offsets[u], offsets[u + 1]
+        relaksacje += ostatni - pierwszy
+        for k in range(pierwszy, ostatni):
+            v = targets[k]
+            nowy_koszt = g + weights[k]
+            if nowy_koszt < koszt[v]:
+                if koszt[v] == NIESKONCZONOSC:
+                    odwiedzone += 1
+                    if obserwator is not None:
+                        obserwator(OTWARTE, v)
+                koszt[v] = nowy_koszt
+                skad[v] = u
+                wstaw(front, (nowy_koszt, v))
+                wstawienia += 1
+        if wstawienia - rozwiniete - nieaktualne > szczyt_frontu:
+            szczyt_frontu = wstawienia - rozwiniete - nieaktualne
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": wstawienia, "nieaktualne": nieaktualne, "relaksacje": relaksacje, "heurystyka": 0}
+    return _wynik(adapter, skad, koszt[cel], start, cel, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik,
+                  liczniki)
+
+
+def astar(adapter, start, cel, h, kolejka, obserwator=None, ponowne_otwieranie=False):
+    czasy = {}
+    znacznik = time.perf_counter()
+    offsets, targets, weights, n = adapter.offsets, adapter.targets, adapter.weights, adapter.n
+    front, wstaw, zdejmij = operacje_frontu(kolejka)
+    koszt = array("d", [NIESKONCZONOSC]) * n
+    skad = array("i", [-1]) * n
+    zamkniete = bytearray(n)
+    koszt[start] = 0.0
+    skad[start] = start
+    hs = h(start)
+    wstaw(front, (hs, hs, start))
+    rozwiniete = 0
+    odwiedzone = 1
+    wstawienia = 1
+    nieaktualne = 0
+    relaksacje = 0
+    ponowne_otwarcia = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while front:
+        _, _, u = zdejmij(front)
+        if zamkniete[u]:
+            nieaktualne += 1
+            continue
+        zamkniete[u] = 1
+        rozwiniete += 1
+        if u == cel:
+            break
+        g = koszt[u]
+        pierwszy, ostatni = offsets[u], offsets[u + 1]
+        relaksacje += ostatni - pierwszy
+        for k in range(pierwszy, ostatni):
+            v = targets[k]
+            nowy_koszt = g + weights[k]
+            if nowy_koszt < koszt[v]:
+                if zamkniete[v]:
+                    # przy spójnej heurystyce zamknięty wierzchołek nie ma krótszej drogi
+                    if not ponowne_otwieranie:
+                        continue
+                    zamkniete[v] = 0
+                    ponowne_otwarcia += 1
+                elif koszt[v] == NIESKONCZONOSC:
+                    odwiedzone += 1
+                    if obserwator is not None:
+                        obserwator(OTWARTE, v)
+                koszt[v] = nowy_koszt
+                skad[v] = u
+                hv = h(v)
+                wstaw(front, (nowy_koszt + hv, hv, v))
+                wstawienia += 1
+        if wstawienia - rozwiniete - nieaktualne > szczyt_frontu:
+            szczyt_frontu = wstawienia - rozwiniete - nieaktualne
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": wstawienia, "nieaktualne": nieaktualne, "relaksacje": relaksacje,
+                "heurystyka": wstawienia, "ponowne_otwarcia": ponowne_otwarcia}
+    return _wynik(adapter, skad, koszt[cel], start, cel, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik,
+                  liczniki)
+
+
+def odleglosci(adapter, start, cele=None, poprzednicy=False):
+    offsets, targets, weights, n = adapter.offsets, adapter.targets, adapter.weights, adapter.n
+    odleglosc = array("d", [NIESKONCZONOSC]) * n
+    skad = array("i", [-1]) * n if poprzednicy else None
+    odleglosc[start] = 0.0
+    if skad is not None:
+        skad[start] = start
+    pozostale = set(cele) if cele is not None else None
+    kolejka = [(0.0, start)]
+    while kolejka:
+        g, u = heapq.heappop(kolejka)
+        if g > odleglosc[u]:
+            continue
+        if pozostale is not None:
+            pozostale.discard(u)
+            if not pozostale:
+                break
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            nowy_koszt = g + weights[k]
+            if nowy_koszt < odleglosc[v]:
+                odleglosc[v] = nowy_koszt
+                if skad is not None:
+                    skad[v] = u
+                heapq.heappush(kolejka, (nowy_koszt, v))
+    return odleglosc, skad
@@ -0,0 +1,203 @@
+"""
+Wersje algorytmów z algorytmy.py dla AdapterNetworkx.
+
+Sąsiedzi czytani są wprost ze słownika graf.adj, a waga krawędzi
+z atrybutu adaptera (dane.get(atrybut, 1)) w pętli relaksacji, bez
+budowania listy par przez sasiedzi(u) dla każdego rozwijanego węzła.
+Koszty i poprzednicy zostają w słownikach (węzły networkx są dowolnymi
+wartościami haszowalnymi), więc wynik ma dokładnie tę samą postać co
+w ogólnych wersjach z algorytmy.py.
+
+Funkcje wywoływane są przez algorytmy.py, nie bezpośrednio.
+"""
+import heapq
+import time
+from collections import deque
+
+from .kolejki import operacje_frontu
+from .wynik import OTWARTE, ZAMKNIETE, Wynik, odmierz
+
+NIESKONCZONOSC = float("inf")
+
+
+def _wynik(adapter, skad, koszt, start, cel, rozwiniete, szczyt_frontu, czasy, znacznik, liczniki):
+    """
+    Wynik z drzewa poprzedników; koszt=None oznacza koszt liczony z wag
+    krawędzi ścieżki (BFS).
+    """
+    znacznik = odmierz(czasy, "wyszukiwanie", znacznik)
+    if cel not in skad:
+        return Wynik(False, [], 0, rozwiniete, len(skad), szczyt_frontu, czasy, liczniki, skad)
+    sciezka = [cel]
+    while sciezka[-1] != start:
+        sciezka.append(skad[sciezka[-1]])
+    sciezka.reverse()
+    if koszt is None:
+        waga = adapter.waga
+        koszt_celu = sum(waga(u, v) for u, v in zip(sciezka, sciezka[1:]))
+    else:
+        koszt_celu = koszt[cel]
+    odmierz(czasy, "sciezka", znacznik)
+    return Wynik(True, sciezka, koszt_celu, rozwiniete, len(skad), szczyt_frontu, czasy, liczniki, skad)
+
+
+def bfs(adapter, start, cel, obserwator=None):
+    czasy = {}
+    znacznik = time.perf_counter()
+    adj = adapter.adj
+    skad = {start: start}
+    kolejka = deque([start])
+    rozwiniete = 0
+    relaksacje = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while kolejka:
+        u = kolejka.popleft()
+        rozwiniete += 1
+        if u == cel:
+            break
+        sasiedzi = adj[u]
+        relaksacje += len(sasiedzi)
+        for v in sasiedzi:
+            if v not in skad:
+                skad[v] = u
+                kolejka.append(v)
+                if obserwator is not None:
+                    obserwator(OTWARTE, v)
+        if len(kolejka) > szczyt_frontu:
+            szczyt_frontu = len(kolejka)
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": len(skad), "nieaktualne": 0, "relaksacje": relaksacje, "heurystyka": 0}
+    return _wynik(adapter, skad, None, start, cel, rozwiniete, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def dijkstra(adapter, start, cel, kolejka, obserwator=None):
+    czasy = {}
+    znacznik = time.perf_counter()
+    adj, atrybut = adapter.adj, adapter.atrybut
+    front, wstaw, zdejmij = operacje_frontu(kolejka)
+    skad = {start: start}
+    koszt = {start: 0}
+    wstaw(front, (0, start))
+    rozwiniete = 0
+    wstawienia = 1
+    nieaktualne = 0
+    relaksacje = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while front:
+        g, u = zdejmij(front)
+        if g > koszt[u]:
+            nieaktualne += 1
+            continue
+        rozwiniete += 1
+        if u == cel:
+            break
+        sasiedzi = adj[u]
+        relaksacje += len(sasiedzi)
+        for v, dane in sasiedzi.items():
+            nowy_koszt = g + dane.get(atrybut, 1)
+            if nowy_koszt < koszt.get(v, NIESKONCZONOSC):
+                if obserwator is not None and v not in koszt:
+                    obserwator(OTWARTE, v)
+                koszt[v] = nowy_koszt
+                skad[v] = u
+                wstaw(front, (nowy_koszt, v))
+                wstawienia += 1
+        if wstawienia - rozwiniete - nieaktualne > szczyt_frontu:
+            szczyt_frontu = wstawienia - rozwiniete - nieaktualne
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": wstawienia, "nieaktualne": nieaktualne, "relaksacje": relaksacje, "heurystyka": 0}
+    return _wynik(adapter, skad, koszt, start, cel, rozwiniete, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def astar(adapter, start, cel, h, kolejka, obserwator=None, ponowne_otwieranie=False):
+    czasy = {}
+    znacznik = time.perf_counter()
+    adj, atrybut = adapter.adj, adapter.atrybut
+    front, wstaw, zdejmij = operacje_frontu(kolejka)
+    skad = {start: start}
+    koszt = {start: 0}
+    zamkniete = set()
+    hs = h(start)
+    wstaw(front, (hs, hs, start))
+    rozwiniete = 0
+    wstawienia = 1
+    nieaktualne = 0
+    relaksacje = 0
+    ponowne_otwarcia = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while front:
+        _, _, u = zdejmij(front)
+        if u in zamkniete:
+            nieaktualne += 1
+            continue
+        zamkniete.add(u)
+        rozwiniete += 1
+        if u == cel:
+            break
+        g = koszt[u]
+        sasiedzi = adj[u]
+        relaksacje += len(sasiedzi)
+        for v, dane in sasiedzi.items():
+            if v in zamkniete:
+                if not ponowne_otwieranie:
+                    continue
+                nowy_koszt = g + dane.get(atrybut, 1)
+                if nowy_koszt >= koszt[v]:
+                    continue
+                zamkniete.discard(v)
+                ponowne_otwarcia += 1
+            else:
+                nowy_koszt = g + dane.get(atrybut, 1)
+                if nowy_koszt >= koszt.get(v, NIESKONCZONOSC):
+                    continue
+                if obserwator is not None and v not in koszt:
+                    obserwator(OTWARTE, v)
+            koszt[v] = nowy_koszt
+            skad[v] = u
+            hv = h(v)
+            wstaw(front, (nowy_koszt + hv, hv, v))
+            wstawienia += 1
+        if wstawienia - rozwiniete - nieaktualne > szczyt_frontu:
+            szczyt_frontu = wstawienia - rozwiniete - nieaktualne
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": wstawienia, "nieaktualne": nieaktualne, "relaksacje": relaksacje,
+                "heurystyka": wstawienia, "ponowne_otwarcia": ponowne_otwarcia}
+    return _wynik(adapter, skad, koszt, start, cel, rozwiniete, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def odleglosci(adapter, start, cele=None, poprzednicy=False):
+    adj, atrybut = adapter.adj, adapter.atrybut
+    odleglosc = {start: 0}
+    skad = {start: start} if poprzednicy else None
+    pozostale = set(cele) if cele is not None else None
+    zamkniete = set()
+    kolejka = [(0, start)]
+    while kolejka:
+        g, u = heapq.heappop(kolejka)
+        if u in zamkniete:
+            continue
+        zamkniete.add(u)
+        if pozostale is not None:
+            pozostale.discard(u)
+            if not pozostale:
+                break
+        for v, dane in adj[u].items():
+            nowy_koszt = g + dane.get(atrybut, 1)
+            if nowy_koszt < odleglosc.get(v, NIESKONCZONOSC):
+                odleglosc[v] = nowy_koszt
+                if skad is not None:
+                    skad[v] = u
+                heapq.heappush(kolejka, (nowy_koszt, v))
+    return odleglosc, skad
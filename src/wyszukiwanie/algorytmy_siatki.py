@@ -0,0 +1,225 @@
+"""
+Wersje algorytmów z algorytmy.py dla AdapterSiatki.
+
+Pola adresowane są płaskim indeksem mapy z ramką barier, więc sąsiedzi
+pola u to u + d dla d z przesuniecia, bez sprawdzania granic, a koszty
+i poprzednicy trzymane są w tablicach array('i') o długości mapy.
+Każdy ruch kosztuje 1, co wykorzystują BFS i Dijkstra (warstwami).
+Wynik ma tę samą postać co w algorytmy.py; ścieżka to płaskie indeksy,
+a Wynik.drzewo to array('i') poprzedników z -1 dla nieodwiedzonych pól.
+
+Funkcje wywoływane są przez algorytmy.py, nie bezpośrednio.
+"""
+import time
+from array import array
+from collections import deque
+
+from .kolejki import operacje_frontu
+from .wynik import OTWARTE, ZAMKNIETE, Wynik, odmierz
+
+
+def _przygotuj(adapter, start):
+    skad = array("i", [-1]) * adapter.n
+    skad[start] = start
+    return adapter.mapa, adapter.przesuniecia, adapter.wolne, skad
+
+
+def _wynik(skad, start, cel, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik, liczniki):
+    """
+    Wynik z tablicy poprzedników; koszt to liczba ruchów.
+    """
+    znacznik = odmierz(czasy, "wyszukiwanie", znacznik)
+    if skad[cel] == -1:
+        return Wynik(False, [], 0, rozwiniete, odwiedzone, szczyt_frontu, czasy, liczniki, skad)
+    sciezka = [cel]
+    while sciezka[-1] != start:
+        sciezka.append(skad[sciezka[-1]])
+    sciezka.reverse()
+    odmierz(czasy, "sciezka", znacznik)
+    return Wynik(True, sciezka, len(sciezka) - 1, rozwiniete, odwiedzone, szczyt_frontu, czasy, liczniki, skad)
+
+
+def bfs(adapter, start, cel, obserwator=None):
+    czasy = {}
+    znacznik = time.perf_counter()
+    mapa, przesuniecia, wolne, skad = _przygotuj(adapter, start)
+    kolejka = deque([start])
+    rozwiniete = 0
+    odwiedzone = 1
+    relaksacje = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while kolejka:
+        u = kolejka.popleft()
+        rozwiniete += 1
+        if u == cel:
+            break
+        for d in przesuniecia:
+            v = u + d
+            if mapa[v] == wolne:
+                relaksacje += 1
+                if skad[v] == -1:
+                    skad[v] = u
+                    kolejka.append(v)
+                    odwiedzone += 1
+                    if obserwator is not None:
+                        obserwator(OTWARTE, v)
+        if len(kolejka) > szczyt_frontu:
+            szczyt_frontu = len(kolejka)
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": odwiedzone, "nieaktualne": 0, "relaksacje": relaksacje, "heurystyka": 0}
+    return _wynik(skad, start, cel, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def dijkstra(adapter, start, cel, obserwator=None):
+    """
+    Dijkstra z kolejką kubełkową (Diala): przy jednostkowym koszcie ruchu
+    aktywne są tylko kubełki g i g + 1, a pierwsze odwiedzenie pola
+    wyznacza już jego ostateczny koszt.
+    """
+    czasy = {}
+    znacznik = time.perf_counter()
+    mapa, przesuniecia, wolne, skad = _przygotuj(adapter, start)
+    kubelek = [start]
+    rozwiniete = 0
+    odwiedzone = 1
+    relaksacje = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while kubelek:
+        nastepny = []
+        for u in kubelek:
+            if u == cel:
+                rozwiniete += 1
+                liczniki = {"wstawienia": odwiedzone, "nieaktualne": 0, "relaksacje": relaksacje, "heurystyka": 0}
+                return _wynik(skad, start, cel, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik, liczniki)
+            for d in przesuniecia:
+                v = u + d
+                if mapa[v] == wolne:
+                    relaksacje += 1
+                    if skad[v] == -1:
+                        skad[v] = u
+                        nastepny.append(v)
+                        odwiedzone += 1
+                        if obserwator is not None:
+                            obserwator(OTWARTE, v)
+            rozwiniete += 1
+            if obserwator is not None:
+                obserwator(ZAMKNIETE, u)
+        # po zamknięciu warstwy g cały front to warstwa g + 1
+        szczyt_frontu = max(szczyt_frontu, len(nastepny))
+        kubelek = nastepny
+
+    liczniki = {"wstawienia": odwiedzone, "nieaktualne": 0, "relaksacje": relaksacje, "heurystyka": 0}
+    return _wynik(skad, start, cel, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def dfs(adapter, start, cel, obserwator=None):
+    """
+    DFS z jawnym stosem zamiast rekurencji, więc głębokość nie zależy od
+    limitu rekurencji Pythona. Sąsiedzi sprawdzani są w kolejności przesunięć
+    i na stos trafia tylko pierwszy nieodwiedzony; pole, z którego nie ma już
+    dokąd pójść, zdejmowane jest ze stosu i zgłaszane jako ZAMKNIETE.
+    Ścieżka zwykle nie jest najkrótsza.
+    """
+    czasy = {}
+    znacznik = time.perf_counter()
+    mapa, przesuniecia, wolne, skad = _przygotuj(adapter, start)
+    nastepny = bytearray(adapter.n)  # numer kolejnego przesunięcia do sprawdzenia
+    stos = [start]
+    rozwiniete = 0
+    odwiedzone = 1
+    relaksacje = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while stos:
+        u = stos[-1]
+        if u == cel:
+            break
+        i = nastepny[u]
+        if i == len(przesuniecia):
+            stos.pop()
+            rozwiniete += 1
+            if obserwator is not None:
+                obserwator(ZAMKNIETE, u)
+            continue
+        nastepny[u] = i + 1
+        v = u + przesuniecia[i]
+        if mapa[v] == wolne:
+            relaksacje += 1
+            if skad[v] == -1:
+                skad[v] = u
+                stos.append(v)
+                odwiedzone += 1
+                if len(stos) > szczyt_frontu:
+                    szczyt_frontu = len(stos)
+                if obserwator is not None:
+                    obserwator(OTWARTE, v)
+
+    liczniki = {"wstawienia": odwiedzone, "nieaktualne": 0, "relaksacje": relaksacje, "heurystyka": 0}
+    return _wynik(skad, start, cel, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik, liczniki)
+
+
+def astar(adapter, start, cel, h, kolejka, obserwator=None, ponowne_otwieranie=False):
+    czasy = {}
+    znacznik = time.perf_counter()
+    mapa, przesuniecia, wolne, skad = _przygotuj(adapter, start)
+    front, wstaw, zdejmij = operacje_frontu(kolejka)
+    koszt = array("i", [-1]) * adapter.n
+    zamkniete = bytearray(adapter.n)
+    koszt[start] = 0
+    hs = h(start)
+    wstaw(front, (hs, hs, start))
+    rozwiniete = 0
+    odwiedzone = 1
+    wstawienia = 1
+    nieaktualne = 0
+    relaksacje = 0
+    ponowne_otwarcia = 0
+    szczyt_frontu = 1
+    znacznik = odmierz(czasy, "przygotowanie", znacznik)
+
+    while front:
+        _, _, u = zdejmij(front)
+        if zamkniete[u]:
+            nieaktualne += 1
+            continue
+        zamkniete[u] = 1
+        rozwiniete += 1
+        if u == cel:
+            break
+        g = koszt[u] + 1
+        for d in przesuniecia:
+            v = u + d
+            if mapa[v] != wolne:
+                continue
+            relaksacje += 1
+            if zamkniete[v]:
+                if not ponowne_otwieranie or g >= koszt[v]:
+                    continue
+                zamkniete[v] = 0
+                ponowne_otwarcia += 1
+            elif koszt[v] < 0:
+                odwiedzone += 1
+                if obserwator is not None:
+                    obserwator(OTWARTE, v)
+            elif g >= koszt[v]:
+                continue
+            koszt[v] = g
+            skad[v] = u
+            hv = h(v)
+            wstaw(front, (g + hv, hv, v))
+            wstawienia += 1
+        if wstawienia - rozwiniete - nieaktualne > szczyt_frontu:
+            szczyt_frontu = wstawienia - rozwiniete - nieaktualne
+        if obserwator is not None:
+            obserwator(ZAMKNIETE, u)
+
+    liczniki = {"wstawienia": wstawienia, "nieaktualne": nieaktualne, "relaksacje": relaksacje,
+                "heurystyka": wstawienia, "ponowne_otwarcia": ponowne_otwarcia}
+    return _wynik(skad, start, cel, rozwiniete, odwiedzone, szczyt_frontu, czasy, znacznik, liczniki)
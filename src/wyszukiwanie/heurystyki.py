@@ -0,0 +1,44 @@
+"""
+Heurystyki dla astar z algorytmy.py.
+
+Fabryka heurystyki przyjmuje (adapter, cel) i zwraca funkcję h(v)
+szacującą koszt dojścia z v do celu. Heurystyki geometryczne korzystają
+z adapter.wspolrzedne(v).
+"""
+from math import sqrt
+
+
+def zerowa(adapter, cel):
+    """
+    h(v) = 0: astar zachowuje się wtedy jak Dijkstra.
+    """
+    def h(v):
+        return 0
+    return h
+
+
+def euklidesowa(adapter, cel, mnoznik=1.0):
+    wspolrzedne = adapter.wspolrzedne
+    xc, yc = wspolrzedne(cel)
+
+    def h(v):
+        x, y = wspolrzedne(v)
+        return mnoznik * sqrt((x - xc) ** 2 + (y - yc) ** 2)
+    return h
+
+
+def manhattan(adapter, cel, mnoznik=1):
+    wspolrzedne = adapter.wspolrzedne
+    xc, yc = wspolrzedne(cel)
+
+    def h(v):
+        x, y = wspolrzedne(v)
+        return mnoznik * (abs(x - xc) + abs(y - yc))
+    return h
+
+
+HEURYSTYKI = {
+    "zerowa": zerowa,
+    "euklidesowa": euklidesowa,
+    "manhattan": manhattan,
+}
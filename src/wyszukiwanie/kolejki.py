@@ -0,0 +1,213 @@
+"""
+Kolejki priorytetowe (fronty) dla dijkstra i astar z algorytmy.py.
+
+Wszystkie mają interfejs jak queue.PriorityQueue: put((priorytet, ...)),
+get() -> krotka o najmniejszym priorytecie, empty(). W odróżnieniu od
+PriorityQueue nie zakładają blokad, bo wyszukiwanie działa w jednym wątku.
+"""
+import heapq
+import operator
+from functools import partial
+
+# Największa waga krawędzi, przy której opłaca się kolejka kubełkowa
+# (dla większych całkowitych wag wybierany jest kopiec radix).
+MAKS_WAGA_KUBELKOWA = 64
+
+
+class KopiecBinarny:
+    """
+    Kopiec binarny na heapq, bez blokad PriorityQueue.
+    Obsługuje dowolne porównywalne priorytety (także zmiennoprzecinkowe).
+    put, get i empty to funkcje z C związane z listą kopca, więc wywołanie
+    nie przechodzi przez dodatkową ramkę Pythona.
+    """
+
+    def __init__(self):
+        self.kopiec = []
+        self.put = partial(heapq.heappush, self.kopiec)
+        self.get = partial(heapq.heappop, self.kopiec)
+        self.empty = partial(operator.not_, self.kopiec)
+
+    def __len__(self):
+        return len(self.kopiec)
+
+
+class KolejkaKubelkowa:
+    """
+    Kolejka kubełkowa Diala dla całkowitych, nieujemnych priorytetów.
+
+    Kubełki tworzą tablicę cykliczną: klucz k trafia do kubełka
+    k % len(kubelki), a wskaźnik `minimum` (najmniejszy klucz, jaki może
+    być w kolejce) przesuwa się tylko do przodu, więc przy monotonicznych
+    kluczach (Dijkstra, A* ze spójną heurystyką) get kosztuje zamortyzowane
+    O(1). W Dijkstrze klucze w kolejce mieszczą się w [minimum, minimum + C],
+    gdzie C to największa waga krawędzi, więc wystarcza C + 1 kubełków
+    (`maks_waga`) niezależnie od długości tras. Klucz spoza zakresu
+    obejmowanego przez tablicę (także mniejszy od wskaźnika) jest poprawny -
+    tablica jest wtedy powiększana i elementy rozkładane na nowo.
+    """
+
+    def __init__(self, maks_waga=0):
+        self.kubelki = [[] for _ in range(maks_waga + 1)]
+        self.minimum = 0
+        self.maksimum = 0  # największy klucz wstawiony od ostatniego opróżnienia
+        self.rozmiar = 0
+
+    def put(self, element):
+        klucz = element[0]
+        if klucz < 0 or klucz != int(klucz):
+            raise ValueError(f"Kolejka kubełkowa wymaga całkowitych, nieujemnych priorytetów: {klucz}")
+        klucz = int(klucz)
+        if not self.rozmiar:
+            self.minimum = self.maksimum = klucz
+        elif klucz > self.maksimum:
+            if klucz - self.minimum >= len(self.kubelki):
+                self._powieksz(klucz - self.minimum + 1)
+            self.maksimum = klucz
+        elif klucz < self.minimum:
+            if self.maksimum - klucz >= len(self.kubelki):
+                self._powieksz(self.maksimum - klucz + 1)
+            self.minimum = klucz
+        kubelki = self.kubelki
+        kubelki[klucz % len(kubelki)].append(element)
+        self.rozmiar += 1
+
+    def _powieksz(self, zakres):
+        elementy = [element for kubelek in self.kubelki for element in kubelek]
+        self.kubelki = [[] for _ in range(max(zakres, 2 * len(self.kubelki)))]
+        for element in elementy:
+            self.kubelki[int(element[0]) % len(self.kubelki)].append(element)
+
+    def get(self):
+        if not self.rozmiar:
+            raise IndexError("get z pustej kolejki")
+        kubelki = self.kubelki
+        n = len(kubelki)
+        i = self.minimum % n
+        if not kubelki[i]:
+            # pierwszy niepusty kubełek za wskaźnikiem, z przejściem na początek tablicy
+            j = i + 1
+            while j < n and not kubelki[j]:
+                j += 1
+            if j == n:
+                j = 0
+                while not kubelki[j]:
+                    j += 1
+            self.minimum += (j - i) % n
+            i = j
+        self.rozmiar -= 1
+        return kubelki[i].pop()
+
+    def empty(self):
+        return not self.rozmiar
+
+    def __len__(self):
+        return self.rozmiar
+
+
+class KopiecRadix:
+    """
+    Kopiec radix dla całkowitych, monotonicznych priorytetów: każdy nowy
+    klucz musi być >= ostatnio zdjętego (tak jest w Dijkstrze).
+
+    Element trafia do kubełka o numerze równym długości bitowej
+    (klucz XOR ostatnio zdjęty klucz). Przy pobraniu najmniejszy niepusty
+    kubełek jest rozdzielany na niższe, więc każdy element przenoszony jest
+    co najwyżej tyle razy, ile bitów ma klucz.
+    """
+
+    def __init__(self, bity=64):
+        self.kubelki = [[] for _ in range(bity + 1)]
+        self.ostatni = 0
+        self.rozmiar = 0
+
+    def put(self, element):
+        klucz = element[0]
+        if klucz < self.ostatni or klucz != int(klucz):
+            raise ValueError(f"Kopiec radix wymaga całkowitych kluczy >= {self.ostatni}: {klucz}")
+        self.kubelki[(int(klucz) ^ self.ostatni).bit_length()].append(element)
+        self.rozmiar += 1
+
+    def get(self):
+        if not self.rozmiar:
+            raise IndexError("get z pustej kolejki")
+        kubelki = self.kubelki
+        if not kubelki[0]:
+            i = 1
+            while not kubelki[i]:
+                i += 1
+            elementy = kubelki[i]
+            kubelki[i] = []
+            self.ostatni = int(min(element[0] for element in elementy))
+            for element in elementy:
+                kubelki[(int(element[0]) ^ self.ostatni).bit_length()].append(element)
+        self.rozmiar -= 1
+        return kubelki[0].pop()
+
+    def empty(self):
+        return not self.rozmiar
+
+    def __len__(self):
+        return self.rozmiar
+
+
+class _FrontBezDlugosci:
+    """
+    Front z samym interfejsem put/get/empty (np. queue.PriorityQueue)
+    opakowany tak, żeby jego prawdziwość oznaczała niepusty front.
+    """
+    __slots__ = ("kolejka",)
+
+    def __init__(self, kolejka):
+        self.kolejka = kolejka
+
+    def __bool__(self):
+        return not self.kolejka.empty()
+
+
+def operacje_frontu(kolejka):
+    """
+    (kontener, wstaw, zdejmij) dla pętli algorytmów:
+        while kontener: element = zdejmij(kontener); ...; wstaw(kontener, element)
+    Dla KopiecBinarny to lista kopca i funkcje heapq, więc każda operacja
+    jest jednym wywołaniem funkcji z C; fronty z __len__ (kolejki z tego
+    pliku) oddają siebie i swoje metody, a pozostałe są opakowywane.
+    """
+    if isinstance(kolejka, KopiecBinarny):
+        return kolejka.kopiec, heapq.heappush, heapq.heappop
+    if hasattr(type(kolejka), "__len__"):
+        return kolejka, type(kolejka).put, type(kolejka).get
+    return (_FrontBezDlugosci(kolejka), lambda front, element: front.kolejka.put(element),
+            lambda front: front.kolejka.get())
+
+
+def wagi_calkowite(wagi):
+    """
+    Największa z wag, jeśli wszystkie są całkowite i nieujemne;
+    w przeciwnym razie None.
+    """
+    maks = 0
+    for waga in wagi:
+        if waga < 0 or waga != int(waga):
+            return None
+        maks = max(maks, waga)
+    return int(maks)
+
+
+def wybierz_kolejke(adapter, calkowite_priorytety=True, monotoniczne=True):
+    """
+    Dobiera front do dziedziny wag grafu (adapter z adaptery.py):
+    - całkowite wagi i monotoniczne klucze: KolejkaKubelkowa z maks + 1
+      kubełkami dla małych wag (<= MAKS_WAGA_KUBELKOWA), KopiecRadix dla większych,
+    - pozostałe przypadki (heurystyka zmiennoprzecinkowa albo niespójna,
+      przy której wskaźnik kolejki kubełkowej ciągle się cofa) -> KopiecBinarny.
+    Wagi przegląda tylko pierwsze wywołanie dla danego adaptera (adapter
+    zapamiętuje maks_waga_calkowita), więc przy wielu zapytaniach warto
+    używać jednego adaptera, np. z AdapterNetworkx.dla.
+    """
+    maks = adapter.maks_waga_calkowita() if calkowite_priorytety and monotoniczne else None
+    if maks is None:
+        return KopiecBinarny()
+    if maks <= MAKS_WAGA_KUBELKOWA:
+        return KolejkaKubelkowa(maks)
+    return KopiecRadix()
@@ -0,0 +1,51 @@
+"""
+Wspólny wynik wyszukiwania i pomiar czasów etapów.
+"""
+import time
+
+# zdarzenia przekazywane obserwatorowi
+OTWARTE = 1     # wierzchołek trafił do frontu
+ZAMKNIETE = 2   # wierzchołek został rozwinięty
+
+
+class Wynik:
+    """
+    Wynik wyszukiwania: ścieżka jako lista wierzchołków od startu do celu
+    (pusta, gdy celu nie da się osiągnąć), jej koszt, liczby wierzchołków
+    rozwiniętych i odwiedzonych (wstawionych do frontu), największy rozmiar
+    frontu oraz czasy etapów w sekundach (np. {"przygotowanie": ...,
+    "wyszukiwanie": ..., "sciezka": ...}).
+
+    Algorytmy z algorytmy.py wypełniają też `liczniki` ("wstawienia",
+    "nieaktualne" - zdjęcia nieaktualnych wpisów, "relaksacje",
+    "heurystyka" - wywołania heurystyki, w A* także "ponowne_otwarcia")
+    i `drzewo` poprzedników: słownik, którego klucze to wszystkie odwiedzone
+    wierzchołki, albo dla AdapterCSR i AdapterSiatki array('i') indeksowana
+    wierzchołkiem, z -1 dla nieodwiedzonych. `rozwiniete` liczy też
+    zdjęcie celu (poza DFS na siatce, który liczy pola zdjęte ze stosu).
+    """
+
+    def __init__(self, znaleziono, sciezka, koszt, rozwiniete, odwiedzone, szczyt_frontu=0, czasy=None,
+                 liczniki=None, drzewo=None):
+        self.znaleziono = znaleziono
+        self.sciezka = sciezka
+        self.koszt = koszt
+        self.rozwiniete = rozwiniete
+        self.odwiedzone = odwiedzone
+        self.szczyt_frontu = szczyt_frontu
+        self.czasy = {} if czasy is None else czasy
+        self.liczniki = {} if liczniki is None else liczniki
+        self.drzewo = drzewo
+
+    def __repr__(self):
+        return (f"Wynik(znaleziono={self.znaleziono}, koszt={self.koszt}, rozwiniete={self.rozwiniete}, "
+                f"odwiedzone={self.odwiedzone}, szczyt_frontu={self.szczyt_frontu})")
+
+
+def odmierz(czasy, etap, od):
+    """
+    Zapisuje w `czasy` czas etapu liczony od znacznika `od`; zwraca nowy znacznik.
+    """
+    teraz = time.perf_counter()
+    czasy[etap] = czasy.get(etap, 0.0) + teraz - od
+    return teraz
@@ -0,0 +1,331 @@
+"""
+Sprawdzenie, czy wszystkie części projektu zwracają te same koszty tras.
+
+Losowa siatka (silnik_siatki.Siatka) zapisywana jest też jako graf networkx
+i graf CSR, a dla losowych par (start, cel) porównywane są koszty tras:
+- rdzenia (wyszukiwanie) na AdapterSiatki, AdapterNetworkx i AdapterCSR
+  z różnymi frontami,
+- Grid2D: silnik_siatki.ALGORYTMY i HPA*,
+- graphs: bfs, dfs, dijkstra i astar z Algorytmy_na_grafie_wazonym.py.
+Algorytmy optymalne muszą dać koszt Dijkstry rdzenia na AdapterSiatki,
+a nieoptymalne (DFS, HPA*) znaleźć trasę nie krótszą od optimum, gdy tylko
+cel jest osiągalny. Drugi zestaw to graf "drogowy" z generator_grafow.py
+z wagami całkowitymi 1..n, gdzie porównywane są Dijkstra i A*.
+
+Trzeci zestaw to mapa dla interactive_map: ten sam graf drogowy ze
+skrzyżowaniami w stopniach geograficznych (okolice 50N, 20E) i długością
+odcinka równą odległości po kole wielkim razy mnożnik z [1, 1.3), jak
+na prawdziwej mapie, gdzie droga nie jest krótsza od odcinka prostej.
+Porównywane są routing.find_path na grafie networkx i CSR: BFS, Dijkstra,
+A* (euklidesowa, manhattan, ALT), CH i warianty dwukierunkowe. Heurystyka
+"manhattan" (1.2 * suma odległości wzdłuż osi) przeszacowuje odległość,
+więc A* z nią, tak jak BFS, musi dać trasę tylko nie krótszą od optimum.
+
+Te same porównania uruchamia pytest (tests/test_zgodnosc.py, na mniejszych
+grafach); uruchomiony jako skrypt moduł wypisuje tabelę i kończy się kodem 1,
+jeśli którakolwiek implementacja się nie zgadza.
+
+Przykład:
+    cd src && python -m wyszukiwanie.zgodnosc --rozmiar 60 --zapytania 200
+"""
+import argparse
+import math
+import os
+import random
+import sys
+from queue import PriorityQueue
+
+import networkx as nx
+
+from . import (AdapterCSR, AdapterNetworkx, AdapterSiatki, KolejkaKubelkowa, KopiecBinarny, KopiecRadix, astar, bfs,
+               dfs, dijkstra, euklidesowa, manhattan)
+
+KATALOG_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# interactive_map jako pierwszy, bo tam jest routing.py
+for katalog in ("graphs", "Grid2D", "interactive_map"):
+    sys.path.insert(0, os.path.join(KATALOG_SRC, katalog))
+
+import Algorytmy_na_grafie_wazonym as alg
+import hpa
+import routing
+import silnik_siatki
+from contraction import ContractionHierarchy
+from csr_graph import CSRGraph
+from generator_grafow import drogowy
+from landmarks import LandmarkTable
+
+# Mapa: jednostka współrzędnych grafu drogowego (kwartał ma 3 jednostki) w metrach,
+# położenie i największy mnożnik długości drogi względem odcinka prostej.
+METRY_NA_JEDNOSTKE = 30.0
+SZEROKOSC, DLUGOSC = 50.0, 20.0
+MAKS_MNOZNIK = 1.3
+# względna tolerancja kosztu (tablice ALT są w float32)
+TOLERANCJA = 1e-6
+
+FRONTY = [
+    ("KopiecBinarny", KopiecBinarny),
+    ("KolejkaKubelkowa", KolejkaKubelkowa),
+    ("KopiecRadix", KopiecRadix),
+    ("PriorityQueue", PriorityQueue),
+]
+
+
+def graf_siatki(siatka):
+    """
+    Graf networkx (wierzchołki to płaskie indeksy pól) z wagą 'weight' = 1
+    i pos dla heurystyk rdzenia.
+    """
+    adapter = AdapterSiatki(siatka, silnik_siatki.WOLNE)
+    G = nx.Graph()
+    pos = {}
+    for wiersz in range(siatka.wiersze):
+        for kolumna in range(siatka.kolumny):
+            u = siatka.indeks(wiersz, kolumna)
+            if siatka.mapa[u] != silnik_siatki.WOLNE:
+                continue
+            pos[u] = adapter.wspolrzedne(u)
+            G.add_node(u)
+            for v in adapter.nastepniki(u):
+                G.add_edge(u, v, weight=1)
+    return G, pos
+
+
+def z_wyniku(funkcja):
+    """
+    Zapytanie (s, t) -> (znaleziono, koszt) z funkcji zwracającej Wynik.
+    """
+    def zapytanie(s, t):
+        wynik = funkcja(s, t)
+        return wynik.znaleziono, wynik.koszt
+    return zapytanie
+
+
+def przypadki_siatki(siatka):
+    """
+    Lista (nazwa, zapytanie(s, t) -> (znaleziono, koszt), optymalny).
+    """
+    G, pos = graf_siatki(siatka)
+    C_wagi = CSRGraph.from_networkx(G, weight="weight")
+    ad_siatka = AdapterSiatki(siatka, silnik_siatki.WOLNE)
+    ad_nx = AdapterNetworkx(G, pos=pos)
+    ad_csr = AdapterCSR(C_wagi)
+    przypadki = []
+
+    # wezel: płaski indeks pola -> wierzchołek adaptera; pole: odwrotnie (dla heurystyk na siatce)
+    for nazwa, adapter, wezel, pole in [("siatka", ad_siatka, None, None), ("networkx", ad_nx, None, None),
+                                        ("CSR", ad_csr, C_wagi.index.__getitem__, C_wagi.node_ids.__getitem__)]:
+        def rdzen(algorytm, front=None, heurystyka=None, adapter=adapter, wezel=wezel, pole=pole):
+            def zapytanie(s, t):
+                argumenty = []
+                if heurystyka is not None:
+                    h = heurystyka(ad_siatka, t)
+                    argumenty.append(h if pole is None else lambda v: h(pole(v)))
+                if front is not None:
+                    argumenty.append(front())
+                if wezel is not None:
+                    s, t = wezel(s), wezel(t)
+                wynik = algorytm(adapter, s, t, *argumenty)
+                return wynik.znaleziono, wynik.koszt
+            return zapytanie
+
+        przypadki.append((f"rdzeń BFS ({nazwa})", rdzen(bfs), True))
+        przypadki.append((f"rdzeń DFS ({nazwa})", rdzen(dfs), False))
+        for nazwa_frontu, front in FRONTY:
+            przypadki.append((f"rdzeń Dijkstra + {nazwa_frontu} ({nazwa})", rdzen(dijkstra, front), True))
+            przypadki.append((f"rdzeń A* manhattan + {nazwa_frontu} ({nazwa})", rdzen(astar, front, manhattan), True))
+        przypadki.append((f"rdzeń A* euklidesowa ({nazwa})", rdzen(astar, heurystyka=euklidesowa), True))
+
+    pozycja = siatka.pozycja
+    for nazwa, funkcja in dict(silnik_siatki.ALGORYTMY, **{"HPA*": hpa.hpa}).items():
+        przypadki.append((f"Grid2D {nazwa}", z_wyniku(lambda s, t, f=funkcja: f(siatka, pozycja(s), pozycja(t))),
+                          nazwa not in ("DFS", "HPA*")))
+
+    def z_krotki(funkcja):
+        def zapytanie(s, t):
+            droga, _, koszt = funkcja(s, t)
+            return bool(droga), koszt
+        return zapytanie
+
+    przypadki += [
+        ("graphs bfs", z_krotki(lambda s, t: alg.bfs(G, s, t)), True),
+        ("graphs dfs", z_krotki(lambda s, t: alg.dfs(G, s, t)), False),
+        ("graphs dijkstra", z_krotki(lambda s, t: alg.dijkstra(G, s, t)), True),
+        ("graphs astar (manhattan)", z_krotki(lambda s, t: alg.astar(G, s, t, alg.heurystyka_manhattan(pos))), True),
+    ]
+    return przypadki
+
+
+def przypadki_grafu(n, ziarno):
+    """
+    Graf "drogowy" z generator_grafow.py: wagi całkowite, heurystyka
+    euklidesowa dopuszczalna (waga >= długość odcinka).
+    """
+    G, pos = drogowy(n, ziarno=ziarno).do_networkx()
+    C = CSRGraph.from_networkx(G, weight="weight")
+    ad_nx = AdapterNetworkx(G, pos=pos)
+    ad_csr = AdapterCSR(C)
+    przypadki = []
+    for nazwa_frontu, front in FRONTY:
+        przypadki.append((f"rdzeń Dijkstra + {nazwa_frontu} (networkx)",
+                          z_wyniku(lambda s, t, f=front: dijkstra(ad_nx, s, t, f())), True))
+        przypadki.append((f"rdzeń Dijkstra + {nazwa_frontu} (CSR)",
+                          z_wyniku(lambda s, t, f=front: dijkstra(ad_csr, s, t, f())), True))
+    przypadki += [
+        ("rdzeń A* euklidesowa (networkx)", z_wyniku(lambda s, t: astar(ad_nx, s, t, euklidesowa(ad_nx, t))), True),
+        ("graphs dijkstra", lambda s, t: (True, alg.dijkstra(G, s, t)[2]), True),
+        ("graphs astar (euklidesowa)",
+         lambda s, t: (True, alg.astar(G, s, t, alg.heurystyka_euklidesowa(pos))[2]), True),
+        ("graphs dfs", lambda s, t: (True, alg.dfs(G, s, t)[2]), False),
+    ]
+    for algorytm in ("Dijkstra", "Bi-Dijkstra"):
+        przypadki.append((f"interactive_map {algorytm} (CSR)",
+                          lambda s, t, a=algorytm: (True, C.path_length(routing.find_path(C, s, t, a)[0])), True))
+    return G.number_of_nodes(), przypadki
+
+
+def graf_mapy(n, ziarno):
+    """
+    Graf drogowy jako mapa dla routing.py: atrybuty węzłów 'x' (długość)
+    i 'y' (szerokość geograficzna), długość odcinka 'length' w metrach.
+    """
+    instancja = drogowy(n, ziarno=ziarno)
+    rng = random.Random(ziarno)
+    metry_na_stopien = math.radians(1) * 6371000
+    G = nx.Graph()
+    for u, (x, y) in enumerate(instancja.wspolrzedne.tolist()):
+        G.add_node(u, y=SZEROKOSC + y * METRY_NA_JEDNOSTKE / metry_na_stopien,
+                   x=DLUGOSC + x * METRY_NA_JEDNOSTKE / (metry_na_stopien * math.cos(math.radians(SZEROKOSC))))
+    for u, v in instancja.krawedzie.tolist():
+        a, b = G.nodes[u], G.nodes[v]
+        prosta = routing.great_circle_vec(a["y"], a["x"], b["y"], b["x"])
+        G.add_edge(u, v, length=prosta * rng.uniform(1.0, MAKS_MNOZNIK))
+    return G
+
+
+def przypadki_mapy(n, ziarno):
+    """
+    routing.find_path na mapie z graf_mapy; wzorcem jest Dijkstra rdzenia.
+    """
+    G = graf_mapy(n, ziarno)
+    C = CSRGraph.from_networkx(G)
+    punkty = LandmarkTable.build(C, k=8, seed=ziarno)
+    hierarchia = ContractionHierarchy.build(C, calibration_queries=0, seed=ziarno)
+    ad_nx = AdapterNetworkx(G, "length")
+
+    def trasa(graf, algorytm, heurystyka="euklidesowa"):
+        def zapytanie(s, t):
+            sciezka = routing.find_path(graf, s, t, algorytm, heurystyka, landmarks=punkty, hierarchy=hierarchia)[0]
+            return (True, C.path_length(sciezka)) if sciezka else (False, 0)
+        return zapytanie
+
+    przypadki = [("rdzeń Dijkstra (networkx)", z_wyniku(lambda s, t: dijkstra(ad_nx, s, t)), True)]
+    for nazwa, graf in [("networkx", G), ("CSR", C)]:
+        for algorytm, heurystyka, optymalny in [("BFS", "euklidesowa", False), ("Dijkstra", "euklidesowa", True),
+                                                ("A*", "euklidesowa", True), ("A*", "manhattan", False)]:
+            etykieta = f"{algorytm} {heurystyka}" if algorytm == "A*" else algorytm
+            przypadki.append((f"interactive_map {etykieta} ({nazwa})", trasa(graf, algorytm, heurystyka), optymalny))
+    przypadki += [
+        ("interactive_map A* ALT (CSR)", trasa(C, "A*", "ALT"), True),
+        ("interactive_map CH (CSR)", trasa(C, "CH"), True),
+        ("interactive_map Bi-Dijkstra (CSR)", trasa(C, "Bi-Dijkstra"), True),
+        ("interactive_map Bi-A* euklidesowa (CSR)", trasa(C, "Bi-A*", "euklidesowa"), True),
+        ("interactive_map Bi-A* ALT (CSR)", trasa(C, "Bi-A*", "ALT"), True),
+        ("interactive_map Bi-BFS (CSR)", trasa(C, "Bi-BFS"), False),
+    ]
+    return G.number_of_nodes(), przypadki
+
+
+def porownaj(zapytanie, optymalny, pary, oczekiwane):
+    """
+    Porównuje zapytanie z kosztami wzorca (`oczekiwane`, po jednym dla
+    każdej pary). Zwraca (liczba niezgodności, liczba tras dłuższych od
+    optimum, największe względne wydłużenie); dłuższe trasy są
+    niezgodnością tylko dla przypadków optymalnych.
+    """
+    bledy = 0
+    dluzsze = 0
+    wydluzenie = 0.0
+    for (s, t), (znaleziono, koszt) in zip(pary, oczekiwane):
+        wynik_znaleziono, wynik_koszt = zapytanie(s, t)
+        tolerancja = TOLERANCJA * max(1, koszt)
+        if wynik_znaleziono != znaleziono:
+            bledy += 1
+        elif not znaleziono:
+            continue
+        elif optymalny and abs(wynik_koszt - koszt) > tolerancja or wynik_koszt < koszt - tolerancja:
+            bledy += 1
+        elif wynik_koszt > koszt + tolerancja:
+            dluzsze += 1
+            wydluzenie = max(wydluzenie, wynik_koszt / koszt - 1)
+    return bledy, dluzsze, wydluzenie
+
+
+def zestawy(rozmiar=40, gestosc=0.3, wezly=2000, zapytania=100, ziarno=0):
+    """
+    Trzy zestawy porównań jako lista (opis, przypadki, pary, wzorzec):
+    losowa siatka, graf drogowy i mapa. Przypadek to trójka (nazwa,
+    zapytanie, optymalny), a wzorzec to zapytanie dające optymalny koszt.
+    """
+    rng = random.Random(ziarno)
+    wynik = []
+
+    siatka = silnik_siatki.Siatka.losowa(rozmiar, gestosc=gestosc, ziarno=ziarno)
+    pary = []
+    for _ in range(zapytania):
+        start, cel = [(rng.randrange(rozmiar), rng.randrange(rozmiar)) for _ in range(2)]
+        siatka.ustaw_bariere(*start, False)
+        siatka.ustaw_bariere(*cel, False)
+        pary.append((siatka.indeks(*start), siatka.indeks(*cel)))
+    ad_siatka = AdapterSiatki(siatka, silnik_siatki.WOLNE)
+    wynik.append((f"Siatka {rozmiar}x{rozmiar}, bariery: {gestosc:.0%}, zapytań: {len(pary)}",
+                  przypadki_siatki(siatka), pary, z_wyniku(lambda s, t: dijkstra(ad_siatka, s, t))))
+
+    n, przypadki = przypadki_grafu(wezly, ziarno)
+    pary = [(rng.randrange(n), rng.randrange(n)) for _ in range(zapytania)]
+    wynik.append((f"Graf drogowy: {n} wierzchołków, zapytań: {len(pary)}", przypadki, pary, przypadki[0][1]))
+
+    n, przypadki = przypadki_mapy(wezly, ziarno)
+    pary = [(rng.randrange(n), rng.randrange(n)) for _ in range(zapytania)]
+    wynik.append((f"Mapa: {n} skrzyżowań, zapytań: {len(pary)}", przypadki, pary, przypadki[0][1]))
+    return wynik
+
+
+def sprawdz(przypadki, pary, wzorzec, niezgodnosci):
+    """
+    Porównuje każdy przypadek z wzorcem (optymalnym) dla wszystkich par;
+    liczby niezgodności sumowane są w słowniku `niezgodnosci`. Dla
+    nieoptymalnych przypadków wypisywana jest też liczba tras dłuższych
+    od optimum i największe względne wydłużenie.
+    """
+    oczekiwane = [wzorzec(s, t) for s, t in pary]
+    for nazwa, zapytanie, optymalny in przypadki:
+        bledy, dluzsze, wydluzenie = porownaj(zapytanie, optymalny, pary, oczekiwane)
+        niezgodnosci[nazwa] = niezgodnosci.get(nazwa, 0) + bledy
+        opis = "zgodne" if not bledy else f"NIEZGODNE: {bledy}"
+        if dluzsze:
+            opis += f" (dłuższe trasy: {dluzsze}, do +{wydluzenie:.1%})"
+        print(f"  {nazwa:<52}{opis}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rozmiar", type=int, default=40, help="bok losowej siatki")
+    parser.add_argument("--gestosc", type=float, default=0.3, help="udział barier")
+    parser.add_argument("--wezly", type=int, default=2000, help="wierzchołki grafu drogowego")
+    parser.add_argument("--zapytania", type=int, default=100)
+    parser.add_argument("--ziarno", type=int, default=0)
+    args = parser.parse_args()
+    niezgodnosci = {}
+
+    for i, (opis, przypadki, pary, wzorzec) in enumerate(zestawy(args.rozmiar, args.gestosc, args.wezly,
+                                                                  args.zapytania, args.ziarno)):
+        print(("\n" if i else "") + opis)
+        sprawdz(przypadki, pary, wzorzec, niezgodnosci)
+
+    bledne = [nazwa for nazwa, bledy in niezgodnosci.items() if bledy]
+    print(f"\n{'Wszystkie implementacje zgodne' if not bledne else 'Niezgodne: ' + ', '.join(bledne)}")
+    sys.exit(1 if bledne else 0)
+
+
+if __name__ == "__main__":
+    main()
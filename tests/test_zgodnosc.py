@@ -0,0 +1,35 @@
+"""
+Zgodność kosztów tras we wszystkich częściach projektu (wyszukiwanie.zgodnosc)
+na małych grafach: każdy przypadek z każdego zestawu to osobny test.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from wyszukiwanie import zgodnosc  # noqa: E402
+
+ZESTAWY = zgodnosc.zestawy(rozmiar=20, wezly=300, zapytania=30)
+NAZWY_ZESTAWOW = ["siatka", "graf drogowy", "mapa"]
+_oczekiwane = {}
+
+
+def oczekiwane(numer):
+    if numer not in _oczekiwane:
+        _, _, pary, wzorzec = ZESTAWY[numer]
+        _oczekiwane[numer] = [wzorzec(s, t) for s, t in pary]
+    return _oczekiwane[numer]
+
+
+@pytest.mark.parametrize("numer, przypadek", [
+    pytest.param(numer, przypadek, id=f"{NAZWY_ZESTAWOW[numer]}: {przypadek[0]}")
+    for numer, (_, przypadki, _, _) in enumerate(ZESTAWY)
+    for przypadek in przypadki
+])
+def test_zgodnosc(numer, przypadek):
+    nazwa, zapytanie, optymalny = przypadek
+    pary = ZESTAWY[numer][2]
+    bledy, _, _ = zgodnosc.porownaj(zapytanie, optymalny, pary, oczekiwane(numer))
+    assert bledy == 0, f"{nazwa}: {bledy} z {len(pary)} zapytań niezgodnych"